@@ -0,0 +1,151 @@
+"""
+Prediction database benchmark
+Measures write throughput with concurrent writer threads and read latency of
+history queries issued while those writers are running, for:
+
+    legacy   a new sqlite3.connect per call, default rollback journal
+             (how PredictionDatabase worked before the connection manager)
+    pooled   PredictionDatabase with its WAL-mode ConnectionManager
+
+Each mode uses a fresh database file in a temporary directory.
+
+Usage:
+    python benchmarks/bench_database.py [--writers 8] [--duration 5] [--json results.json]
+"""
+import argparse
+import json
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+from models.database import INSERT_PREDICTION_SQL, PredictionDatabase
+
+SAMPLE_INPUT = {
+    "Location": 1.0,
+    "About Enterprises, Owners Motivation": 3,
+    "Enabler 2:Operational Process , Legacy & new machine to balance": 2,
+    "Enabler 1: Effortable Digital technologies": 3,
+    "Outcome : Growth and Effeciency": 65.5,
+    "Enabler 2 :Certification &Standarization": 4,
+    "Challanges3: Financial assistant & Incentive ,transparency in institutional support ,": 2,
+    "Enabler 3: Administrative and Regulatory Hurdles & Eco system Integration challenges": 3,
+    "Enabler 4: Engaging local hire": 2,
+    "Challenges 2: Skill Gap ,Retaining resources and workforce Management": 3,
+    "Enterprise_Age": 15,
+    "Small/Medium/Large": "Medium"
+}
+SAMPLE_SCORES = {'High': 0.2, 'Medium': 0.7, 'Low': 0.1}
+
+
+class LegacyDatabase:
+    """Per-call connections in rollback-journal mode (previous behaviour)"""
+    
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        # Reuse the schema, then switch the file back to rollback journaling
+        PredictionDatabase(str(db_path)).close()
+        conn = sqlite3.connect(db_path)
+        conn.execute('PRAGMA journal_mode=DELETE')
+        conn.close()
+    
+    def save_prediction(self, prediction, confidence_scores, input_data):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(INSERT_PREDICTION_SQL, PredictionDatabase._prediction_params(
+            prediction, confidence_scores, input_data
+        ))
+        conn.commit()
+        conn.close()
+    
+    def get_all_predictions(self, limit):
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute(
+            'SELECT * FROM predictions ORDER BY timestamp DESC LIMIT ?', (limit,)
+        ).fetchall()
+        conn.close()
+        return rows
+
+
+def run(db, writers: int, duration: float) -> dict:
+    """Run writer threads and one reader thread for `duration` seconds"""
+    stop = threading.Event()
+    writes = [0] * writers
+    write_errors = [0] * writers
+    read_latencies = []
+    read_errors = [0]
+    
+    def writer(i):
+        while not stop.is_set():
+            try:
+                db.save_prediction('Medium', SAMPLE_SCORES, SAMPLE_INPUT)
+                writes[i] += 1
+            except sqlite3.OperationalError:
+                write_errors[i] += 1
+    
+    def reader():
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                db.get_all_predictions(limit=50)
+                read_latencies.append(time.perf_counter() - start)
+            except sqlite3.OperationalError:
+                read_errors[0] += 1
+    
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads.append(threading.Thread(target=reader))
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    
+    ms = np.array(read_latencies) * 1000 if read_latencies else np.array([0.0])
+    return {
+        'writes': sum(writes),
+        'writes_per_sec': sum(writes) / duration,
+        'write_errors': sum(write_errors),
+        'reads': len(read_latencies),
+        'read_errors': read_errors[0],
+        'read_p50_ms': float(np.percentile(ms, 50)),
+        'read_p99_ms': float(np.percentile(ms, 99))
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+    
+    print("=" * 80)
+    print(f"DATABASE BENCHMARK ({args.writers} writer threads + 1 reader, {args.duration:g}s per mode)")
+    print("=" * 80)
+    
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ('legacy', 'pooled'):
+            db_path = Path(tmp) / f'{mode}.db'
+            db = LegacyDatabase(db_path) if mode == 'legacy' else PredictionDatabase(str(db_path))
+            result = {'mode': mode, **run(db, args.writers, args.duration)}
+            if mode == 'pooled':
+                db.close()
+            results.append(result)
+    
+    print(f"\n{'mode':<10}{'writes/s':>12}{'write errs':>12}{'reads':>10}{'read p50 ms':>14}{'read p99 ms':>14}")
+    for r in results:
+        print(f"{r['mode']:<10}{r['writes_per_sec']:>12.1f}{r['write_errors']:>12}{r['reads']:>10}"
+              f"{r['read_p50_ms']:>14.2f}{r['read_p99_ms']:>14.2f}")
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    
+    print("\n" + "=" * 80)
@@ -0,0 +1,116 @@
+"""
+Prediction export benchmark
+Builds a synthetic multi-million-row prediction history, then streams it out
+as CSV, Parquet and Arrow IPC in a fresh process per format, reporting rows/sec,
+output size and peak RSS (so bounded memory shows up as a flat RSS regardless
+of row count).
+
+Usage:
+    python benchmarks/bench_export.py [--rows 2000000] [--chunk-size 50000] [--formats csv,parquet,arrow] [--json results.json]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_schema import populate
+from models.database import PredictionDatabase
+from utils.exporter import EXPORT_CHUNK_SIZE, export_predictions
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process"""
+    # VmHWM starts fresh at exec, unlike ru_maxrss which a child inherits from its parent
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_export(db_path: str, fmt: str, chunk_size: int) -> dict:
+    """Export the whole table to a null sink and measure it (runs in a child process)"""
+    with redirect_stdout(sys.stderr):
+        db = PredictionDatabase(db_path)
+    baseline_mb = peak_rss_mb()
+    
+    start = time.perf_counter()
+    size = 0
+    with open(os.devnull, 'wb') as sink:
+        for chunk in export_predictions(db, fmt, chunk_size=chunk_size):
+            sink.write(chunk)
+            size += len(chunk)
+    elapsed = time.perf_counter() - start
+    db.close()
+    
+    return {
+        'seconds': elapsed,
+        'bytes': size,
+        'baseline_rss_mb': baseline_mb,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000000)
+    parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+    parser.add_argument('--formats', default='csv,parquet,arrow')
+    parser.add_argument('--json', help='Write results to this file')
+    parser.add_argument('--child', nargs=2, metavar=('DB', 'FORMAT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        print(json.dumps(run_export(args.child[0], args.child[1], args.chunk_size)))
+        sys.exit(0)
+    
+    print("=" * 80)
+    print(f"EXPORT BENCHMARK ({args.rows:,} rows, {args.chunk_size:,} rows per chunk)")
+    print("=" * 80)
+    
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'history.db'
+        
+        start = time.perf_counter()
+        populate(db_path, args.rows)
+        with redirect_stdout(sys.stderr):
+            PredictionDatabase(str(db_path)).close()
+        print(f"\nPopulated and migrated in {time.perf_counter() - start:.1f}s")
+        
+        for fmt in args.formats.split(','):
+            child = subprocess.run(
+                [sys.executable, __file__, '--chunk-size', str(args.chunk_size), '--child', str(db_path), fmt],
+                capture_output=True, text=True
+            )
+            if child.returncode != 0:
+                print(f"\n{fmt}: failed\n{child.stderr.strip().splitlines()[-1]}")
+                continue
+            result = json.loads(child.stdout)
+            result['rows_per_second'] = args.rows / result['seconds']
+            results[fmt] = result
+    
+    print(f"\n{'format':<10}{'seconds':>10}{'rows/s':>14}{'MB out':>10}{'base RSS MB':>14}{'peak RSS MB':>14}")
+    for fmt, r in results.items():
+        print(f"{fmt:<10}{r['seconds']:>10.1f}{r['rows_per_second']:>14,.0f}{r['bytes'] / 1e6:>10.1f}"
+              f"{r['baseline_rss_mb']:>14.1f}{r['peak_rss_mb']:>14.1f}")
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'rows': args.rows, 'chunk_size': args.chunk_size, 'results': results}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    
+    print("\n" + "=" * 80)
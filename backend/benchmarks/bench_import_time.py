@@ -0,0 +1,108 @@
+"""
+Startup import-time benchmark
+Imports the app (`import main`) in fresh interpreters under `python -X importtime`,
+reports total import time and the slowest top-level packages, and fails if a
+dependency that should only load on first use (report rendering, optional
+export/upload formats, the sklearn/pandas stack of the pickled model) is
+imported at startup.
+
+Usage:
+    python benchmarks/bench_import_time.py [--repeat 5] [--top 15] [--budget-ms 1500] [--json results.json]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Must not be imported by `import main`
+LAZY_MODULES = ['matplotlib', 'reportlab', 'openpyxl', 'pypdf', 'sklearn', 'pandas']
+
+
+def profile_import(module: str = 'main') -> dict:
+    """Import `module` in a fresh interpreter and parse its -X importtime output"""
+    child = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if child.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{child.stderr[-2000:]}")
+    
+    total_us = 0
+    self_by_package = defaultdict(int)
+    imported = set()
+    for line in child.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        package = name.split('.')[0]
+        imported.add(package)
+        self_by_package[package] += int(self_us)
+        if name == module:
+            total_us = int(cumulative_us)
+    
+    return {
+        'total_ms': total_us / 1000,
+        'self_ms_by_package': {package: us / 1000 for package, us in self_by_package.items()},
+        'imported': sorted(imported)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--budget-ms', type=float, help='Fail if the median import time exceeds this')
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+    
+    print("=" * 80)
+    print(f"STARTUP IMPORT TIME (import main, {args.repeat} runs)")
+    print("=" * 80)
+    
+    runs = [profile_import() for _ in range(args.repeat)]
+    totals = [run['total_ms'] for run in runs]
+    median_ms = statistics.median(totals)
+    
+    # Median self time per top-level package across runs
+    packages = set().union(*(run['self_ms_by_package'] for run in runs))
+    by_package = {
+        package: statistics.median(run['self_ms_by_package'].get(package, 0.0) for run in runs)
+        for package in packages
+    }
+    
+    print(f"\nimport main: median {median_ms:.0f} ms (min {min(totals):.0f}, max {max(totals):.0f})")
+    print(f"\n{'package':<32}{'self ms':>10}")
+    for package, ms in sorted(by_package.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{package:<32}{ms:>10.1f}")
+    
+    eager = [module for module in LAZY_MODULES if module in runs[0]['imported']]
+    failures = []
+    if eager:
+        failures.append(f"imported at startup (should be lazy): {', '.join(eager)}")
+    if args.budget_ms is not None and median_ms > args.budget_ms:
+        failures.append(f"median import time {median_ms:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'median_ms': median_ms,
+                'runs_ms': totals,
+                'self_ms_by_package': by_package,
+                'eager_lazy_modules': eager
+            }, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    
+    print()
+    for failure in failures:
+        print(f"✗ {failure}")
+    if not failures:
+        print(f"✓ none of {', '.join(LAZY_MODULES)} imported at startup")
+    
+    print("\n" + "=" * 80)
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,115 @@
+"""
+Micro-batching benchmark
+Drives the inference path in-process with N concurrent async clients and
+compares throughput and latency of:
+
+    direct        one inference pool call per request (current path)
+    batch/<w>ms   MicroBatcher with max wait w ms and max batch size M
+
+The prediction cache is disabled so every request does real work.
+
+Usage:
+    python benchmarks/bench_micro_batching.py [--clients 64] [--duration 10] [--json results.json]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+from models.model_loader import get_model
+from utils.inference_executor import InferenceExecutor, predict_one
+from utils.micro_batcher import MicroBatcher
+from utils.synthetic_inputs import generate_inputs
+
+
+async def run_clients(submit, records, clients: int, duration: float) -> list:
+    """Run `clients` closed-loop clients for `duration` seconds, return latencies"""
+    latencies = []
+    deadline = time.perf_counter() + duration
+    
+    async def client(offset: int):
+        i = offset
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await submit(records[i % len(records)])
+            latencies.append(time.perf_counter() - start)
+            i += clients
+    
+    await asyncio.gather(*(client(c) for c in range(clients)))
+    return latencies
+
+
+def summarize(name: str, latencies: list, duration: float, extra: dict = None) -> dict:
+    """Compute throughput and latency percentiles in ms"""
+    ms = np.array(latencies) * 1000
+    result = {
+        'mode': name,
+        'requests': len(latencies),
+        'throughput_rps': len(latencies) / duration,
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p95_ms': float(np.percentile(ms, 95)),
+        'p99_ms': float(np.percentile(ms, 99)),
+        'max_ms': float(ms.max())
+    }
+    result.update(extra or {})
+    return result
+
+
+async def main(args) -> list:
+    model = get_model()
+    model.cache.max_size = 0
+    records = generate_inputs(model, 5000)
+    
+    executor = InferenceExecutor('thread', max_workers=args.workers, max_queue=args.clients * 2)
+    results = []
+    
+    latencies = await run_clients(
+        lambda data: executor.run(predict_one, data), records, args.clients, args.duration
+    )
+    results.append(summarize('direct', latencies, args.duration))
+    
+    for wait_ms in args.waits:
+        batcher = MicroBatcher(executor, max_batch_size=args.max_batch_size, max_wait_ms=wait_ms)
+        latencies = await run_clients(batcher.submit, records, args.clients, args.duration)
+        stats = batcher.stats()
+        results.append(summarize(
+            f'batch/{wait_ms:g}ms', latencies, args.duration,
+            {'avg_batch_size': stats['avg_batch_size'], 'largest_batch': stats['largest_batch']}
+        ))
+    
+    executor.shutdown()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--max-batch-size', type=int, default=32)
+    parser.add_argument('--waits', type=float, nargs='+', default=[1, 5, 20])
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+    
+    print("=" * 80)
+    print(f"MICRO-BATCHING BENCHMARK ({args.clients} clients, {args.duration:g}s per mode)")
+    print("=" * 80)
+    
+    results = asyncio.run(main(args))
+    
+    print(f"\n{'mode':<14}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'avg batch':>12}")
+    for r in results:
+        print(f"{r['mode']:<14}{r['throughput_rps']:>10.1f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}"
+              f"{r['p99_ms']:>10.2f}{r.get('avg_batch_size', 1):>12.1f}")
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    
+    print("\n" + "=" * 80)
@@ -0,0 +1,105 @@
+"""
+Report confidence chart benchmark
+Renders the same synthetic predictions with each confidence chart path -
+native ReportLab graphics, an embedded matplotlib PNG, and no chart as a
+baseline - and reports render time per report and PDF size.
+
+Usage:
+    python benchmarks/bench_report_chart.py [--reports 200] [--seed 42] [--json results.json]
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.pdf_generator import generate_prediction_report
+
+CHART_PATHS = [None, 'native', 'matplotlib']
+
+
+def sample_predictions(count: int, seed: int = 42) -> list:
+    """Synthetic stored predictions, as returned by PredictionDatabase.get_prediction_by_id"""
+    rng = random.Random(seed)
+    predictions = []
+    for i in range(count):
+        high, medium = rng.random(), rng.random()
+        low = rng.random()
+        total = high + medium + low
+        scores = {'High': high / total, 'Medium': medium / total, 'Low': low / total}
+        predictions.append({
+            'id': i + 1,
+            'timestamp': '2024-01-01 12:00:00',
+            'prediction': max(scores, key=scores.get),
+            'confidence_scores': scores,
+            'input_data': {
+                'Location': 1.0,
+                'About Enterprises, Owners Motivation': rng.randint(1, 5),
+                'Outcome : Growth and Effeciency': round(rng.uniform(0, 30), 1),
+                'Enterprise_Age': rng.randint(1, 60),
+                'Small/Medium/Large': rng.choice(['Small', 'Medium', 'Large'])
+            }
+        })
+    return predictions
+
+
+def bench_chart(predictions: list, chart) -> dict:
+    """Render every prediction with one chart path"""
+    # Warm up: imports, styles and (for matplotlib) font cache
+    generate_prediction_report(predictions[0], chart=chart)
+    
+    times_ms = []
+    sizes = []
+    for prediction in predictions:
+        start = time.perf_counter()
+        pdf = generate_prediction_report(prediction, chart=chart).getvalue()
+        times_ms.append((time.perf_counter() - start) * 1000)
+        sizes.append(len(pdf))
+    
+    return {
+        'mean_ms': statistics.mean(times_ms),
+        'p50_ms': statistics.median(times_ms),
+        'p95_ms': statistics.quantiles(times_ms, n=20)[-1] if len(times_ms) > 1 else times_ms[0],
+        'mean_bytes': statistics.mean(sizes)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reports', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+    
+    print("=" * 80)
+    print(f"REPORT CONFIDENCE CHART ({args.reports} reports per path)")
+    print("=" * 80)
+    
+    predictions = sample_predictions(args.reports, args.seed)
+    results = {}
+    for chart in CHART_PATHS:
+        results[chart or 'none'] = bench_chart(predictions, chart)
+    
+    print(f"\n{'chart':<14}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'PDF KB':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<14}{result['mean_ms']:>10.2f}{result['p50_ms']:>10.2f}"
+            f"{result['p95_ms']:>10.2f}{result['mean_bytes'] / 1024:>10.1f}"
+        )
+    
+    native, mpl = results['native'], results['matplotlib']
+    print(
+        f"\nnative vs matplotlib: {mpl['mean_ms'] / native['mean_ms']:.1f}x faster, "
+        f"{mpl['mean_bytes'] / native['mean_bytes']:.1f}x smaller PDFs"
+    )
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'reports': args.reports, 'seed': args.seed, 'results': results}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    
+    print("\n" + "=" * 80)
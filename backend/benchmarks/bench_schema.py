@@ -0,0 +1,157 @@
+"""
+Prediction schema benchmark
+Builds a synthetic prediction history with the original (unmigrated) schema,
+times typical history queries, then applies the schema migrations (indexes +
+generated feature columns) and times the same queries again.
+
+Usage:
+    python benchmarks/bench_schema.py [--rows 1000000] [--repeat 5] [--db path] [--json results.json]
+"""
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.database import CREATE_PREDICTIONS_SQL, PredictionDatabase
+
+DIGITAL = 'Enabler 1: Effortable Digital technologies'
+
+# (name, query before migration, query after migration)
+QUERIES = [
+    (
+        'history latest 50',
+        'SELECT id FROM predictions ORDER BY timestamp DESC LIMIT 50',
+        'SELECT id FROM predictions ORDER BY timestamp DESC LIMIT 50',
+    ),
+    (
+        'count last 7 days',
+        "SELECT COUNT(*) FROM predictions WHERE timestamp >= datetime('now', '-7 days')",
+        "SELECT COUNT(*) FROM predictions WHERE timestamp >= datetime('now', '-7 days')",
+    ),
+    (
+        'Low predictions, latest 50',
+        "SELECT id FROM predictions WHERE prediction = 'Low' ORDER BY timestamp DESC LIMIT 50",
+        "SELECT id FROM predictions WHERE prediction = 'Low' ORDER BY timestamp DESC LIMIT 50",
+    ),
+    (
+        'Medium size, digital tech <= 1, last 30 days',
+        f"""SELECT COUNT(*) FROM predictions WHERE enterprise_size = 'Medium'
+            AND json_extract(input_data, '$."{DIGITAL}"') <= 1
+            AND timestamp >= datetime('now', '-30 days')""",
+        """SELECT COUNT(*) FROM predictions WHERE enterprise_size = 'Medium'
+            AND digital_technologies <= 1
+            AND timestamp >= datetime('now', '-30 days')""",
+    ),
+]
+
+
+def populate(db_path: Path, rows: int, seed: int = 42):
+    """Create the unmigrated table and fill it with `rows` predictions over the last year"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    conn = sqlite3.connect(db_path)
+    conn.execute(CREATE_PREDICTIONS_SQL)
+    
+    insert = '''
+        INSERT INTO predictions (
+            prediction, confidence_high, confidence_medium, confidence_low,
+            input_data, enterprise_size, enterprise_age, timestamp
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    batch = []
+    for i in range(rows):
+        size = rng.choice(['Small', 'Medium', 'Large'])
+        age = rng.randint(1, 60)
+        input_data = {
+            'Location': 1.0,
+            'About Enterprises, Owners Motivation': rng.randint(1, 5),
+            DIGITAL: rng.randint(0, 4),
+            'Outcome : Growth and Effeciency': round(rng.uniform(0, 30), 1),
+            'Enterprise_Age': age,
+            'Small/Medium/Large': size
+        }
+        high, medium = rng.random(), rng.random()
+        low = max(0.0, 1 - high - medium)
+        prediction = max((('High', high), ('Medium', medium), ('Low', low)), key=lambda p: p[1])[0]
+        timestamp = (now - timedelta(seconds=rng.randint(0, 365 * 86400))).strftime('%Y-%m-%d %H:%M:%S')
+        batch.append((prediction, high, medium, low, json.dumps(input_data), size, age, timestamp))
+        if len(batch) == 50000:
+            conn.executemany(insert, batch)
+            batch = []
+    if batch:
+        conn.executemany(insert, batch)
+    conn.commit()
+    conn.close()
+
+
+def time_queries(db_path: Path, migrated: bool, repeat: int) -> dict:
+    """Return the best-of-N time in ms and the query plan for each query"""
+    conn = sqlite3.connect(db_path)
+    results = {}
+    for name, before, after in QUERIES:
+        sql = after if migrated else before
+        plan = ' | '.join(row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}'))
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(sql).fetchall()
+            timings.append(time.perf_counter() - start)
+        results[name] = {'best_ms': min(timings) * 1000, 'plan': plan}
+    conn.close()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--db', help='Build the history database at this path and keep it (default: a temporary file)')
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+    if args.db and Path(args.db).exists():
+        parser.error(f"{args.db} already exists; the benchmark builds a fresh database")
+    
+    print("=" * 80)
+    print(f"SCHEMA BENCHMARK ({args.rows:,} rows)")
+    print("=" * 80)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(args.db) if args.db else Path(tmp) / 'history.db'
+        
+        start = time.perf_counter()
+        populate(db_path, args.rows)
+        print(f"\nPopulated in {time.perf_counter() - start:.1f}s")
+        before = time_queries(db_path, migrated=False, repeat=args.repeat)
+        
+        start = time.perf_counter()
+        PredictionDatabase(str(db_path)).close()
+        migration_seconds = time.perf_counter() - start
+        print(f"Migrated in {migration_seconds:.1f}s")
+        after = time_queries(db_path, migrated=True, repeat=args.repeat)
+    
+    print(f"\n{'query':<48}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for name, _, _ in QUERIES:
+        b, a = before[name]['best_ms'], after[name]['best_ms']
+        print(f"{name:<48}{b:>12.2f}{a:>12.2f}{b / a if a else float('inf'):>9.1f}x")
+        print(f"   before: {before[name]['plan']}")
+        print(f"   after:  {after[name]['plan']}")
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'rows': args.rows,
+                'migration_seconds': migration_seconds,
+                'before': before,
+                'after': after
+            }, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    
+    print("\n" + "=" * 80)
@@ -0,0 +1,130 @@
+"""
+Dashboard statistics benchmark
+Compares PredictionDatabase.get_statistics (reads the prediction_rollups
+table) with the previous implementation (five aggregate queries over the full
+predictions table) on a synthetic history, and checks both return the same
+numbers.
+
+Usage:
+    python benchmarks/bench_statistics.py [--rows 1000000] [--repeat 5] [--json results.json]
+"""
+import argparse
+import json
+import math
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_schema import populate
+from models.database import PredictionDatabase
+
+
+def legacy_statistics(conn) -> dict:
+    """Statistics computed the old way, by scanning predictions"""
+    total = conn.execute('SELECT COUNT(*) FROM predictions').fetchone()[0]
+    distribution = dict(conn.execute(
+        'SELECT prediction, COUNT(*) FROM predictions GROUP BY prediction'
+    ).fetchall())
+    avg_confidence = dict(conn.execute('''
+        SELECT prediction, AVG(CASE
+            WHEN prediction = 'High' THEN confidence_high
+            WHEN prediction = 'Medium' THEN confidence_medium
+            WHEN prediction = 'Low' THEN confidence_low
+        END)
+        FROM predictions GROUP BY prediction
+    ''').fetchall())
+    size_distribution = dict(conn.execute('''
+        SELECT enterprise_size, COUNT(*) FROM predictions
+        WHERE enterprise_size IS NOT NULL GROUP BY enterprise_size
+    ''').fetchall())
+    recent_count = conn.execute(
+        "SELECT COUNT(*) FROM predictions WHERE timestamp >= datetime('now', '-7 days')"
+    ).fetchone()[0]
+    return {
+        'total_predictions': total,
+        'distribution': distribution,
+        'average_confidence': avg_confidence,
+        'size_distribution': size_distribution,
+        'recent_predictions_7days': recent_count
+    }
+
+
+def same_statistics(legacy: dict, rollup: dict) -> bool:
+    """Compare counts exactly and average confidences up to rounding"""
+    for key in ('total_predictions', 'distribution', 'size_distribution', 'recent_predictions_7days'):
+        if legacy[key] != rollup[key]:
+            print(f"   ✗ {key}: {legacy[key]} != {rollup[key]}")
+            return False
+    for prediction, value in legacy['average_confidence'].items():
+        if not math.isclose(value, rollup['average_confidence'].get(prediction, math.nan), rel_tol=1e-9):
+            print(f"   ✗ average_confidence[{prediction}]: {value} != {rollup['average_confidence'].get(prediction)}")
+            return False
+    return True
+
+
+def best_of(fn, repeat: int) -> float:
+    """Best wall time of `repeat` calls in ms"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+    
+    print("=" * 80)
+    print(f"STATISTICS BENCHMARK ({args.rows:,} rows)")
+    print("=" * 80)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'history.db'
+        populate(db_path, args.rows)
+        db = PredictionDatabase(str(db_path))
+        
+        with db.connections.read() as conn:
+            legacy_ms = best_of(lambda: legacy_statistics(conn), args.repeat)
+            legacy = legacy_statistics(conn)
+        rollup_ms = best_of(db.get_statistics, args.repeat)
+        rollup = db.get_statistics()
+        matches = same_statistics(legacy, rollup)
+        
+        # Trigger overhead on inserts
+        rows = [('High', {'High': 0.9, 'Medium': 0.05, 'Low': 0.05}, {'Small/Medium/Large': 'Small'})] * 10000
+        start = time.perf_counter()
+        db.save_predictions_bulk(rows)
+        insert_rows_per_sec = len(rows) / (time.perf_counter() - start)
+        
+        # Rollups must stay in sync after inserts and deletes
+        db.delete_prediction(1)
+        with db.connections.read() as conn:
+            matches = matches and same_statistics(legacy_statistics(conn), db.get_statistics())
+        db.close()
+    
+    print(f"\nfull-scan queries:  {legacy_ms:10.2f} ms")
+    print(f"rollup queries:     {rollup_ms:10.2f} ms   ({legacy_ms / rollup_ms:.0f}x faster)")
+    print(f"bulk insert:        {insert_rows_per_sec:10.0f} rows/s (with rollup triggers)")
+    print(f"results identical:  {'✓' if matches else '✗'}")
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'rows': args.rows,
+                'legacy_ms': legacy_ms,
+                'rollup_ms': rollup_ms,
+                'insert_rows_per_sec': insert_rows_per_sec,
+                'matches': matches
+            }, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    
+    print("\n" + "=" * 80)
+    sys.exit(0 if matches else 1)
@@ -0,0 +1,149 @@
+"""
+Worker memory benchmark
+Starts the API with N workers in each deployment mode and reports the memory
+of every worker process once all of them are warmed up:
+    
+    uvicorn           uvicorn --workers N (each worker unpickles the model)
+    gunicorn-preload  gunicorn -c gunicorn.conf.py (model loaded once, forked)
+
+RSS counts shared pages in every process, so PSS (shared pages split between
+the processes mapping them) and USS (private pages only) are reported too.
+Linux only (reads /proc/<pid>/smaps_rollup).
+
+Usage:
+    python benchmarks/bench_worker_memory.py [--workers 4] [--port 8765] [--json results.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+MODES = {
+    'uvicorn': lambda port, workers: [
+        sys.executable, '-m', 'uvicorn', 'main:app',
+        '--host', '127.0.0.1', '--port', str(port), '--workers', str(workers)
+    ],
+    'gunicorn-preload': lambda port, workers: [
+        sys.executable, '-m', 'gunicorn', 'main:app', '-c', 'gunicorn.conf.py',
+        '--bind', f'127.0.0.1:{port}', '--workers', str(workers)
+    ],
+}
+
+
+def read_memory_kb(pid: int) -> dict:
+    """Return RSS, PSS and USS of a process in kB"""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(':'):
+                fields[parts[0][:-1]] = int(parts[1])
+    return {
+        'rss_kb': fields.get('Rss', 0),
+        'pss_kb': fields.get('Pss', 0),
+        'uss_kb': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+    }
+
+
+def child_pids(parent: int) -> list:
+    """Return PIDs of direct children of a process"""
+    children = []
+    for entry in Path('/proc').iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / 'stat').read_text()
+        except OSError:
+            continue
+        # Field 4 is the parent PID; the command name (field 2) may contain spaces
+        ppid = int(stat.rsplit(')', 1)[1].split()[1])
+        if ppid == parent:
+            children.append(int(entry.name))
+    return children
+
+
+def wait_until_ready(port: int, timeout: float) -> bool:
+    """Poll /ready until it returns 200"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/ready', timeout=2) as response:
+                if response.status == 200:
+                    return True
+        except Exception:
+            pass
+        time.sleep(0.5)
+    return False
+
+
+def measure(mode: str, workers: int, port: int, settle: float, timeout: float) -> dict:
+    """Start the server in one mode and measure master + worker memory"""
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers))
+    process = subprocess.Popen(
+        MODES[mode](port, workers), cwd=BACKEND_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        if not wait_until_ready(port, timeout):
+            raise RuntimeError(f"{mode}: server did not become ready within {timeout}s")
+        # /ready answers from whichever worker got the request; give the
+        # others time to finish their own warm-up
+        time.sleep(settle)
+        
+        master = read_memory_kb(process.pid)
+        worker_memory = [read_memory_kb(pid) for pid in child_pids(process.pid)]
+        worker_memory = sorted(worker_memory, key=lambda m: m['rss_kb'], reverse=True)[:workers]
+        
+        return {
+            'mode': mode,
+            'workers': len(worker_memory),
+            'master': master,
+            'per_worker': worker_memory,
+            'avg_worker_rss_kb': sum(m['rss_kb'] for m in worker_memory) // max(len(worker_memory), 1),
+            'avg_worker_pss_kb': sum(m['pss_kb'] for m in worker_memory) // max(len(worker_memory), 1),
+            'avg_worker_uss_kb': sum(m['uss_kb'] for m in worker_memory) // max(len(worker_memory), 1),
+            'total_pss_kb': master['pss_kb'] + sum(m['pss_kb'] for m in worker_memory)
+        }
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--settle', type=float, default=5.0, help='Seconds to wait after first /ready')
+    parser.add_argument('--timeout', type=float, default=120.0)
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+    
+    print("=" * 80)
+    print(f"WORKER MEMORY BENCHMARK ({args.workers} workers)")
+    print("=" * 80)
+    
+    results = []
+    for mode in MODES:
+        result = measure(mode, args.workers, args.port, args.settle, args.timeout)
+        results.append(result)
+        print(f"\n{mode}")
+        print(f"   master:     RSS {result['master']['rss_kb'] / 1024:8.1f} MB   PSS {result['master']['pss_kb'] / 1024:8.1f} MB")
+        for i, m in enumerate(result['per_worker']):
+            print(f"   worker {i}:   RSS {m['rss_kb'] / 1024:8.1f} MB   PSS {m['pss_kb'] / 1024:8.1f} MB   USS {m['uss_kb'] / 1024:8.1f} MB")
+        print(f"   total PSS:  {result['total_pss_kb'] / 1024:.1f} MB")
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    
+    print("\n" + "=" * 80)
@@ -0,0 +1,292 @@
+"""
+Hot-path microbenchmark suite
+Times model loading, single and batched inference (sklearn pipeline and
+compiled NumPy model), database inserts and queries on synthetic histories of
+several sizes, and PDF report rendering. All inputs come from fixed seeds
+(utils.synthetic_inputs draws from the model's fitted feature ranges), so two
+runs on the same machine measure the same work.
+
+Results are written as JSON (per case: median/min/max ms per operation and
+ops/sec) together with the git commit, library versions and machine, so runs
+of different commits can be compared:
+
+    python benchmarks/run_suite.py --json before.json
+    git checkout my-branch
+    python benchmarks/run_suite.py --json after.json --baseline before.json
+    python benchmarks/run_suite.py --compare before.json after.json
+
+Usage:
+    python benchmarks/run_suite.py [--groups model,inference,db,report] [--db-sizes 10000 100000 1000000]
+        [--repeat 7] [--seed 42] [--json results.json] [--baseline old.json] [--threshold 10]
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+import warnings
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+import numpy as np
+
+from benchmarks.bench_report_chart import sample_predictions
+from benchmarks.bench_schema import populate
+from models.database import PredictionDatabase
+from models.model_artifact import build_artifact
+from models.model_loader import SMEGrowthPredictor, find_model_path
+from models.prediction_cache import PredictionCache
+from utils.pdf_generator import generate_prediction_report
+from utils.synthetic_inputs import generate_inputs
+
+GROUPS = ['model', 'inference', 'db', 'report']
+BATCH_SIZE = 1000
+
+# Raised by the fitted imputer on every sklearn transform (Location was all
+# missing at training time)
+warnings.filterwarnings('ignore', message='Skipping features without any observed values')
+
+
+class Suite:
+    """Runs benchmark cases and collects their timings"""
+    
+    def __init__(self, repeat: int):
+        self.repeat = repeat
+        self.results = {}
+    
+    def bench(self, name: str, fn, items: int = 1):
+        """
+        Time `fn` like timeit: calibrate the number of calls so one round
+        takes at least 0.2s, then run `repeat` rounds. `items` is the number
+        of rows one call processes, for rows/sec of batch operations.
+        """
+        timer = timeit.Timer(fn)
+        number, _ = timer.autorange()
+        per_call_ms = [total / number * 1000 for total in timer.repeat(self.repeat, number)]
+        median_ms = statistics.median(per_call_ms)
+        
+        self.results[name] = {
+            'median_ms': median_ms,
+            'min_ms': min(per_call_ms),
+            'max_ms': max(per_call_ms),
+            'ops_per_sec': 1000 / median_ms,
+            'items_per_sec': items * 1000 / median_ms,
+            'calls': number * self.repeat
+        }
+        print(f"{name:<52}{median_ms:>12.4f}{min(per_call_ms):>12.4f}{items * 1000 / median_ms:>14,.0f}")
+
+
+def quietly(fn, *args, **kwargs):
+    """Call fn with its status prints suppressed"""
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        return fn(*args, **kwargs)
+
+
+def load_models(model_path: Path) -> dict:
+    """The sklearn pipeline and its compiled counterpart, with result caching off"""
+    models = {
+        'sklearn': quietly(SMEGrowthPredictor, str(model_path), compiled=False),
+        'compiled': quietly(SMEGrowthPredictor, str(model_path), compiled=True)
+    }
+    for model in models.values():
+        model.cache = PredictionCache(max_size=0)
+    return models
+
+
+def bench_model(suite: Suite, model_path: Path, models: dict, tmp: Path):
+    artifact_path = tmp / 'model.npz'
+    quietly(build_artifact, models['sklearn'], artifact_path)
+    suite.bench('model.load[pickle]', lambda: quietly(SMEGrowthPredictor, str(model_path)))
+    suite.bench('model.load[artifact]', lambda: quietly(SMEGrowthPredictor, str(artifact_path)))
+
+
+def bench_inference(suite: Suite, models: dict, records: list):
+    sklearn_model = models['sklearn']
+    batch = records[:BATCH_SIZE]
+    
+    next_record = itertools.cycle(records).__next__
+    suite.bench('inference.preprocess_input', lambda: sklearn_model.preprocess_input(next_record()))
+    suite.bench(f'inference.preprocess_batch[{BATCH_SIZE}]', lambda: sklearn_model.preprocess_batch(batch), BATCH_SIZE)
+    
+    for engine, model in models.items():
+        next_record = itertools.cycle(records).__next__
+        suite.bench(f'inference.predict[{engine}]', lambda: model.predict(next_record()))
+        suite.bench(
+            f'inference.predict_batch[{engine},{BATCH_SIZE}]',
+            lambda: model.predict_batch(batch, chunk_size=BATCH_SIZE), BATCH_SIZE
+        )
+    
+    # Cache hit path, with the cache size the app uses by default
+    cached = quietly(SMEGrowthPredictor, sklearn_model.model_path)
+    cached.predict(records[0])
+    suite.bench('inference.predict[cache hit]', lambda: cached.predict(records[0]))
+
+
+def bench_db(suite: Suite, sizes: list, model, records: list, seed: int, tmp: Path):
+    results = model.predict_batch(records)
+    rows = [
+        (result['prediction'], result['confidence_scores'], data)
+        for data, result in zip(records, results)
+    ]
+    next_row = itertools.cycle(rows).__next__
+    
+    for size in sizes:
+        db_path = tmp / f'history_{size}.db'
+        populate(db_path, size, seed=seed)
+        db = quietly(PredictionDatabase, str(db_path))
+        label = f'db[{size}]'
+        
+        suite.bench(f'{label}.save_prediction', lambda: db.save_prediction(*next_row()))
+        suite.bench(f'{label}.save_predictions_bulk[{BATCH_SIZE}]',
+                    lambda: db.save_predictions_bulk(rows[:BATCH_SIZE]), BATCH_SIZE)
+        suite.bench(f'{label}.get_statistics', db.get_statistics)
+        suite.bench(f'{label}.history_page', lambda: db.get_predictions_page({}, limit=50))
+        suite.bench(
+            f'{label}.history_page[filtered]',
+            lambda: db.get_predictions_page({'prediction': 'Low', 'enterprise_size': 'Medium'}, limit=50)
+        )
+        next_id = itertools.cycle(range(1, size + 1, max(size // 1000, 1))).__next__
+        suite.bench(f'{label}.get_prediction_by_id', lambda: db.get_prediction_by_id(next_id()))
+        
+        db.close()
+        for path in tmp.glob(f'{db_path.name}*'):
+            path.unlink()
+
+
+def bench_report(suite: Suite, seed: int):
+    predictions = sample_predictions(100, seed)
+    next_prediction = itertools.cycle(predictions).__next__
+    suite.bench('report.generate_prediction_report', lambda: generate_prediction_report(next_prediction()))
+
+
+def environment() -> dict:
+    """Commit and machine the results belong to"""
+    def git(*args):
+        try:
+            return subprocess.run(
+                ['git', *args], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    
+    import sklearn
+    import pandas
+    return {
+        'commit': git('rev-parse', 'HEAD'),
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+        'timestamp': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pandas.__version__,
+        'sklearn': sklearn.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count()
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """Print the median change of every case in both runs; return the regressed cases"""
+    print(f"\n{'case':<52}{'baseline ms':>12}{'current ms':>12}{'change':>10}")
+    regressions = []
+    for name, result in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            print(f"{name:<52}{'-':>12}{result['median_ms']:>12.4f}{'new':>10}")
+            continue
+        change = (result['median_ms'] / before['median_ms'] - 1) * 100
+        flag = ''
+        if change > threshold:
+            regressions.append(name)
+            flag = '  ✗ slower'
+        elif change < -threshold:
+            flag = '  ✓ faster'
+        print(f"{name:<52}{before['median_ms']:>12.4f}{result['median_ms']:>12.4f}{change:>+9.1f}%{flag}")
+    
+    print(f"\nbaseline {baseline['environment'].get('commit') or '?'} -> "
+          f"current {current['environment'].get('commit') or '?'}")
+    if baseline['environment'].get('platform') != current['environment'].get('platform'):
+        print("Warning: results come from different machines")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--groups', default=','.join(GROUPS), help=f"Comma-separated subset of {GROUPS}")
+    parser.add_argument('--db-sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--records', type=int, default=2000, help='Synthetic input records')
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='Write results to this file')
+    parser.add_argument('--baseline', help='Compare this run against earlier results')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help='Compare two results files without running anything')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Median slowdown (%%) reported as a regression')
+    args = parser.parse_args()
+    
+    if args.compare:
+        with open(args.compare[0]) as f, open(args.compare[1]) as g:
+            regressions = compare(json.load(f), json.load(g), args.threshold)
+        sys.exit(1 if regressions else 0)
+    
+    groups = [group.strip() for group in args.groups.split(',') if group.strip()]
+    unknown = sorted(set(groups) - set(GROUPS))
+    if unknown:
+        parser.error(f"unknown groups: {unknown}")
+    
+    print("=" * 80)
+    print(f"BENCHMARK SUITE ({', '.join(groups)}; seed {args.seed})")
+    print("=" * 80)
+    
+    np.random.seed(args.seed)
+    model_path = find_model_path(prefer_artifact=False)
+    models = load_models(model_path)
+    records = generate_inputs(models['sklearn'], args.records, seed=args.seed)
+    
+    suite = Suite(args.repeat)
+    print(f"\n{'case':<52}{'median ms':>12}{'min ms':>12}{'items/s':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        if 'model' in groups:
+            bench_model(suite, model_path, models, tmp)
+        if 'inference' in groups:
+            bench_inference(suite, models, records)
+        if 'db' in groups:
+            bench_db(suite, args.db_sizes, models['compiled'], records, args.seed, tmp)
+        if 'report' in groups:
+            bench_report(suite, args.seed)
+    
+    output = {
+        'environment': environment(),
+        'config': {
+            'groups': groups,
+            'db_sizes': args.db_sizes,
+            'records': args.records,
+            'repeat': args.repeat,
+            'seed': args.seed
+        },
+        'results': suite.results
+    }
+    
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(output, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(json.load(f), output, args.threshold)
+    
+    print("\n" + "=" * 80)
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,100 @@
+"""
+Build the compiled model artifact
+Converts the pickled sklearn pipeline into a versioned NumPy artifact (.npz
+plus .manifest.json with a SHA-256 checksum) next to it, then checks that the
+artifact reproduces the pipeline's predictions and loads without sklearn or
+pandas. get_model() prefers the artifact over the pickle it was built from.
+
+Run it at build/deploy time, after installing requirements.
+
+Usage:
+    python build_model_artifact.py [model.pkl] [--output model.npz] [--check 2000]
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from check_parity import check_artifact
+from models.model_artifact import ARTIFACT_SUFFIX, build_artifact, manifest_path
+from models.model_loader import SMEGrowthPredictor, find_model_path
+from utils.synthetic_inputs import generate_inputs
+
+# Loads the artifact in a fresh interpreter and reports what it imported
+LOAD_PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+from models.model_loader import SMEGrowthPredictor
+model = SMEGrowthPredictor(sys.argv[1])
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    'load_ms': elapsed * 1000,
+    'heavy_modules': [name for name in ('sklearn', 'pandas', 'scipy') if name in sys.modules]
+}))
+'''
+
+
+def probe_load(artifact_path: Path) -> dict:
+    """Time loading the artifact from a cold interpreter"""
+    child = subprocess.run(
+        [sys.executable, '-c', LOAD_PROBE, str(artifact_path)],
+        cwd=Path(__file__).parent, capture_output=True, text=True
+    )
+    if child.returncode != 0:
+        raise RuntimeError(f"Loading {artifact_path} failed:\n{child.stderr[-2000:]}")
+    return json.loads(child.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('model', nargs='?', help="Pickled model (defaults to the one get_model() would find)")
+    parser.add_argument('--output', help=f"Artifact path (defaults to the model path with {ARTIFACT_SUFFIX})")
+    parser.add_argument('--check', type=int, default=2000,
+                        help="Synthetic records for the parity check (0 to skip)")
+    args = parser.parse_args()
+    
+    model_path = Path(args.model) if args.model else find_model_path(prefer_artifact=False)
+    if model_path.suffix == ARTIFACT_SUFFIX:
+        print(f"✗ {model_path} is already a compiled artifact", file=sys.stderr)
+        sys.exit(1)
+    output = Path(args.output) if args.output else model_path.with_suffix(ARTIFACT_SUFFIX)
+    
+    print("=" * 80)
+    print("BUILD COMPILED MODEL ARTIFACT")
+    print("=" * 80)
+    
+    model = SMEGrowthPredictor(str(model_path), compiled=False)
+    try:
+        manifest = build_artifact(model, output)
+    except ValueError as e:
+        print(f"✗ Cannot compile {model_path}: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    print(f"\n✓ Wrote {output} ({manifest['artifact']['bytes'] / 1024:.0f} KB, "
+          f"{manifest['n_trees']} trees, {manifest['n_nodes']} nodes)")
+    print(f"   sha256 {manifest['artifact']['sha256']}")
+    print(f"   source {manifest['source']['file']} ({model_path.stat().st_size / 1024:.0f} KB, "
+          f"sklearn {manifest['source']['sklearn_version']})")
+    
+    failed = False
+    probe = probe_load(output)
+    print(f"\n✓ Cold load {probe['load_ms']:.0f} ms (imports included)")
+    if probe['heavy_modules']:
+        print(f"✗ Loading the artifact imported {', '.join(probe['heavy_modules'])}")
+        failed = True
+    
+    if args.check > 0:
+        print(f"\nParity against the sklearn pipeline ({args.check} records)")
+        mismatches = check_artifact(model, generate_inputs(model, args.check), artifact_path=output)
+        print(f"   {'✓ identical' if mismatches == 0 else f'✗ {mismatches} mismatches'}")
+        failed |= mismatches > 0
+    
+    if failed:
+        # Never leave behind an artifact that get_model() would pick up
+        output.unlink(missing_ok=True)
+        manifest_path(output).unlink(missing_ok=True)
+        print(f"\n✗ Removed {output}; the app will keep serving {model_path.name}")
+    
+    print("\n" + "=" * 80)
+    sys.exit(1 if failed else 0)
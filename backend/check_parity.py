@@ -0,0 +1,221 @@
+"""
+Regression check for SMEGrowthPredictor inference paths
+Compares the optimized prediction paths against the reference sklearn calls
+over synthetic inputs drawn from the model's input space.
+
+Usage:
+    python check_parity.py [n_samples]
+"""
+import sys
+import tempfile
+from pathlib import Path
+import numpy as np
+from models.model_loader import SMEGrowthPredictor, find_model_path
+from models.compiled_model import CompiledModel
+from models.model_artifact import build_artifact
+from models.prediction_cache import PredictionCache
+from models.threshold_quantizer import ThresholdQuantizer
+from utils.synthetic_inputs import FLOAT_FEATURES, generate_inputs
+
+
+def reference_predict(model, data: dict) -> dict:
+    """Original two-pass inference: pipeline.predict, then pipeline.predict_proba"""
+    df = model.preprocess_input(data)
+    prediction_encoded = model.pipeline.predict(df)[0]
+    prediction_label = model.label_encoder.inverse_transform([prediction_encoded])[0]
+    probabilities = model.pipeline.predict_proba(df)[0]
+    return {
+        'prediction': prediction_label,
+        'confidence_scores': {
+            label: float(probabilities[i])
+            for i, label in enumerate(model.label_encoder.classes_)
+        },
+        'prediction_encoded': int(prediction_encoded)
+    }
+
+
+def check_single_pass(model, records) -> int:
+    """predict() must match the two-pass reference exactly"""
+    mismatches = 0
+    for i, data in enumerate(records):
+        expected = reference_predict(model, data)
+        actual = model.predict(data)
+        if actual != expected:
+            mismatches += 1
+            print(f"   ✗ record {i}: expected {expected}, got {actual}")
+    return mismatches
+
+
+def check_batch(model, records) -> int:
+    """predict_batch() must match predict() row by row"""
+    mismatches = 0
+    batch = model.predict_batch(records, chunk_size=97)
+    for i, (data, actual) in enumerate(zip(records, batch)):
+        expected = model.predict(data)
+        if actual['prediction'] != expected['prediction'] or not np.allclose(
+            list(actual['confidence_scores'].values()),
+            list(expected['confidence_scores'].values()),
+            rtol=0, atol=1e-12
+        ):
+            mismatches += 1
+            print(f"   ✗ record {i}: expected {expected}, got {actual}")
+    return mismatches
+
+
+def check_compiled(model, records) -> int:
+    """CompiledModel must reproduce the sklearn pipeline's probabilities"""
+    compiled = CompiledModel.from_pipeline(
+        model.pipeline, model.numeric_features, model.categorical_features
+    )
+    
+    expected = model.pipeline.predict_proba(model.preprocess_batch(records))
+    X = compiled.transform(records)
+    actual = compiled.predict_proba(X)
+    
+    # Trees are summed in a different order than sklearn's threaded
+    # accumulation, so allow for last-bit rounding differences only
+    mismatched = ~np.isclose(actual, expected, rtol=0, atol=1e-12).all(axis=1)
+    mismatched |= actual.argmax(axis=1) != expected.argmax(axis=1)
+    for i in np.flatnonzero(mismatched):
+        print(f"   ✗ record {i}: expected {expected[i]}, got {actual[i]}")
+    
+    # Single-row transform (the fast path) must match the batched one
+    for i, data in enumerate(records[:200]):
+        if not np.array_equal(compiled.transform([data])[0], X[i]):
+            mismatched[i] = True
+            print(f"   ✗ record {i}: single-row transform differs from batch")
+    
+    return int(mismatched.sum())
+
+
+def check_artifact(model, records, artifact_path=None) -> int:
+    """
+    The compiled artifact, loaded through the NumPy-only runtime, must
+    reproduce the sklearn pipeline's predictions
+    
+    Builds a throwaway artifact from `model` unless `artifact_path` is given.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        if artifact_path is None:
+            artifact_path = Path(tmp) / 'model.npz'
+            build_artifact(model, artifact_path)
+        runtime = SMEGrowthPredictor(str(artifact_path))
+    
+    mismatches = 0
+    for attribute in ('numeric_features', 'categorical_features', 'label_map'):
+        if getattr(runtime, attribute) != getattr(model, attribute):
+            mismatches += 1
+            print(f"   ✗ {attribute}: expected {getattr(model, attribute)}, got {getattr(runtime, attribute)}")
+    
+    probabilities = model.pipeline.predict_proba(model.preprocess_batch(records))
+    expected = model._results_from_probabilities(probabilities)
+    actual = runtime.predict_batch(records)
+    for i, (e, a) in enumerate(zip(expected, actual)):
+        if (
+            a['prediction'] != e['prediction']
+            or a['prediction_encoded'] != e['prediction_encoded']
+            or list(a['confidence_scores']) != list(e['confidence_scores'])
+            or not np.allclose(
+                list(a['confidence_scores'].values()),
+                list(e['confidence_scores'].values()),
+                rtol=0, atol=1e-12
+            )
+        ):
+            mismatches += 1
+            print(f"   ✗ record {i}: expected {e}, got {a}")
+    
+    return mismatches
+
+
+def interval_variants(model, records, seed: int = 0) -> list:
+    """
+    Nearby variants of each record: every numeric feature nudged on its
+    own, plus a few variants with all numeric features nudged at once
+    """
+    rng = np.random.default_rng(seed)
+    variants = []
+    for i, data in enumerate(records):
+        for feat in model.numeric_features:
+            deltas = (-1.0, -0.5, -0.1, 0.1, 0.5, 1.0) if feat in FLOAT_FEATURES else (-2, -1, 1, 2)
+            variants.extend((i, {**data, feat: data[feat] + delta}) for delta in deltas)
+        for _ in range(4):
+            variants.append((i, {
+                **data,
+                **{
+                    feat: round(data[feat] + rng.uniform(-1, 1), 1) if feat in FLOAT_FEATURES
+                    else data[feat] + int(rng.integers(-1, 2))
+                    for feat in model.numeric_features
+                }
+            }))
+    return variants
+
+
+def check_interval_keys(model, records) -> int:
+    """
+    Inputs sharing an interval cache key must get identical predictions
+    
+    Variants of each record that land in the same threshold interval on
+    every split feature are scored with the sklearn pipeline and must match
+    the original record, so serving them from one cache entry is exact.
+    """
+    quantizer = ThresholdQuantizer(CompiledModel.from_pipeline(
+        model.pipeline, model.numeric_features, model.categorical_features
+    ))
+    records = records[:500]
+    keys = quantizer.keys(records)
+    candidates = interval_variants(model, records)
+    candidate_keys = quantizer.keys([variant for _, variant in candidates])
+    variants = [(i, variant) for (i, variant), key in zip(candidates, candidate_keys) if key == keys[i]]
+    
+    expected = model.pipeline.predict_proba(model.preprocess_batch(records))
+    actual = model.pipeline.predict_proba(model.preprocess_batch([variant for _, variant in variants]))
+    mismatches = 0
+    for (i, variant), probabilities in zip(variants, actual):
+        if not np.allclose(probabilities, expected[i], rtol=0, atol=1e-12) or probabilities.argmax() != expected[i].argmax():
+            mismatches += 1
+            print(f"   ✗ record {i}: {variant} shares its key but scores {probabilities}, not {expected[i]}")
+    
+    # The single-record key (the fast path) must match the batched one
+    for i, (data, key) in enumerate(zip(records, keys)):
+        if quantizer.key(data) != key:
+            mismatches += 1
+            print(f"   ✗ record {i}: single-record key {quantizer.key(data)} differs from batch key {key}")
+    
+    exact_keys = {
+        PredictionCache.make_key(variant, model.numeric_features, model.categorical_features)
+        for variant in records + [variant for _, variant in variants]
+    }
+    print(f"   {len(variants)} equivalent variants of {len(records)} records; "
+          f"{len(exact_keys)} exact keys -> {len(set(keys))} interval keys")
+    return mismatches
+
+
+CHECKS = [
+    ("single-pass predict vs predict + predict_proba", check_single_pass),
+    ("batched predict vs single predict", check_batch),
+    ("compiled NumPy model vs sklearn pipeline", check_compiled),
+    ("compiled model artifact vs sklearn pipeline", check_artifact),
+    ("interval cache keys vs sklearn pipeline", check_interval_keys),
+]
+
+
+if __name__ == "__main__":
+    n_samples = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    
+    print("=" * 80)
+    print("INFERENCE PARITY CHECK")
+    print("=" * 80)
+    
+    # The checks compare against the sklearn pipeline, so always load the pickle
+    model = SMEGrowthPredictor(str(find_model_path(prefer_artifact=False)))
+    records = generate_inputs(model, n_samples)
+    
+    failed = 0
+    for name, check in CHECKS:
+        print(f"\n{name} ({n_samples} records)")
+        mismatches = check(model, records)
+        print(f"   {'✓ identical' if mismatches == 0 else f'✗ {mismatches} mismatches'}")
+        failed += mismatches > 0
+    
+    print("\n" + "=" * 80)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,66 @@
+"""
+Export prediction history to CSV, Parquet or Arrow IPC
+Streams the predictions table in chunks with features flattened into columns,
+the same as GET /api/dashboard/export.
+
+Usage:
+    python export_predictions.py output.parquet [--format parquet] [--db predictions.db]
+        [--prediction High] [--size Small] [--min-age 2] [--max-age 10]
+        [--start-date 2025-01-01] [--end-date 2025-01-31] [--chunk-size 50000]
+"""
+import argparse
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import date
+from pathlib import Path
+
+from models.database import PredictionDatabase, build_history_filters
+from utils.exporter import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_predictions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('output', help="Output file, or - for stdout")
+    parser.add_argument('--format', choices=sorted(EXPORT_FORMATS),
+                        help="Defaults to the output file's extension, else csv")
+    parser.add_argument('--db', default='predictions.db',
+                        help="Database path (relative paths resolve against backend/)")
+    parser.add_argument('--prediction')
+    parser.add_argument('--size')
+    parser.add_argument('--min-age', type=float)
+    parser.add_argument('--max-age', type=float)
+    parser.add_argument('--start-date', type=date.fromisoformat)
+    parser.add_argument('--end-date', type=date.fromisoformat)
+    parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+    
+    fmt = args.format
+    if fmt is None:
+        suffix = Path(args.output).suffix.lstrip('.')
+        fmt = next((name for name, (_, ext) in EXPORT_FORMATS.items() if ext == suffix or name == suffix), 'csv')
+    
+    # Keep status messages out of the export when writing to stdout
+    with redirect_stdout(sys.stderr):
+        db = PredictionDatabase(args.db)
+    filters = build_history_filters(
+        args.prediction, args.size, args.min_age, args.max_age, args.start_date, args.end_date
+    )
+    start = time.perf_counter()
+    written = 0
+    
+    out = sys.stdout.buffer if args.output == '-' else open(args.output, 'wb')
+    try:
+        for chunk in export_predictions(db, fmt, filters, chunk_size=args.chunk_size):
+            out.write(chunk)
+            written += len(chunk)
+    except RuntimeError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+        db.close()
+    
+    elapsed = time.perf_counter() - start
+    print(f"✓ Exported {fmt} ({written / 1e6:.1f} MB) in {elapsed:.1f}s", file=sys.stderr)
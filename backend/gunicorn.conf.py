@@ -0,0 +1,56 @@
+"""
+Gunicorn configuration for production
+Loads the model once in the master process and forks uvicorn workers from it,
+so all workers share the model's memory pages copy-on-write instead of each
+unpickling its own copy.
+
+Usage:
+    gunicorn main:app -c gunicorn.conf.py
+"""
+
+import gc
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+bind = f"{os.getenv('API_HOST', '0.0.0.0')}:{os.getenv('PORT', os.getenv('API_PORT', '8000'))}"
+workers = int(os.getenv('WEB_CONCURRENCY', 4))
+worker_class = 'uvicorn.workers.UvicornWorker'
+loglevel = 'info'
+accesslog = None
+
+# Import the app (and load the model below) in the master before forking
+preload_app = os.getenv('PRELOAD_MODEL', 'true').lower() in ('1', 'true', 'yes')
+
+# Workers write their Prometheus metrics to per-process files here, which
+# /metrics aggregates. Must be set before the app (and prometheus_client) is
+# imported, and start empty: files left by a previous run would be added in.
+if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = str(Path(tempfile.gettempdir()) / 'sme_metrics')
+    shutil.rmtree(os.environ['PROMETHEUS_MULTIPROC_DIR'], ignore_errors=True)
+os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+
+def on_starting(server):
+    """Load the model in the master process so forked workers inherit it"""
+    if not preload_app:
+        return
+    
+    from models.model_loader import get_model
+    
+    get_model()
+    
+    # Move everything allocated so far into the permanent generation, so the
+    # garbage collector in each worker never writes to (and copies) the
+    # shared model pages
+    gc.collect()
+    gc.freeze()
+    server.log.info("Model preloaded in master process, forking workers")
+
+
+def child_exit(server, worker):
+    """Drop the live gauges of a worker that exited"""
+    from prometheus_client import multiprocess
+    
+    multiprocess.mark_process_dead(worker.pid)
@@ -3,35 +3,98 @@ FastAPI Backend for SME Growth Prediction
 Main application entry point
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routes import predict, dashboard
+from fastapi.responses import JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+from routes import predict, dashboard, jobs
+from utils.metrics import (
+    CONTENT_TYPE_LATEST,
+    METRICS_ENABLED,
+    MetricsMiddleware,
+    mark_process_dead,
+    render_metrics,
+    sample_gauges,
+    start_metrics_sampler,
+    stop_metrics_sampler,
+)
 import uvicorn
-import sys
+import os
+import time
+
+# Number of synthetic predictions run at startup to warm up the model
+WARMUP_PREDICTIONS = int(os.getenv("WARMUP_PREDICTIONS", 8))
+
+# Readiness state reported by /ready
+readiness = {
+    "ready": False,
+    "model_loaded": False,
+    "database_ready": False,
+    "warmup_seconds": None,
+    "startup_seconds": None,
+    "error": None
+}
 
-# Make FeatureSelector available globally for unpickling
-# This must be done before any model loading
-from sklearn.base import BaseEstimator, TransformerMixin
 
-class FeatureSelector(BaseEstimator, TransformerMixin):
-    """Custom transformer for feature selection (required for unpickling)"""
-    def __init__(self, indices):
-        self.indices = indices
+def warm_up():
+    """Load the model and database and run warm-up predictions"""
+    from models.model_loader import get_model
+    from models.database import get_database
+    from utils.synthetic_inputs import generate_inputs
     
-    def fit(self, X, y=None):
-        return self
+    start = time.perf_counter()
+    readiness["error"] = None
+    try:
+        model = get_model()
+        readiness["model_loaded"] = True
+        
+        get_database()
+        readiness["database_ready"] = True
+        
+        if WARMUP_PREDICTIONS > 0:
+            records = generate_inputs(model, WARMUP_PREDICTIONS)
+            readiness["warmup_seconds"] = round(model.warm_up(records), 4)
+            print(f"✓ Warm-up completed ({WARMUP_PREDICTIONS} predictions in {readiness['warmup_seconds']}s)")
+        
+        readiness["ready"] = True
+    except Exception as e:
+        readiness["error"] = str(e)
+        print(f"Warning: Startup warm-up failed, worker not ready: {e}")
+    finally:
+        readiness["startup_seconds"] = round(time.perf_counter() - start, 4)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up the model before the worker accepts traffic"""
+    from utils.inference_executor import get_inference_executor, shutdown_inference_executor
+    from models.prediction_writer import get_prediction_writer, shutdown_prediction_writer
+    from utils.upload_jobs import shutdown_upload_job_executor
+    from utils.report_renderer import shutdown_report_executor
     
-    def transform(self, X):
-        return X[:, self.indices]
+    warm_up()
+    get_inference_executor()
+    if readiness["database_ready"]:
+        get_prediction_writer()
+    start_metrics_sampler()
+    yield
+    stop_metrics_sampler()
+    shutdown_upload_job_executor()
+    shutdown_report_executor()
+    shutdown_inference_executor()
+    # Flush queued predictions before the worker exits
+    shutdown_prediction_writer()
+    # Drop this worker's live gauges from the aggregated /metrics
+    mark_process_dead()
 
-# Register FeatureSelector in __main__ module for pickle
-sys.modules['__main__'].FeatureSelector = FeatureSelector
 
 # Create FastAPI app
 app = FastAPI(
     title="SME Growth Predictor API",
     description="API for predicting SME growth categories using machine learning",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -43,9 +106,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request counts and latency per route for /metrics
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Opt-in request profiling; profiles expose code paths and timings, so the
+# middleware and admin routes are only mounted with a token to guard them
+PROFILING_ENABLED = os.getenv("PROFILING", "false").lower() in ("1", "true", "yes")
+if PROFILING_ENABLED and not os.getenv("PROFILE_TOKEN"):
+    print("Warning: PROFILING=true but PROFILE_TOKEN is not set; request profiling is disabled")
+elif PROFILING_ENABLED:
+    from utils.profiler import ProfilingMiddleware
+    from routes import admin
+    app.add_middleware(ProfilingMiddleware)
+    app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
+
 # Include routers
 app.include_router(predict.router, prefix="/api", tags=["Predictions"])
 app.include_router(dashboard.router, prefix="/api/dashboard", tags=["Dashboard"])
+app.include_router(jobs.router, prefix="/api", tags=["Jobs"])
 
 
 @app.get("/")
@@ -57,9 +136,13 @@ async def root():
         "status": "running",
         "endpoints": {
             "health": "/health",
+            "ready": "/ready",
             "predict": "/api/predict",
+            "predict_batch": "/api/predict/batch",
+            "what_if": "/api/predict/what-if",
             "model_info": "/api/model-info",
             "features": "/api/features",
+            "metrics": "/metrics",
             "docs": "/docs"
         }
     }
@@ -81,12 +164,30 @@ async def health_check():
     }
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness endpoint: 200 once the model is loaded and warmed up, 503 before"""
+    if not readiness["ready"]:
+        return JSONResponse(status_code=503, content={"status": "not_ready", **readiness})
+    return {"status": "ready", **readiness}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics, aggregated over all worker processes"""
+    sample_gauges()
+    return Response(await run_in_threadpool(render_metrics), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.get("/wake")
 async def wake_up():
-    """Wake up endpoint to prevent cold starts"""
+    """Wake up endpoint to prevent cold starts (retries warm-up if startup failed)"""
+    if not readiness["ready"]:
+        # Loading the model and warming up block, so keep them off the event loop
+        await run_in_threadpool(warm_up)
     return {
-        "status": "awake",
-        "message": "Server is ready"
+        "status": "awake" if readiness["ready"] else "not_ready",
+        "message": "Server is ready" if readiness["ready"] else f"Server is not ready: {readiness['error']}"
     }
 
 
@@ -0,0 +1,191 @@
+"""
+Compiled Model
+Flattens the fitted preprocessing steps and RandomForest of the SME growth
+pipeline into plain NumPy arrays, so a prediction is a handful of array
+operations instead of a pandas DataFrame going through sklearn.
+"""
+
+import numpy as np
+from typing import List
+
+
+class CompiledModel:
+    """NumPy-only re-implementation of the fitted prediction pipeline"""
+    
+    def __init__(
+        self,
+        numeric_features: List[str],
+        categorical_features: List[str],
+        numeric_fill: np.ndarray,
+        numeric_keep: np.ndarray,
+        scaler_mean: np.ndarray,
+        scaler_scale: np.ndarray,
+        categories: List[np.ndarray],
+        unknown_value: float,
+        selected_indices: np.ndarray,
+        tree_roots: np.ndarray,
+        tree_feature: np.ndarray,
+        tree_threshold: np.ndarray,
+        tree_left: np.ndarray,
+        tree_right: np.ndarray,
+        tree_value: np.ndarray,
+        max_depth: int,
+        classes: np.ndarray
+    ):
+        self.numeric_features = numeric_features
+        self.categorical_features = categorical_features
+        self.numeric_fill = numeric_fill
+        self.numeric_keep = numeric_keep
+        self.scaler_mean = scaler_mean
+        self.scaler_scale = scaler_scale
+        self.categories = categories
+        self.unknown_value = unknown_value
+        self.selected_indices = selected_indices
+        self.tree_roots = tree_roots
+        self.tree_feature = tree_feature
+        self.tree_threshold = tree_threshold
+        self.tree_left = tree_left
+        self.tree_right = tree_right
+        self.tree_value = tree_value
+        self.max_depth = max_depth
+        self.classes = classes
+        
+        # Lookup tables for the ordinal encoding of each categorical feature
+        self._category_codes = [
+            {category: float(code) for code, category in enumerate(feature_categories)}
+            for feature_categories in categories
+        ]
+    
+    @classmethod
+    def from_pipeline(cls, pipeline, numeric_features: List[str], categorical_features: List[str]):
+        """
+        Extract fitted parameters from the sklearn pipeline
+        
+        Supports the structure the model was trained with:
+        ColumnTransformer(num=[SimpleImputer, StandardScaler],
+        cat=[SimpleImputer(constant), OrdinalEncoder]) -> FeatureSelector
+        -> RandomForestClassifier. Anything else raises ValueError.
+        """
+        steps = pipeline.named_steps
+        if set(steps) != {'preprocessor', 'feature_selector', 'classifier'}:
+            raise ValueError(f"Unsupported pipeline steps: {list(steps)}")
+        
+        preprocessor = steps['preprocessor']
+        transformers = [(name, columns) for name, _, columns in preprocessor.transformers_
+                        if name != 'remainder']
+        if transformers != [('num', list(numeric_features)), ('cat', list(categorical_features))]:
+            raise ValueError(f"Unsupported column layout: {transformers}")
+        
+        # Numeric branch: median imputation (drops all-missing columns) + scaling
+        numeric = preprocessor.named_transformers_['num'].named_steps
+        numeric_fill = np.asarray(numeric['imputer'].statistics_, dtype=np.float64)
+        if getattr(numeric['imputer'], 'keep_empty_features', False):
+            raise ValueError("Unsupported imputer option: keep_empty_features")
+        numeric_keep = np.flatnonzero(~np.isnan(numeric_fill))
+        scaler = numeric['scaler']
+        scaler_mean = np.asarray(scaler.mean_, dtype=np.float64)
+        scaler_scale = np.asarray(scaler.scale_, dtype=np.float64)
+        
+        # Categorical branch: ordinal encoding. Inputs are already strings at
+        # this point, so the constant imputer never fires.
+        encoder = preprocessor.named_transformers_['cat'].named_steps['ordinal']
+        if encoder.handle_unknown != 'use_encoded_value':
+            raise ValueError(f"Unsupported handle_unknown: {encoder.handle_unknown}")
+        categories = [np.asarray(c, dtype=str) for c in encoder.categories_]
+        
+        selected_indices = np.asarray(steps['feature_selector'].indices, dtype=np.int64)
+        
+        # Forest: concatenate all trees into flat node arrays. Leaves point at
+        # themselves so every row can take exactly max_depth steps.
+        forest = steps['classifier']
+        roots, features, thresholds, lefts, rights, values = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(n_nodes, dtype=np.int64)
+            is_leaf = tree.children_left == -1
+            
+            roots.append(offset)
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int64))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold).astype(np.float64))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            
+            # Same normalization as DecisionTreeClassifier.predict_proba
+            value = tree.value[:, 0, :].astype(np.float64)
+            normalizer = value.sum(axis=1, keepdims=True)
+            normalizer[normalizer == 0.0] = 1.0
+            values.append(value / normalizer)
+            
+            max_depth = max(max_depth, tree.max_depth)
+            offset += n_nodes
+        
+        return cls(
+            numeric_features=list(numeric_features),
+            categorical_features=list(categorical_features),
+            numeric_fill=numeric_fill,
+            numeric_keep=numeric_keep,
+            scaler_mean=scaler_mean,
+            scaler_scale=scaler_scale,
+            categories=categories,
+            unknown_value=float(encoder.unknown_value),
+            selected_indices=selected_indices,
+            tree_roots=np.asarray(roots, dtype=np.int64),
+            tree_feature=np.concatenate(features),
+            tree_threshold=np.concatenate(thresholds),
+            tree_left=np.concatenate(lefts),
+            tree_right=np.concatenate(rights),
+            tree_value=np.concatenate(values),
+            max_depth=int(max_depth),
+            classes=np.asarray(forest.classes_)
+        )
+    
+    def transform(self, records: List[dict]) -> np.ndarray:
+        """
+        Turn input records into the classifier's feature matrix
+        
+        Mirrors preprocess_input + ColumnTransformer + FeatureSelector. The
+        result is float32 because that is what sklearn trees compare against
+        their thresholds.
+        """
+        numeric = np.array(
+            [[_to_float(data[feat]) for feat in self.numeric_features] for data in records],
+            dtype=np.float64
+        ).reshape(len(records), len(self.numeric_features))
+        numeric = np.where(np.isnan(numeric), self.numeric_fill, numeric)[:, self.numeric_keep]
+        numeric = (numeric - self.scaler_mean) / self.scaler_scale
+        
+        categorical = np.array(
+            [
+                [
+                    codes.get(str(data[feat]), self.unknown_value)
+                    for feat, codes in zip(self.categorical_features, self._category_codes)
+                ]
+                for data in records
+            ],
+            dtype=np.float64
+        ).reshape(len(records), len(self.categorical_features))
+        
+        transformed = np.hstack([numeric, categorical])
+        return transformed[:, self.selected_indices].astype(np.float32)
+    
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Average leaf probabilities of all trees for each row of X"""
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.tree_roots, (X.shape[0], len(self.tree_roots)))
+        
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.tree_feature[nodes]] <= self.tree_threshold[nodes]
+            nodes = np.where(go_left, self.tree_left[nodes], self.tree_right[nodes])
+        
+        return self.tree_value[nodes].sum(axis=1) / len(self.tree_roots)
+
+
+def _to_float(value) -> float:
+    """Numeric coercion matching pd.to_numeric(errors='coerce')"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
@@ -4,10 +4,327 @@ Uses SQLite for simplicity and portability
 """
 
 import sqlite3
+import base64
 import json
-from datetime import datetime
+import os
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple
+
+from utils.metrics import timed_db
+
+
+# Shared statement text so sqlite3's per-connection statement cache reuses
+# the prepared INSERT for single and bulk saves
+INSERT_PREDICTION_SQL = '''
+    INSERT INTO predictions (
+        prediction,
+        confidence_high,
+        confidence_medium,
+        confidence_low,
+        input_data,
+        enterprise_size,
+        enterprise_age
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+CREATE_PREDICTIONS_SQL = '''
+    CREATE TABLE IF NOT EXISTS predictions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        prediction TEXT NOT NULL,
+        confidence_high REAL NOT NULL,
+        confidence_medium REAL NOT NULL,
+        confidence_low REAL NOT NULL,
+        input_data TEXT NOT NULL,
+        enterprise_size TEXT,
+        enterprise_age INTEGER
+    )
+'''
+
+# Stored (non-generated) columns, selected instead of * so reads don't
+# evaluate the generated feature columns
+PREDICTION_COLUMNS = '''
+    id, timestamp, prediction, confidence_high, confidence_medium,
+    confidence_low, input_data, enterprise_size, enterprise_age
+'''
+
+# Model input features promoted from the input_data JSON to typed generated
+# columns (Enterprise_Age and Small/Medium/Large already have real columns)
+FEATURE_COLUMNS = {
+    'Location': ('location', 'REAL'),
+    'About Enterprises, Owners Motivation': ('owner_motivation', 'INTEGER'),
+    'Enabler 2:Operational Process , Legacy & new machine to balance': ('operational_process', 'INTEGER'),
+    'Enabler 1: Effortable Digital technologies': ('digital_technologies', 'INTEGER'),
+    'Outcome : Growth and Effeciency': ('growth_efficiency', 'REAL'),
+    'Enabler 2 :Certification &Standarization': ('certification', 'INTEGER'),
+    'Challanges3: Financial assistant & Incentive ,transparency in institutional support ,': ('financial_assistance', 'INTEGER'),
+    'Enabler 3: Administrative and Regulatory Hurdles & Eco system Integration challenges': ('administrative_hurdles', 'INTEGER'),
+    'Enabler 4: Engaging local hire': ('local_hiring', 'INTEGER'),
+    'Challenges 2: Skill Gap ,Retaining resources and workforce Management': ('skill_gap', 'INTEGER'),
+}
+
+# Flat column layout for exports: stored columns plus the generated feature
+# columns, so rows can be written out without parsing input_data
+EXPORT_COLUMNS = [
+    'id', 'timestamp', 'prediction', 'confidence_high', 'confidence_medium',
+    'confidence_low', 'enterprise_size', 'enterprise_age',
+] + [column for column, _ in FEATURE_COLUMNS.values()]
+
+
+def build_history_filters(
+    prediction: Optional[str] = None,
+    enterprise_size: Optional[str] = None,
+    min_age: Optional[float] = None,
+    max_age: Optional[float] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> Dict:
+    """History filters for PredictionDatabase queries (date range is inclusive)"""
+    return {
+        'prediction': prediction,
+        'enterprise_size': enterprise_size,
+        'min_age': min_age,
+        'max_age': max_age,
+        'start': f"{start_date.isoformat()} 00:00:00" if start_date else None,
+        'end': f"{(end_date + timedelta(days=1)).isoformat()} 00:00:00" if end_date else None
+    }
+
+
+# Per-day x prediction x size counts and confidence sums, kept in sync with
+# predictions by triggers so dashboard statistics never scan the history.
+# A NULL enterprise size is stored as '' because NULLs never conflict in the
+# primary key.
+CREATE_ROLLUPS_SQL = '''
+    CREATE TABLE IF NOT EXISTS prediction_rollups (
+        day TEXT NOT NULL,
+        prediction TEXT NOT NULL,
+        enterprise_size TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        confidence_sum REAL NOT NULL,
+        PRIMARY KEY (day, prediction, enterprise_size)
+    ) WITHOUT ROWID
+'''
+
+# Confidence of the predicted class of a predictions row (NEW/OLD/table alias)
+_PREDICTED_CONFIDENCE = '''
+    IFNULL(CASE {row}.prediction
+        WHEN 'High' THEN {row}.confidence_high
+        WHEN 'Medium' THEN {row}.confidence_medium
+        WHEN 'Low' THEN {row}.confidence_low
+    END, 0.0)
+'''
+
+ROLLUP_TRIGGERS = [
+    ('trg_predictions_rollup_insert', f'''
+        CREATE TRIGGER IF NOT EXISTS trg_predictions_rollup_insert
+        AFTER INSERT ON predictions
+        BEGIN
+            INSERT INTO prediction_rollups (day, prediction, enterprise_size, count, confidence_sum)
+            VALUES (
+                date(NEW.timestamp), NEW.prediction, IFNULL(NEW.enterprise_size, ''),
+                1, {_PREDICTED_CONFIDENCE.format(row='NEW')}
+            )
+            ON CONFLICT (day, prediction, enterprise_size) DO UPDATE SET
+                count = count + 1,
+                confidence_sum = confidence_sum + excluded.confidence_sum;
+        END
+    '''),
+    ('trg_predictions_rollup_delete', f'''
+        CREATE TRIGGER IF NOT EXISTS trg_predictions_rollup_delete
+        AFTER DELETE ON predictions
+        BEGIN
+            UPDATE prediction_rollups SET
+                count = count - 1,
+                confidence_sum = confidence_sum - {_PREDICTED_CONFIDENCE.format(row='OLD')}
+            WHERE day = date(OLD.timestamp)
+                AND prediction = OLD.prediction
+                AND enterprise_size = IFNULL(OLD.enterprise_size, '');
+            DELETE FROM prediction_rollups
+            WHERE day = date(OLD.timestamp)
+                AND prediction = OLD.prediction
+                AND enterprise_size = IFNULL(OLD.enterprise_size, '')
+                AND count <= 0;
+        END
+    '''),
+]
+
+
+# Background scoring jobs for uploaded spreadsheets (see utils/upload_jobs.py)
+CREATE_UPLOAD_JOBS_SQL = '''
+    CREATE TABLE IF NOT EXISTS upload_jobs (
+        id TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        filename TEXT,
+        persist INTEGER NOT NULL DEFAULT 1,
+        progress REAL NOT NULL DEFAULT 0,
+        processed_rows INTEGER NOT NULL DEFAULT 0,
+        succeeded_rows INTEGER NOT NULL DEFAULT 0,
+        failed_rows INTEGER NOT NULL DEFAULT 0,
+        saved_rows INTEGER NOT NULL DEFAULT 0,
+        error TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        started_at DATETIME,
+        finished_at DATETIME
+    )
+'''
+
+UPLOAD_JOB_FIELDS = (
+    'status', 'progress', 'processed_rows', 'succeeded_rows', 'failed_rows',
+    'saved_rows', 'error', 'started_at', 'finished_at'
+)
+
+
+# Schema migrations as (version, description, statements). The applied
+# version is stored in PRAGMA user_version; append new entries, never edit
+# ones that have shipped.
+SCHEMA_MIGRATIONS = [
+    (1, "Index history by timestamp, prediction and enterprise size", [
+        'CREATE INDEX IF NOT EXISTS idx_predictions_timestamp ON predictions (timestamp)',
+        'CREATE INDEX IF NOT EXISTS idx_predictions_prediction ON predictions (prediction, timestamp)',
+        'CREATE INDEX IF NOT EXISTS idx_predictions_size ON predictions (enterprise_size, timestamp)',
+    ]),
+    (2, "Add generated columns for model features", [
+        f'''ALTER TABLE predictions ADD COLUMN {column} {sql_type}
+            GENERATED ALWAYS AS (json_extract(input_data, '$."{feature}"')) VIRTUAL'''
+        for feature, (column, sql_type) in FEATURE_COLUMNS.items()
+    ] + [
+        'CREATE INDEX IF NOT EXISTS idx_predictions_digital_technologies '
+        'ON predictions (digital_technologies, timestamp)',
+    ]),
+    (3, "Add statistics rollups maintained by triggers", [
+        CREATE_ROLLUPS_SQL,
+        f'''INSERT INTO prediction_rollups (day, prediction, enterprise_size, count, confidence_sum)
+            SELECT date(p.timestamp), p.prediction, IFNULL(p.enterprise_size, ''),
+                COUNT(*), SUM({_PREDICTED_CONFIDENCE.format(row='p')})
+            FROM predictions p
+            GROUP BY 1, 2, 3''',
+    ] + [sql for _, sql in ROLLUP_TRIGGERS]),
+    (4, "Add upload scoring jobs", [
+        CREATE_UPLOAD_JOBS_SQL,
+    ]),
+]
+
+
+class ConnectionManager:
+    """
+    Long-lived SQLite connections for one database file
+    
+    All writes go through a single writer connection guarded by a lock, so
+    concurrent savers queue in Python instead of fighting over the SQLite
+    write lock ("database is locked"). Each thread gets its own reader
+    connection; in WAL mode readers never block the writer and vice versa.
+    Connections are kept open so sqlite3's prepared-statement cache is reused.
+    """
+    
+    def __init__(
+        self,
+        db_path: Path,
+        cache_size_kb: int = 65536,
+        mmap_size: int = 268435456,
+        busy_timeout_ms: int = 5000,
+        cached_statements: int = 256
+    ):
+        self.db_path = db_path
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cached_statements = cached_statements
+        
+        self._write_lock = threading.Lock()
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._writer = None
+        self._pid = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with tuned pragmas"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        # NORMAL is durable in WAL mode except for the last commits on power loss
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA cache_size=-{int(self.cache_size_kb)}')
+        conn.execute(f'PRAGMA mmap_size={int(self.mmap_size)}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout_ms)}')
+        
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+    
+    def _check_fork(self):
+        """Drop connections inherited from a parent process (they must not be shared)"""
+        pid = os.getpid()
+        if self._pid != pid:
+            self._pid = pid
+            self._writer = None
+            self._local = threading.local()
+            with self._connections_lock:
+                self._connections = []
+    
+    @contextmanager
+    def write(self):
+        """Yield the writer connection inside a transaction (commit or rollback)"""
+        self._check_fork()
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._connect()
+            conn = self._writer
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    
+    @contextmanager
+    def read(self):
+        """Yield this thread's reader connection"""
+        self._check_fork()
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        yield conn
+    
+    @contextmanager
+    def dedicated(self):
+        """Yield a private connection, closed on exit (for long streaming reads)"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        # No mmap: a one-pass scan gains nothing from it and it would map up
+        # to mmap_size of the file into this process for the whole stream
+        try:
+            yield conn
+        finally:
+            conn.close()
+    
+    def close(self):
+        """Close all connections opened by this process"""
+        with self._write_lock, self._connections_lock:
+            if self._pid == os.getpid():
+                for conn in self._connections:
+                    try:
+                        conn.close()
+                    except sqlite3.Error:
+                        pass
+            self._connections = []
+            self._writer = None
+            self._local = threading.local()
 
 
 class PredictionDatabase:
@@ -15,31 +332,77 @@ class PredictionDatabase:
     
     def __init__(self, db_path: str = "predictions.db"):
         self.db_path = Path(__file__).parent.parent / db_path
+        self.connections = ConnectionManager(
+            self.db_path,
+            cache_size_kb=int(os.getenv('SQLITE_CACHE_SIZE_KB', 65536)),
+            mmap_size=int(os.getenv('SQLITE_MMAP_SIZE', 268435456))
+        )
         self.init_database()
     
     def init_database(self):
         """Initialize database and create tables if they don't exist"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS predictions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                prediction TEXT NOT NULL,
-                confidence_high REAL NOT NULL,
-                confidence_medium REAL NOT NULL,
-                confidence_low REAL NOT NULL,
-                input_data TEXT NOT NULL,
-                enterprise_size TEXT,
-                enterprise_age INTEGER
-            )
-        ''')
+        with self.connections.write() as conn:
+            conn.execute(CREATE_PREDICTIONS_SQL)
         
-        conn.commit()
-        conn.close()
+        self.migrate()
         print(f"✓ Database initialized at {self.db_path}")
     
+    def migrate(self):
+        """Apply pending schema migrations in one transaction"""
+        with self.connections.write() as conn:
+            # Take the write lock before reading the version, so workers
+            # starting at the same time don't apply a migration twice
+            conn.execute('BEGIN IMMEDIATE')
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            
+            for target, description, statements in SCHEMA_MIGRATIONS:
+                if target <= version:
+                    continue
+                for sql in statements:
+                    conn.execute(sql)
+                conn.execute(f'PRAGMA user_version = {int(target)}')
+                print(f"✓ Applied database migration {target}: {description}")
+    
+    def get_schema_version(self) -> int:
+        """Return the applied schema migration version"""
+        with self.connections.read() as conn:
+            return conn.execute('PRAGMA user_version').fetchone()[0]
+    
+    @staticmethod
+    def _prediction_params(
+        prediction: str,
+        confidence_scores: Dict[str, float],
+        input_data: Dict
+    ) -> tuple:
+        """Build INSERT parameters for one prediction"""
+        return (
+            prediction,
+            confidence_scores.get('High', 0.0),
+            confidence_scores.get('Medium', 0.0),
+            confidence_scores.get('Low', 0.0),
+            json.dumps(input_data),
+            input_data.get('Small/Medium/Large'),
+            input_data.get('Enterprise_Age')
+        )
+    
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict:
+        """Convert a predictions row to the API representation"""
+        return {
+            'id': row['id'],
+            'timestamp': row['timestamp'],
+            'prediction': row['prediction'],
+            'confidence_scores': {
+                'High': row['confidence_high'],
+                'Medium': row['confidence_medium'],
+                'Low': row['confidence_low']
+            },
+            'input_data': json.loads(row['input_data']),
+            'enterprise_size': row['enterprise_size'],
+            'enterprise_age': row['enterprise_age']
+        }
+    
+    @timed_db('save_prediction')
     def save_prediction(
         self,
         prediction: str,
@@ -52,143 +415,285 @@ class PredictionDatabase:
         Returns:
             prediction_id: ID of the saved prediction
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO predictions (
-                prediction,
-                confidence_high,
-                confidence_medium,
-                confidence_low,
-                input_data,
-                enterprise_size,
-                enterprise_age
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            prediction,
-            confidence_scores.get('High', 0.0),
-            confidence_scores.get('Medium', 0.0),
-            confidence_scores.get('Low', 0.0),
-            json.dumps(input_data),
-            input_data.get('Small/Medium/Large'),
-            input_data.get('Enterprise_Age')
-        ))
-        
-        prediction_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self.connections.write() as conn:
+            cursor = conn.execute(
+                INSERT_PREDICTION_SQL,
+                self._prediction_params(prediction, confidence_scores, input_data)
+            )
+            prediction_id = cursor.lastrowid
         
         return prediction_id
     
+    @timed_db('save_predictions_bulk')
+    def save_predictions_bulk(
+        self,
+        rows: List[Tuple[str, Dict[str, float], Dict]]
+    ) -> int:
+        """
+        Save many predictions in a single transaction
+        
+        Args:
+            rows: List of (prediction, confidence_scores, input_data) tuples
+        
+        Returns:
+            Number of saved predictions
+        """
+        with self.connections.write() as conn:
+            cursor = conn.executemany(INSERT_PREDICTION_SQL, [
+                self._prediction_params(prediction, confidence_scores, input_data)
+                for prediction, confidence_scores, input_data in rows
+            ])
+            saved = cursor.rowcount
+        
+        return saved
+    
+    @timed_db('get_all_predictions')
     def get_all_predictions(self, limit: int = 100) -> List[Dict]:
         """Get all predictions with optional limit"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM predictions
-            ORDER BY timestamp DESC
-            LIMIT ?
-        ''', (limit,))
-        
-        rows = cursor.fetchall()
-        conn.close()
-        
-        predictions = []
-        for row in rows:
-            predictions.append({
-                'id': row['id'],
-                'timestamp': row['timestamp'],
-                'prediction': row['prediction'],
-                'confidence_scores': {
-                    'High': row['confidence_high'],
-                    'Medium': row['confidence_medium'],
-                    'Low': row['confidence_low']
-                },
-                'input_data': json.loads(row['input_data']),
-                'enterprise_size': row['enterprise_size'],
-                'enterprise_age': row['enterprise_age']
-            })
-        
-        return predictions
+        with self.connections.read() as conn:
+            rows = conn.execute(f'''
+                SELECT {PREDICTION_COLUMNS} FROM predictions
+                ORDER BY timestamp DESC
+                LIMIT ?
+            ''', (limit,)).fetchall()
+        
+        return [self._row_to_dict(row) for row in rows]
+    
+    @staticmethod
+    def encode_cursor(row: sqlite3.Row) -> str:
+        """Opaque keyset cursor pointing just past a row"""
+        raw = json.dumps([row['timestamp'], row['id']]).encode()
+        return base64.urlsafe_b64encode(raw).decode()
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[str, int]:
+        """Decode a keyset cursor, raising ValueError if it is malformed"""
+        try:
+            timestamp, prediction_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return str(timestamp), int(prediction_id)
+        except Exception:
+            raise ValueError("Invalid cursor")
+    
+    @staticmethod
+    def _history_query(
+        filters: Dict,
+        cursor: Optional[str],
+        limit: Optional[int],
+        columns: str = PREDICTION_COLUMNS
+    ) -> Tuple[str, list]:
+        """
+        Build the filtered, keyset-paginated history query
+        
+        Supported filters: prediction, enterprise_size, min_age, max_age,
+        start (inclusive) and end (exclusive) as 'YYYY-MM-DD HH:MM:SS'
+        strings. Rows come newest first, ties broken by id, so the
+        (timestamp, id) of the last row is a stable cursor.
+        """
+        conditions = []
+        params = []
+        
+        if filters.get('prediction'):
+            conditions.append('prediction = ?')
+            params.append(filters['prediction'])
+        if filters.get('enterprise_size'):
+            conditions.append('enterprise_size = ?')
+            params.append(filters['enterprise_size'])
+        if filters.get('min_age') is not None:
+            conditions.append('enterprise_age >= ?')
+            params.append(filters['min_age'])
+        if filters.get('max_age') is not None:
+            conditions.append('enterprise_age <= ?')
+            params.append(filters['max_age'])
+        if filters.get('start'):
+            conditions.append('timestamp >= ?')
+            params.append(filters['start'])
+        if filters.get('end'):
+            conditions.append('timestamp < ?')
+            params.append(filters['end'])
+        if cursor:
+            conditions.append('(timestamp, id) < (?, ?)')
+            params.extend(PredictionDatabase.decode_cursor(cursor))
+        
+        sql = f'SELECT {columns} FROM predictions'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY timestamp DESC, id DESC'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        
+        return sql, params
+    
+    @timed_db('get_predictions_page')
+    def get_predictions_page(
+        self,
+        filters: Dict,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Get one page of filtered prediction history
+        
+        Returns:
+            (predictions, next_cursor); next_cursor is None on the last page
+        """
+        sql, params = self._history_query(filters, cursor, limit + 1)
+        with self.connections.read() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        
+        next_cursor = self.encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        return [self._row_to_dict(row) for row in rows[:limit]], next_cursor
+    
+    def iter_predictions(
+        self,
+        filters: Dict,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> Iterator[Dict]:
+        """
+        Stream filtered prediction history row by row
+        
+        Uses a private connection and fetches `batch_size` rows at a time, so
+        memory stays flat however many rows match.
+        """
+        for rows in self.iter_prediction_batches(filters, limit=limit, cursor=cursor, batch_size=batch_size):
+            for row in rows:
+                yield self._row_to_dict(row)
     
+    def iter_prediction_batches(
+        self,
+        filters: Dict,
+        columns: str = PREDICTION_COLUMNS,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> Iterator[List[sqlite3.Row]]:
+        """Stream raw rows of filtered history, `batch_size` rows at a time"""
+        sql, params = self._history_query(filters, cursor, limit, columns)
+        with self.connections.dedicated() as conn:
+            result = conn.execute(sql, params)
+            while True:
+                rows = result.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+    
+    @timed_db('get_predictions_by_ids')
+    def get_predictions_by_ids(self, prediction_ids: List[int]) -> List[Dict]:
+        """Get several predictions in one query, in the order of `prediction_ids` (missing IDs are skipped)"""
+        # json_each keeps this a single statement however many IDs are asked for
+        with self.connections.read() as conn:
+            rows = conn.execute(
+                f'SELECT {PREDICTION_COLUMNS} FROM predictions '
+                'WHERE id IN (SELECT value FROM json_each(?))',
+                (json.dumps([int(i) for i in prediction_ids]),)
+            ).fetchall()
+        
+        by_id = {row['id']: row for row in rows}
+        return [self._row_to_dict(by_id[i]) for i in dict.fromkeys(prediction_ids) if i in by_id]
+    
+    @timed_db('get_prediction_by_id')
     def get_prediction_by_id(self, prediction_id: int) -> Optional[Dict]:
         """Get a specific prediction by ID"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        with self.connections.read() as conn:
+            row = conn.execute(
+                f'SELECT {PREDICTION_COLUMNS} FROM predictions WHERE id = ?', (prediction_id,)
+            ).fetchone()
         
-        cursor.execute('SELECT * FROM predictions WHERE id = ?', (prediction_id,))
-        row = cursor.fetchone()
-        conn.close()
+        if not row:
+            return None
+        
+        return self._row_to_dict(row)
+    
+    @timed_db('create_upload_job')
+    def create_upload_job(self, job_id: str, filename: str, persist: bool = True):
+        """Register a queued upload scoring job"""
+        with self.connections.write() as conn:
+            conn.execute(
+                "INSERT INTO upload_jobs (id, status, filename, persist) VALUES (?, 'queued', ?, ?)",
+                (job_id, filename, int(persist))
+            )
+    
+    @timed_db('update_upload_job')
+    def update_upload_job(self, job_id: str, **fields):
+        """Update progress/status columns of an upload job"""
+        unknown = set(fields) - set(UPLOAD_JOB_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown upload job fields: {sorted(unknown)}")
+        
+        assignments = ', '.join(f'{name} = ?' for name in fields)
+        with self.connections.write() as conn:
+            conn.execute(
+                f'UPDATE upload_jobs SET {assignments} WHERE id = ?',
+                (*fields.values(), job_id)
+            )
+    
+    @timed_db('fail_stale_upload_jobs')
+    def fail_stale_upload_jobs(self, created_before: str, error: str, finished_at: str) -> int:
+        """Mark upload jobs still queued or running that were created before `created_before` as failed"""
+        with self.connections.write() as conn:
+            cursor = conn.execute(
+                "UPDATE upload_jobs SET status = 'failed', error = ?, finished_at = ? "
+                "WHERE status IN ('queued', 'running') AND created_at < ?",
+                (error, finished_at, created_before)
+            )
+            return cursor.rowcount
+    
+    @timed_db('get_upload_job')
+    def get_upload_job(self, job_id: str) -> Optional[Dict]:
+        """Get an upload job by ID"""
+        with self.connections.read() as conn:
+            row = conn.execute('SELECT * FROM upload_jobs WHERE id = ?', (job_id,)).fetchone()
         
         if not row:
             return None
         
-        return {
-            'id': row['id'],
-            'timestamp': row['timestamp'],
-            'prediction': row['prediction'],
-            'confidence_scores': {
-                'High': row['confidence_high'],
-                'Medium': row['confidence_medium'],
-                'Low': row['confidence_low']
-            },
-            'input_data': json.loads(row['input_data']),
-            'enterprise_size': row['enterprise_size'],
-            'enterprise_age': row['enterprise_age']
-        }
+        job = dict(row)
+        job['persist'] = bool(job['persist'])
+        return job
     
+    @timed_db('get_statistics')
     def get_statistics(self) -> Dict:
-        """Get overall prediction statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Total predictions
-        cursor.execute('SELECT COUNT(*) FROM predictions')
-        total = cursor.fetchone()[0]
-        
-        # Distribution by prediction
-        cursor.execute('''
-            SELECT prediction, COUNT(*) as count
-            FROM predictions
-            GROUP BY prediction
-        ''')
-        distribution = {row[0]: row[1] for row in cursor.fetchall()}
-        
-        # Average confidence by prediction type
-        cursor.execute('''
-            SELECT 
-                prediction,
-                AVG(CASE 
-                    WHEN prediction = 'High' THEN confidence_high
-                    WHEN prediction = 'Medium' THEN confidence_medium
-                    WHEN prediction = 'Low' THEN confidence_low
-                END) as avg_confidence
-            FROM predictions
-            GROUP BY prediction
-        ''')
-        avg_confidence = {row[0]: row[1] for row in cursor.fetchall()}
-        
-        # Distribution by enterprise size
-        cursor.execute('''
-            SELECT enterprise_size, COUNT(*) as count
-            FROM predictions
-            WHERE enterprise_size IS NOT NULL
-            GROUP BY enterprise_size
-        ''')
-        size_distribution = {row[0]: row[1] for row in cursor.fetchall()}
-        
-        # Recent predictions (last 7 days)
-        cursor.execute('''
-            SELECT COUNT(*) FROM predictions
-            WHERE timestamp >= datetime('now', '-7 days')
-        ''')
-        recent_count = cursor.fetchone()[0]
-        
-        conn.close()
+        """Get overall prediction statistics (read from the rollups, not the history)"""
+        with self.connections.read() as conn:
+            cursor = conn.cursor()
+            
+            # Distribution and average confidence by prediction
+            cursor.execute('''
+                SELECT prediction, SUM(count), SUM(confidence_sum)
+                FROM prediction_rollups
+                GROUP BY prediction
+            ''')
+            distribution = {}
+            avg_confidence = {}
+            for prediction, count, confidence_sum in cursor.fetchall():
+                distribution[prediction] = count
+                avg_confidence[prediction] = confidence_sum / count
+            
+            # Total predictions
+            total = sum(distribution.values())
+            
+            # Distribution by enterprise size
+            cursor.execute('''
+                SELECT enterprise_size, SUM(count)
+                FROM prediction_rollups
+                WHERE enterprise_size != ''
+                GROUP BY enterprise_size
+            ''')
+            size_distribution = {row[0]: row[1] for row in cursor.fetchall()}
+            
+            # Recent predictions (last 7 days): whole days from the rollups,
+            # plus the partial first day from the timestamp index
+            cursor.execute('''
+                SELECT
+                    (SELECT IFNULL(SUM(count), 0) FROM prediction_rollups
+                     WHERE day > date('now', '-7 days'))
+                  + (SELECT COUNT(*) FROM predictions
+                     WHERE timestamp >= datetime('now', '-7 days')
+                       AND timestamp < date('now', '-7 days', '+1 day'))
+            ''')
+            recent_count = cursor.fetchone()[0]
         
         # Calculate percentages
         percentages = {}
@@ -205,28 +710,32 @@ class PredictionDatabase:
             'recent_predictions_7days': recent_count
         }
     
+    @timed_db('delete_prediction')
     def delete_prediction(self, prediction_id: int) -> bool:
         """Delete a prediction by ID"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM predictions WHERE id = ?', (prediction_id,))
-        deleted = cursor.rowcount > 0
-        
-        conn.commit()
-        conn.close()
+        with self.connections.write() as conn:
+            cursor = conn.execute('DELETE FROM predictions WHERE id = ?', (prediction_id,))
+            deleted = cursor.rowcount > 0
         
         return deleted
     
+    @timed_db('clear_all_predictions')
     def clear_all_predictions(self):
         """Clear all predictions (use with caution!)"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM predictions')
-        
-        conn.commit()
-        conn.close()
+        with self.connections.write() as conn:
+            # Drop the rollup triggers so the DELETE can truncate the table
+            # instead of firing a trigger per row, then reset the rollups
+            conn.execute('BEGIN IMMEDIATE')
+            for name, _ in ROLLUP_TRIGGERS:
+                conn.execute(f'DROP TRIGGER IF EXISTS {name}')
+            conn.execute('DELETE FROM predictions')
+            conn.execute('DELETE FROM prediction_rollups')
+            for _, sql in ROLLUP_TRIGGERS:
+                conn.execute(sql)
+    
+    def close(self):
+        """Close all open connections"""
+        self.connections.close()
 
 
 # Global database instance
@@ -0,0 +1,26 @@
+"""
+Feature Selector
+Custom transformer used by the trained pipeline. Only needed to unpickle the
+original model file; the compiled model artifact does not use it.
+"""
+
+import sys
+from sklearn.base import BaseEstimator, TransformerMixin
+
+
+class FeatureSelector(BaseEstimator, TransformerMixin):
+    """Custom transformer for feature selection (required for unpickling)"""
+    def __init__(self, indices):
+        self.indices = indices
+    
+    def fit(self, X, y=None):
+        return self
+    
+    def transform(self, X):
+        return X[:, self.indices]
+
+
+# The pipeline was pickled from a training script, so it refers to
+# __main__.FeatureSelector
+if '__main__' in sys.modules:
+    sys.modules['__main__'].FeatureSelector = FeatureSelector
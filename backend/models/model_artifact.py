@@ -0,0 +1,210 @@
+"""
+Compiled Model Artifact
+Saves the CompiledModel arrays of the trained pipeline as a versioned NumPy
+.npz file with a JSON manifest (format version, feature lists, labels and a
+SHA-256 checksum of the arrays). Loading it needs only NumPy: no pickle, no
+sklearn, no pandas.
+"""
+
+import hashlib
+import io
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from models.compiled_model import CompiledModel
+
+ARTIFACT_FORMAT = 'sme-growth-compiled-forest'
+ARTIFACT_VERSION = 1
+ARTIFACT_SUFFIX = '.npz'
+
+# CompiledModel attributes stored as arrays (categories are stored one array
+# per categorical feature)
+ARRAY_FIELDS = [
+    'numeric_fill', 'numeric_keep', 'scaler_mean', 'scaler_scale', 'selected_indices',
+    'tree_roots', 'tree_feature', 'tree_threshold', 'tree_left', 'tree_right', 'tree_value',
+    'classes'
+]
+
+
+def manifest_path(artifact_path) -> Path:
+    """Manifest file that goes with an artifact (model.npz -> model.manifest.json)"""
+    return Path(artifact_path).with_suffix('.manifest.json')
+
+
+def file_sha256(path) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def save_artifact(compiled: CompiledModel, artifact_path, metadata: Dict) -> Dict:
+    """
+    Write the compiled model and its manifest
+    
+    Args:
+        compiled: CompiledModel extracted from the pipeline
+        artifact_path: Destination .npz file
+        metadata: Extra manifest entries (class labels, label map, source
+            file, performance, ...)
+    
+    Returns:
+        The manifest
+    """
+    artifact_path = Path(artifact_path)
+    arrays = {field: getattr(compiled, field) for field in ARRAY_FIELDS}
+    for i, feature_categories in enumerate(compiled.categories):
+        arrays[f'categories_{i}'] = feature_categories
+    
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    data = buffer.getvalue()
+    
+    manifest = {
+        'format': ARTIFACT_FORMAT,
+        'format_version': ARTIFACT_VERSION,
+        'created_at': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+        'artifact': {
+            'file': artifact_path.name,
+            'sha256': hashlib.sha256(data).hexdigest(),
+            'bytes': len(data)
+        },
+        'numeric_features': compiled.numeric_features,
+        'categorical_features': compiled.categorical_features,
+        'unknown_value': compiled.unknown_value,
+        'max_depth': compiled.max_depth,
+        'n_trees': len(compiled.tree_roots),
+        'n_nodes': len(compiled.tree_feature),
+        **metadata
+    }
+    
+    # Arrays first: a reader that sees the new manifest also sees the new arrays
+    artifact_path.parent.mkdir(parents=True, exist_ok=True)
+    _write_atomic(artifact_path, data)
+    _write_atomic(manifest_path(artifact_path), json.dumps(manifest, indent=2).encode())
+    return manifest
+
+
+def build_artifact(model, artifact_path) -> Dict:
+    """
+    Compile a loaded pickled model (SMEGrowthPredictor) into an artifact
+    
+    Raises ValueError if the pipeline has a structure CompiledModel does not
+    support.
+    """
+    import sklearn
+    
+    compiled = CompiledModel.from_pipeline(model.pipeline, model.numeric_features, model.categorical_features)
+    return save_artifact(compiled, artifact_path, {
+        'class_labels': [str(label) for label in model.label_encoder.classes_],
+        'label_map': {str(code): str(label) for code, label in model.label_map.items()},
+        'performance': _to_json(model.model_package.get('performance', {})),
+        'best_params': _to_json(model.model_package.get('best_params', {})),
+        'source': {
+            'file': Path(model.model_path).name,
+            'sha256': file_sha256(model.model_path),
+            'sklearn_version': sklearn.__version__,
+            'numpy_version': np.__version__
+        }
+    })
+
+
+def _to_json(value):
+    """Convert NumPy scalars inside model metadata to plain Python values"""
+    if isinstance(value, dict):
+        return {str(key): _to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def read_manifest(artifact_path) -> Dict:
+    """Read and check the manifest of an artifact, raising ValueError if unsupported"""
+    with open(manifest_path(artifact_path)) as f:
+        manifest = json.load(f)
+    
+    if manifest.get('format') != ARTIFACT_FORMAT:
+        raise ValueError(f"Not a compiled model manifest: {manifest_path(artifact_path)}")
+    if manifest.get('format_version') != ARTIFACT_VERSION:
+        raise ValueError(
+            f"Unsupported artifact format version {manifest.get('format_version')} "
+            f"(this runtime reads version {ARTIFACT_VERSION}); rebuild it with build_model_artifact.py"
+        )
+    return manifest
+
+
+def load_artifact(artifact_path) -> Tuple[CompiledModel, Dict]:
+    """
+    Load a compiled model artifact
+    
+    The file is checked against the manifest's checksum before any array is
+    read, and arrays are loaded with allow_pickle=False.
+    
+    Returns:
+        (CompiledModel, manifest)
+    """
+    manifest = read_manifest(artifact_path)
+    with open(artifact_path, 'rb') as f:
+        data = f.read()
+    if hashlib.sha256(data).hexdigest() != manifest['artifact']['sha256']:
+        raise ValueError(f"Checksum mismatch for {artifact_path}; the artifact is corrupt or out of date")
+    
+    with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+        compiled = CompiledModel(
+            numeric_features=manifest['numeric_features'],
+            categorical_features=manifest['categorical_features'],
+            categories=[arrays[f'categories_{i}'] for i in range(len(manifest['categorical_features']))],
+            unknown_value=float(manifest['unknown_value']),
+            max_depth=int(manifest['max_depth']),
+            **{field: arrays[field] for field in ARRAY_FIELDS}
+        )
+    return compiled, manifest
+
+
+def source_model_path(artifact_path) -> Optional[Path]:
+    """Pickled model an artifact was built from, per its manifest (None if unknown)"""
+    try:
+        return Path(artifact_path).with_name(read_manifest(artifact_path)['source']['file'])
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def artifact_is_current(artifact_path, model_path) -> bool:
+    """Whether the artifact's manifest records the pickle's current checksum"""
+    try:
+        source_sha256 = read_manifest(artifact_path)['source']['sha256']
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Warning: Ignoring compiled model artifact {artifact_path}: {e}")
+        return False
+    if source_sha256 != file_sha256(model_path):
+        print(f"Warning: Compiled model artifact {artifact_path} is out of date, using {model_path}")
+        return False
+    return True
+
+
+def find_artifact(model_path) -> Optional[Path]:
+    """
+    Return the artifact built from a pickled model, if there is a current one
+    
+    The artifact sits next to the pickle with the .npz suffix. It is only
+    used if its manifest records the pickle's current checksum (or the
+    pickle itself is absent, e.g. an artifact-only deployment).
+    """
+    model_path = Path(model_path)
+    artifact_path = model_path.with_suffix(ARTIFACT_SUFFIX)
+    if not artifact_path.exists() or not manifest_path(artifact_path).exists():
+        return None
+    if not model_path.exists():
+        return artifact_path
+    return artifact_path if artifact_is_current(artifact_path, model_path) else None
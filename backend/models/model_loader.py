@@ -4,56 +4,95 @@ Loads the trained SME growth prediction model and provides prediction functional
 """
 
 import pickle
-import pandas as pd
 import numpy as np
 from pathlib import Path
-from sklearn.base import BaseEstimator, TransformerMixin
-import sys
+from typing import TYPE_CHECKING, List
+from models.compiled_model import CompiledModel
+from models.model_artifact import (
+    ARTIFACT_SUFFIX,
+    artifact_is_current,
+    find_artifact,
+    load_artifact,
+    source_model_path,
+)
+from models.prediction_cache import PredictionCache
+from models.threshold_quantizer import ThresholdQuantizer
+from utils.metrics import MODEL_LOAD_SECONDS, observe_stage
+import os
+import threading
+import time
 
-
-class FeatureSelector(BaseEstimator, TransformerMixin):
-    """Custom transformer for feature selection (required for unpickling)"""
-    def __init__(self, indices):
-        self.indices = indices
-    
-    def fit(self, X, y=None):
-        return self
-    
-    def transform(self, X):
-        return X[:, self.indices]
-
-
-# Make FeatureSelector available in __main__ for pickle compatibility
-if '__main__' in sys.modules:
-    sys.modules['__main__'].FeatureSelector = FeatureSelector
+# pandas is only needed for the pickled pipeline and imported when used
+if TYPE_CHECKING:
+    import pandas as pd
 
 
-class SMEGrowthPredictor:
-    """Wrapper class for SME Growth Prediction Model"""
+class LoadedModel:
+    """
+    Everything loaded from one version of the model file
+    
+    Built completely before SMEGrowthPredictor publishes it, then never
+    modified: a reload builds a new LoadedModel and swaps the reference, so a
+    prediction that started on the old version finishes on it consistently.
+    """
     
-    def __init__(self, model_path: str):
-        self.model_path = model_path
+    def __init__(self, path: str, generation: int):
+        self.path = path
+        self.generation = generation
         self.model_package = None
         self.pipeline = None
         self.label_encoder = None
         self.label_map = None
         self.numeric_features = None
         self.categorical_features = None
-        self.load_model()
+        self.classes = None
+        self.class_labels = None
+        self.performance = {}
+        self.best_params = {}
+        self.manifest = None
+        self.compiled = None
+        self.quantizer = None
     
-    def load_model(self):
-        """Load the pickled model and extract components"""
+    @property
+    def is_artifact(self) -> bool:
+        return Path(self.path).suffix == ARTIFACT_SUFFIX
+    
+    def load_artifact(self):
+        """Load a compiled model artifact (NumPy only)"""
         try:
-            # Create a custom unpickler that looks for FeatureSelector in this module
-            import io
+            self.compiled, self.manifest = load_artifact(self.path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Model file not found at {self.path}")
+        except Exception as e:
+            raise Exception(f"Error loading model artifact: {str(e)}")
+        
+        self.numeric_features = self.compiled.numeric_features
+        self.categorical_features = self.compiled.categorical_features
+        self.classes = self.compiled.classes
+        self.class_labels = np.asarray(self.manifest['class_labels'])
+        # JSON object keys are strings; the pickled label map is keyed by code
+        self.label_map = {int(code): label for code, label in self.manifest['label_map'].items()}
+        self.performance = self.manifest.get('performance', {})
+        self.best_params = self.manifest.get('best_params', {})
+        
+        print(f"✓ Compiled model artifact loaded from {self.path} "
+              f"(format v{self.manifest['format_version']}, {self.manifest['n_trees']} trees)")
+        print(f"✓ Numeric features: {len(self.numeric_features)}")
+        print(f"✓ Categorical features: {len(self.categorical_features)}")
+    
+    def load_pickle(self, compiled: bool):
+        """Load the pickled sklearn pipeline, compiling it when `compiled` is set"""
+        try:
+            from models.feature_selector import FeatureSelector
             
+            # Create a custom unpickler that resolves FeatureSelector wherever it was pickled from
             class CustomUnpickler(pickle.Unpickler):
                 def find_class(self, module, name):
                     if name == 'FeatureSelector':
                         return FeatureSelector
                     return super().find_class(module, name)
             
-            with open(self.model_path, 'rb') as f:
+            with open(self.path, 'rb') as f:
                 self.model_package = CustomUnpickler(f).load()
             
             self.pipeline = self.model_package['pipeline']
@@ -66,40 +105,65 @@ class SMEGrowthPredictor:
             
             self.label_encoder = self.model_package['label_encoder']
             self.label_map = self.model_package['label_map']
+            self.classes = np.asarray(self.pipeline.classes_)
+            self.class_labels = np.asarray(self.label_encoder.classes_)
+            self.performance = self.model_package.get('performance', {})
+            self.best_params = self.model_package.get('best_params', {})
             
             preprocessing_info = self.model_package['preprocessing_info']
             self.numeric_features = preprocessing_info['numeric_features']
             self.categorical_features = preprocessing_info['categorical_features']
             
-            print(f"✓ Model loaded successfully from {self.model_path}")
+            print(f"✓ Model loaded successfully from {self.path}")
             print(f"✓ Numeric features: {len(self.numeric_features)}")
             print(f"✓ Categorical features: {len(self.categorical_features)}")
             
+            if compiled:
+                try:
+                    self.compiled = CompiledModel.from_pipeline(
+                        self.pipeline, self.numeric_features, self.categorical_features
+                    )
+                    print(f"✓ Compiled mode enabled ({len(self.compiled.tree_roots)} trees)")
+                except Exception as e:
+                    self.compiled = None
+                    print(f"Warning: Compiled mode unavailable, using sklearn pipeline: {e}")
+        
         except FileNotFoundError:
-            raise FileNotFoundError(f"Model file not found at {self.model_path}")
+            raise FileNotFoundError(f"Model file not found at {self.path}")
         except Exception as e:
             raise Exception(f"Error loading model: {str(e)}")
     
-    def get_required_features(self):
-        """Return list of all required input features"""
-        return {
-            'numeric': self.numeric_features,
-            'categorical': self.categorical_features,
-            'all': self.numeric_features + self.categorical_features
-        }
+    def build_quantizer(self):
+        """Set up interval cache keys (see threshold_quantizer)"""
+        try:
+            compiled = self.compiled or CompiledModel.from_pipeline(
+                self.pipeline, self.numeric_features, self.categorical_features
+            )
+            self.quantizer = ThresholdQuantizer(compiled)
+        except Exception as e:
+            print(f"Warning: Interval cache keys unavailable, using exact keys: {e}")
     
-    def validate_input(self, data: dict) -> tuple:
-        """Validate input data has all required features"""
-        all_features = self.numeric_features + self.categorical_features
-        missing_features = [f for f in all_features if f not in data]
-        
-        if missing_features:
-            return False, f"Missing required features: {missing_features}"
+    def cache_keys(self, records: List[dict]) -> List[tuple]:
+        """
+        Prediction cache keys for validated records
         
-        return True, "Valid"
+        Keys start with the model generation, so a result computed by this
+        version can never be served once a reloaded version is published,
+        even if it is stored after the reload cleared the cache.
+        """
+        if self.quantizer is not None:
+            if len(records) == 1:
+                return [(self.generation, self.quantizer.key(records[0]))]
+            return [(self.generation, key) for key in self.quantizer.keys(records)]
+        return [
+            (self.generation, PredictionCache.make_key(data, self.numeric_features, self.categorical_features))
+            for data in records
+        ]
     
-    def preprocess_input(self, data: dict) -> pd.DataFrame:
+    def preprocess_input(self, data: dict) -> 'pd.DataFrame':
         """Convert input dict to DataFrame with correct feature order"""
+        import pandas as pd
+        
         # Create DataFrame with all features in correct order
         all_features = self.numeric_features + self.categorical_features
         df_data = {feat: [data[feat]] for feat in all_features}
@@ -115,6 +179,228 @@ class SMEGrowthPredictor:
         
         return df
     
+    def preprocess_batch(self, records: List[dict]) -> 'pd.DataFrame':
+        """Convert a list of input dicts to one DataFrame with correct feature order"""
+        import pandas as pd
+        
+        all_features = self.numeric_features + self.categorical_features
+        df = pd.DataFrame.from_records(records, columns=all_features)
+        
+        # Convert numeric features to float
+        for feat in self.numeric_features:
+            df[feat] = pd.to_numeric(df[feat], errors='coerce')
+        
+        # Convert categorical features to string
+        for feat in self.categorical_features:
+            df[feat] = df[feat].astype(str)
+        
+        return df
+    
+    def prepare(self, records: List[dict]):
+        """Model input for validated records: a float32 matrix in compiled mode, else a DataFrame"""
+        if self.compiled is not None:
+            return self.compiled.transform(records)
+        if len(records) == 1:
+            return self.preprocess_input(records[0])
+        return self.preprocess_batch(records)
+    
+    def predict_proba(self, prepared) -> np.ndarray:
+        """Class probabilities for the output of prepare()"""
+        if self.compiled is not None:
+            return self.compiled.predict_proba(prepared)
+        return self.pipeline.predict_proba(prepared)
+    
+    def results_from_probabilities(self, probabilities: np.ndarray) -> List[dict]:
+        """
+        Build prediction dictionaries from a predict_proba matrix
+        
+        The label is derived exactly as `Pipeline.predict` does it (argmax over
+        the classifier's classes), so the forest never has to run twice, and
+        decoded like `LabelEncoder.inverse_transform` (index into its classes).
+        """
+        predictions_encoded = self.classes.take(probabilities.argmax(axis=1))
+        prediction_labels = self.class_labels[predictions_encoded]
+        
+        return [
+            {
+                'prediction': prediction_label,
+                'confidence_scores': {
+                    label: float(row[i])
+                    for i, label in enumerate(self.class_labels)
+                },
+                'prediction_encoded': int(prediction_encoded)
+            }
+            for row, prediction_encoded, prediction_label in zip(
+                probabilities, predictions_encoded, prediction_labels
+            )
+        ]
+
+
+def _loaded_attribute(name: str) -> property:
+    """Read-only predictor attribute served from the current LoadedModel"""
+    return property(lambda self: getattr(self._model, name))
+
+
+class SMEGrowthPredictor:
+    """
+    Wrapper class for SME Growth Prediction Model
+    
+    `model_path` is either the pickled sklearn pipeline or a compiled .npz
+    artifact built from it by build_model_artifact.py. The artifact is scored
+    with CompiledModel and never imports sklearn or pandas.
+    
+    The loaded model lives in one LoadedModel that is replaced as a whole when
+    the model file changes; attributes such as `pipeline` or `compiled` read
+    the current one. An artifact is watched together with the pickle it was
+    built from: when that pickle is replaced and the artifact not rebuilt,
+    the pickle is served until a matching artifact appears.
+    """
+    
+    model_path = _loaded_attribute('path')
+    model_package = _loaded_attribute('model_package')
+    pipeline = _loaded_attribute('pipeline')
+    label_encoder = _loaded_attribute('label_encoder')
+    label_map = _loaded_attribute('label_map')
+    numeric_features = _loaded_attribute('numeric_features')
+    categorical_features = _loaded_attribute('categorical_features')
+    classes = _loaded_attribute('classes')
+    class_labels = _loaded_attribute('class_labels')
+    performance = _loaded_attribute('performance')
+    best_params = _loaded_attribute('best_params')
+    manifest = _loaded_attribute('manifest')
+    compiled = _loaded_attribute('compiled')
+    quantizer = _loaded_attribute('quantizer')
+    is_artifact = _loaded_attribute('is_artifact')
+    
+    def __init__(self, model_path: str, compiled: bool = None):
+        self._model = None
+        self.requested_path = model_path
+        self.source_path = source_model_path(model_path) if Path(model_path).suffix == ARTIFACT_SUFFIX else None
+        
+        # Compiled mode scores requests with NumPy arrays extracted from the
+        # fitted pipeline instead of going through pandas and sklearn
+        if compiled is None:
+            compiled = os.getenv('MODEL_COMPILED', 'false').lower() in ('1', 'true', 'yes')
+        self.use_compiled = compiled
+        
+        # Result cache, dropped whenever the model file on disk changes
+        self.cache = PredictionCache(
+            max_size=int(os.getenv('PREDICTION_CACHE_SIZE', 10000)),
+            ttl_seconds=float(os.getenv('PREDICTION_CACHE_TTL', 3600))
+        )
+        # Cache key: 'interval' shares one entry between inputs that fall into
+        # the same split threshold intervals (identical predictions by
+        # construction), 'exact' keys on the canonicalized input values
+        self.cache_key_mode = os.getenv('PREDICTION_CACHE_KEY', 'interval').lower()
+        if self.cache_key_mode not in ('interval', 'exact'):
+            raise ValueError(f"Unknown PREDICTION_CACHE_KEY: {self.cache_key_mode}")
+        self.model_check_interval = float(os.getenv('MODEL_CHECK_INTERVAL', 5))
+        self._model_signature = None
+        self._next_model_check = 0.0
+        self._reload_lock = threading.Lock()
+        
+        self.load_model()
+    
+    def load_model(self):
+        """Load the model file and publish it, replacing the current version in one step"""
+        start = time.perf_counter()
+        signature = self._read_model_signature()
+        model = LoadedModel(
+            self._resolve_model_path(),
+            generation=self._model.generation + 1 if self._model is not None else 1
+        )
+        if model.is_artifact:
+            model.load_artifact()
+        else:
+            model.load_pickle(self.use_compiled)
+        if self.cache_key_mode == 'interval':
+            model.build_quantizer()
+        
+        self._model_signature = signature
+        self._model = model
+        MODEL_LOAD_SECONDS.labels('artifact' if model.is_artifact else 'pickle').set(time.perf_counter() - start)
+    
+    def _resolve_model_path(self) -> str:
+        """The requested model file, or the source pickle if it no longer matches the artifact"""
+        source = self.source_path
+        if source is not None and source.exists() and not artifact_is_current(self.requested_path, source):
+            # artifact_is_current logs that the artifact is out of date
+            return str(source)
+        return str(self.requested_path)
+    
+    def _read_model_signature(self) -> tuple:
+        """
+        Identify the model file version by modification time and size
+        
+        For an artifact, the source pickle's signature is included (None while
+        it is absent), so replacing the pickle is noticed too.
+        """
+        stat = os.stat(self.requested_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if self.source_path is not None:
+            try:
+                source_stat = os.stat(self.source_path)
+                signature += (source_stat.st_mtime_ns, source_stat.st_size)
+            except OSError:
+                signature += (None,)
+        return signature
+    
+    def _refresh_if_model_changed(self):
+        """Reload the model and drop cached results if the model file changed"""
+        now = time.monotonic()
+        if now < self._next_model_check:
+            return
+        self._next_model_check = now + self.model_check_interval
+        
+        try:
+            signature = self._read_model_signature()
+        except OSError:
+            return
+        if signature == self._model_signature:
+            return
+        
+        with self._reload_lock:
+            if signature != self._model_signature:
+                print(f"✓ Model file changed, reloading {self.requested_path}"
+                      + (f" (source {self.source_path})" if self.source_path is not None else ""))
+                self.load_model()
+                # Old-generation entries can no longer be hit; free their memory
+                self.cache.clear()
+    
+    def get_required_features(self):
+        """Return list of all required input features"""
+        model = self._model
+        return {
+            'numeric': model.numeric_features,
+            'categorical': model.categorical_features,
+            'all': model.numeric_features + model.categorical_features
+        }
+    
+    def validate_input(self, data: dict) -> tuple:
+        """Validate input data has all required features"""
+        model = self._model
+        all_features = model.numeric_features + model.categorical_features
+        missing_features = [f for f in all_features if f not in data]
+        
+        if missing_features:
+            return False, f"Missing required features: {missing_features}"
+        
+        return True, "Valid"
+    
+    def preprocess_input(self, data: dict) -> 'pd.DataFrame':
+        """Convert input dict to DataFrame with correct feature order"""
+        return self._model.preprocess_input(data)
+    
+    def preprocess_batch(self, records: List[dict]) -> 'pd.DataFrame':
+        """Convert a list of input dicts to one DataFrame with correct feature order"""
+        return self._model.preprocess_batch(records)
+    
+    def _cache_keys(self, model: LoadedModel, records: List[dict]) -> List[tuple]:
+        """Prediction cache keys for validated records (None while the cache is disabled)"""
+        if not self.cache.enabled:
+            return [None] * len(records)
+        return model.cache_keys(records)
+    
     def predict(self, data: dict) -> dict:
         """
         Make prediction on input data
@@ -130,34 +416,154 @@ class SMEGrowthPredictor:
         if not is_valid:
             raise ValueError(message)
         
-        # Preprocess input
-        df = self.preprocess_input(data)
+        # Serve repeated profiles from the cache
+        self._refresh_if_model_changed()
+        model = self._model
+        start = time.perf_counter()
+        cache_key = self._cache_keys(model, [data])[0]
+        cached = self.cache.get(cache_key)
+        observe_stage('cache_lookup', 'single', time.perf_counter() - start)
+        if cached is not None:
+            return cached
         
-        # Make prediction
-        prediction_encoded = self.pipeline.predict(df)[0]
-        prediction_label = self.label_encoder.inverse_transform([prediction_encoded])[0]
+        result = self._predict_uncached(data, model)
+        self.cache.put(cache_key, result)
         
-        # Get confidence scores
-        probabilities = self.pipeline.predict_proba(df)[0]
-        confidence_scores = {
-            label: float(probabilities[i])
-            for i, label in enumerate(self.label_encoder.classes_)
-        }
+        return result
+    
+    def _predict_uncached(self, data: dict, model: LoadedModel = None) -> dict:
+        """Score a single validated record without touching the cache"""
+        model = model or self._model
         
-        return {
-            'prediction': prediction_label,
-            'confidence_scores': confidence_scores,
-            'prediction_encoded': int(prediction_encoded)
-        }
+        # Run the pipeline once; the label is the argmax of the probabilities
+        start = time.perf_counter()
+        prepared = model.prepare([data])
+        preprocessed = time.perf_counter()
+        probabilities = model.predict_proba(prepared)
+        scored = time.perf_counter()
+        result = model.results_from_probabilities(probabilities)[0]
+        
+        observe_stage('preprocess', 'single', preprocessed - start)
+        observe_stage('model', 'single', scored - preprocessed)
+        observe_stage('postprocess', 'single', time.perf_counter() - scored)
+        return result
+    
+    def _results_from_probabilities(self, probabilities: np.ndarray) -> List[dict]:
+        """Build prediction dictionaries from a predict_proba matrix (see LoadedModel)"""
+        return self._model.results_from_probabilities(probabilities)
+    
+    def predict_batch(self, records: List[dict], chunk_size: int = 5000, use_cache: bool = False) -> List[dict]:
+        """
+        Make predictions for many records with vectorized inference
+        
+        Records are scored in chunks of `chunk_size` rows, each chunk going
+        through a single `predict_proba` call over one DataFrame.
+        
+        Args:
+            records: List of dictionaries with all required features
+            chunk_size: Maximum number of rows per inference call
+            use_cache: Serve records from the prediction cache and store new
+                results in it (used for coalesced single requests; bulk
+                re-scoring leaves it off so it doesn't flush the cache)
+        
+        Returns:
+            List of prediction dictionaries, in the same order as `records`
+        """
+        for i, data in enumerate(records):
+            is_valid, message = self.validate_input(data)
+            if not is_valid:
+                raise ValueError(f"Record {i}: {message}")
+        
+        self._refresh_if_model_changed()
+        model = self._model
+        if not use_cache:
+            return self._predict_batch_uncached(records, chunk_size, model)
+        
+        start = time.perf_counter()
+        keys = self._cache_keys(model, records)
+        results = [self.cache.get(key) for key in keys]
+        observe_stage('cache_lookup', 'batch', time.perf_counter() - start)
+        
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            scored = self._predict_batch_uncached([records[i] for i in missing], chunk_size, model)
+            for i, result in zip(missing, scored):
+                self.cache.put(keys[i], result)
+                results[i] = result
+        
+        return results
+    
+    def _predict_batch_uncached(self, records: List[dict], chunk_size: int, model: LoadedModel = None) -> List[dict]:
+        """Score validated records in chunks without touching the cache"""
+        model = model or self._model
+        results = []
+        for start in range(0, len(records), chunk_size):
+            chunk = records[start:start + chunk_size]
+            chunk_start = time.perf_counter()
+            prepared = model.prepare(chunk)
+            preprocessed = time.perf_counter()
+            probabilities = model.predict_proba(prepared)
+            scored = time.perf_counter()
+            results.extend(model.results_from_probabilities(probabilities))
+            
+            observe_stage('preprocess', 'batch', preprocessed - chunk_start)
+            observe_stage('model', 'batch', scored - preprocessed)
+            observe_stage('postprocess', 'batch', time.perf_counter() - scored)
+        
+        return results
+    
+    def predict_proba_records(self, records: List[dict]) -> np.ndarray:
+        """
+        Class probabilities for validated records in one predict_proba call
+        
+        Columns follow `class_labels`. Used for what-if sweeps, where every
+        row is a variation of the same profile and labels are derived by the
+        caller, so the rows are neither chunked nor cached.
+        """
+        self._refresh_if_model_changed()
+        model = self._model
+        start = time.perf_counter()
+        prepared = model.prepare(records)
+        preprocessed = time.perf_counter()
+        probabilities = model.predict_proba(prepared)
+        
+        observe_stage('preprocess', 'sweep', preprocessed - start)
+        observe_stage('model', 'sweep', time.perf_counter() - preprocessed)
+        return probabilities
+    
+    def warm_up(self, records: List[dict]) -> float:
+        """
+        Run throwaway predictions so the first real request is not slow
+        
+        Exercises the single-row and batch paths (lazy sklearn/joblib
+        initialization, thread pools, memory allocation) without adding
+        entries to the prediction cache.
+        
+        Returns:
+            Elapsed time in seconds
+        """
+        start = time.perf_counter()
+        for data in records:
+            self._predict_uncached(data)
+        self.predict_batch(records)
+        return time.perf_counter() - start
     
     def get_model_info(self) -> dict:
         """Return model metadata and performance metrics"""
+        model = self._model
         return {
-            'label_mapping': self.label_map,
-            'numeric_features': self.numeric_features,
-            'categorical_features': self.categorical_features,
-            'performance': self.model_package.get('performance', {}),
-            'best_params': self.model_package.get('best_params', {})
+            'label_mapping': model.label_map,
+            'numeric_features': model.numeric_features,
+            'categorical_features': model.categorical_features,
+            'performance': model.performance,
+            'best_params': model.best_params
+        }
+    
+    def get_cache_stats(self) -> dict:
+        """Return prediction cache counters"""
+        return {
+            **self.cache.stats(),
+            'key': 'interval' if self.quantizer is not None else 'exact'
         }
 
 
@@ -165,45 +571,63 @@ class SMEGrowthPredictor:
 _model_instance = None
 
 
+def find_model_path(prefer_artifact: bool = None) -> Path:
+    """
+    Locate the model file
+    
+    The first existing pickle among the known locations is used, unless a
+    current compiled artifact was built next to it (see find_artifact), which
+    is preferred. MODEL_PATH may also point at an artifact directly.
+    
+    Args:
+        prefer_artifact: Use compiled artifacts when present (default: the
+            MODEL_ARTIFACT environment variable, on unless set to false)
+    """
+    if prefer_artifact is None:
+        prefer_artifact = os.getenv('MODEL_ARTIFACT', 'true').lower() not in ('0', 'false', 'no')
+    
+    # Try multiple possible paths
+    possible_paths = [
+        # Environment variable (highest priority)
+        os.getenv('MODEL_PATH'),
+        # Inside backend folder (for Render deployment)
+        str(Path(__file__).parent.parent / "ml_model" / "sme_digitalization_model_final.pkl"),
+        # Relative to this file (for local development)
+        str(Path(__file__).parent.parent.parent / "ml_model" / "sme_digitalization_model_final.pkl"),
+        # Current working directory
+        str(Path.cwd() / "ml_model" / "sme_digitalization_model_final.pkl"),
+        # Absolute paths for Render
+        "/opt/render/project/src/ml_model/sme_digitalization_model_final.pkl",
+        "/app/ml_model/sme_digitalization_model_final.pkl",
+    ]
+    
+    for path in possible_paths:
+        if not path:
+            continue
+        path = Path(path)
+        artifact_path = find_artifact(path) if prefer_artifact and path.suffix != ARTIFACT_SUFFIX else None
+        if artifact_path is not None:
+            print(f"✓ Found compiled model artifact at: {artifact_path}")
+            return artifact_path
+        if path.exists():
+            print(f"✓ Found model at: {path}")
+            return path
+    
+    # Print debug info
+    cwd = Path.cwd()
+    print(f"Current working directory: {cwd}")
+    print(f"Files in cwd: {list(cwd.iterdir())[:10]}")
+    if (cwd / "ml_model").exists():
+        print(f"Files in ml_model: {list((cwd / 'ml_model').iterdir())}")
+    raise FileNotFoundError(
+        f"Model file not found. Tried paths:\n" + 
+        "\n".join(f"  - {p}" for p in possible_paths if p)
+    )
+
+
 def get_model() -> SMEGrowthPredictor:
     """Get or create the global model instance"""
     global _model_instance
     if _model_instance is None:
-        import os
-        
-        # Try multiple possible paths
-        possible_paths = [
-            # Environment variable (highest priority)
-            os.getenv('MODEL_PATH'),
-            # Inside backend folder (for Render deployment)
-            str(Path(__file__).parent.parent / "ml_model" / "sme_digitalization_model_final.pkl"),
-            # Relative to this file (for local development)
-            str(Path(__file__).parent.parent.parent / "ml_model" / "sme_digitalization_model_final.pkl"),
-            # Current working directory
-            str(Path.cwd() / "ml_model" / "sme_digitalization_model_final.pkl"),
-            # Absolute paths for Render
-            "/opt/render/project/src/ml_model/sme_digitalization_model_final.pkl",
-            "/app/ml_model/sme_digitalization_model_final.pkl",
-        ]
-        
-        model_path = None
-        for path in possible_paths:
-            if path and Path(path).exists():
-                model_path = Path(path)
-                print(f"✓ Found model at: {model_path}")
-                break
-        
-        if model_path is None:
-            # Print debug info
-            cwd = Path.cwd()
-            print(f"Current working directory: {cwd}")
-            print(f"Files in cwd: {list(cwd.iterdir())[:10]}")
-            if (cwd / "ml_model").exists():
-                print(f"Files in ml_model: {list((cwd / 'ml_model').iterdir())}")
-            raise FileNotFoundError(
-                f"Model file not found. Tried paths:\n" + 
-                "\n".join(f"  - {p}" for p in possible_paths if p)
-            )
-        
-        _model_instance = SMEGrowthPredictor(str(model_path))
+        _model_instance = SMEGrowthPredictor(str(find_model_path()))
     return _model_instance
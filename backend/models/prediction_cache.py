@@ -0,0 +1,113 @@
+"""
+Prediction Cache
+Bounded LRU cache with TTL for prediction results, keyed on canonicalized input
+features or their split threshold intervals (see threshold_quantizer)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional
+
+
+class PredictionCache:
+    """Thread-safe LRU + TTL cache for prediction results"""
+    
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 3600):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+    
+    @staticmethod
+    def make_key(data: dict, numeric_features: List[str], categorical_features: List[str]) -> tuple:
+        """
+        Build a canonical key from input features
+        
+        Numeric values are normalized to float (so 3, 3.0 and "3" share an
+        entry) and categorical values to str, mirroring preprocess_input.
+        """
+        numeric = []
+        for feat in numeric_features:
+            try:
+                numeric.append(float(data[feat]))
+            except (TypeError, ValueError):
+                numeric.append(None)
+        categorical = tuple(str(data[feat]) for feat in categorical_features)
+        return tuple(numeric) + categorical
+    
+    def get(self, key: Hashable) -> Optional[dict]:
+        """Return a copy of the cached result, or None on miss/expiry"""
+        if not self.enabled:
+            return None
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            expires_at, result = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+        
+        return _copy_result(result)
+    
+    def put(self, key: Hashable, result: dict):
+        """Store a result, evicting the least recently used entries if full"""
+        if not self.enabled:
+            return
+        
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, _copy_result(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        """Drop all entries (e.g. after the model changed)"""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+    
+    def stats(self) -> Dict:
+        """Return cache size and hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
+
+
+def _copy_result(result: dict) -> dict:
+    """Copy a prediction result so callers can't mutate cached entries"""
+    copied = dict(result)
+    copied['confidence_scores'] = dict(result['confidence_scores'])
+    return copied
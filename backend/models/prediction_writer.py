@@ -0,0 +1,173 @@
+"""
+Background prediction writer
+Persists prediction history from a single thread fed by a bounded queue,
+committing many rows per transaction (group commit)
+"""
+
+import os
+import queue
+import threading
+import time
+from typing import Dict
+
+from models.database import PredictionDatabase, get_database
+
+_STOP = object()
+
+
+class PredictionWriter:
+    """Single background thread that saves queued predictions in batches"""
+    
+    def __init__(
+        self,
+        db: PredictionDatabase,
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 0.25
+    ):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+        
+        # Metrics
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.flushes = 0
+        self.total_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self.last_flush_seconds = 0.0
+    
+    def start(self):
+        """Start the writer thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='prediction-writer', daemon=True)
+            self._thread.start()
+    
+    def submit(self, prediction: str, confidence_scores: Dict[str, float], input_data: Dict) -> bool:
+        """
+        Queue a prediction for saving without blocking
+        
+        Returns:
+            False if the queue is full and the prediction was dropped
+        """
+        try:
+            self._queue.put_nowait((prediction, confidence_scores, input_data))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        
+        with self._lock:
+            self.enqueued += 1
+        return True
+    
+    def _run(self):
+        """Collect rows until the batch is full or the flush interval passes"""
+        batch = []
+        deadline = None
+        stopping = False
+        
+        while not stopping:
+            timeout = self.flush_interval if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            
+            # Drain whatever else is already waiting, up to one batch
+            while item is not None:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+            
+            if batch and (stopping or len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._flush(batch)
+                batch = []
+                deadline = None
+    
+    def _flush(self, batch):
+        """Write one batch in a single transaction"""
+        start = time.perf_counter()
+        try:
+            self.db.save_predictions_bulk(batch)
+            written, failed = len(batch), 0
+        except Exception as e:
+            written, failed = 0, len(batch)
+            print(f"Warning: Failed to save {len(batch)} predictions: {e}")
+        elapsed = time.perf_counter() - start
+        
+        with self._lock:
+            self.written += written
+            self.failed += failed
+            self.flushes += 1
+            self.total_flush_seconds += elapsed
+            self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+            self.last_flush_seconds = elapsed
+    
+    def stop(self, timeout: float = 10.0):
+        """Flush everything queued so far and stop the thread"""
+        if self._thread is None:
+            return
+        # Blocking put: the stop marker must get in even if the queue is full
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+    
+    def stats(self) -> Dict:
+        """Return queue depth, dropped rows and flush latency"""
+        with self._lock:
+            return {
+                'running': self._thread is not None,
+                'queue_depth': self._queue.qsize(),
+                'max_queue': self._queue.maxsize,
+                'batch_size': self.batch_size,
+                'flush_interval_seconds': self.flush_interval,
+                'enqueued': self.enqueued,
+                'dropped': self.dropped,
+                'written': self.written,
+                'failed': self.failed,
+                'flushes': self.flushes,
+                'avg_flush_ms': (self.total_flush_seconds / self.flushes * 1000) if self.flushes else 0.0,
+                'max_flush_ms': self.max_flush_seconds * 1000,
+                'last_flush_ms': self.last_flush_seconds * 1000
+            }
+
+
+# Global writer instance
+_writer_instance = None
+
+
+def get_prediction_writer() -> PredictionWriter:
+    """Get or create (and start) the global prediction writer"""
+    global _writer_instance
+    if _writer_instance is None:
+        _writer_instance = PredictionWriter(
+            get_database(),
+            max_queue=int(os.getenv('WRITE_QUEUE_SIZE', 10000)),
+            batch_size=int(os.getenv('WRITE_BATCH_SIZE', 500)),
+            flush_interval=float(os.getenv('WRITE_FLUSH_INTERVAL', 0.25))
+        )
+        _writer_instance.start()
+    return _writer_instance
+
+
+def shutdown_prediction_writer():
+    """Flush pending predictions and stop the global writer"""
+    global _writer_instance
+    if _writer_instance is not None:
+        _writer_instance.stop()
+        _writer_instance = None
@@ -0,0 +1,98 @@
+"""
+Threshold Quantizer
+Maps inputs to the threshold interval they fall into for every feature the
+forest splits on. Every split compares one feature of the transformed row
+against a fixed threshold, so two rows with the same interval index on every
+feature take the same path through every tree and get identical
+probabilities. The interval indices make a prediction cache key under which
+all equivalent inputs share one entry (e.g. Enterprise_Age 15 and 16 when no
+split falls between them).
+"""
+
+import bisect
+import numpy as np
+from typing import List
+from models.compiled_model import CompiledModel, _to_float
+
+
+class ThresholdQuantizer:
+    """Interval-index cache keys derived from the split thresholds of a CompiledModel"""
+    
+    def __init__(self, compiled: CompiledModel):
+        self.compiled = compiled
+        
+        # Leaves point at themselves; every other node is a split
+        is_split = compiled.tree_left != np.arange(len(compiled.tree_left))
+        split_features = compiled.tree_feature[is_split]
+        split_thresholds = compiled.tree_threshold[is_split]
+        
+        # Columns of the transformed matrix the forest never splits on cannot
+        # change a prediction and are left out of the key
+        self.columns = np.unique(split_features)
+        self.thresholds = [np.unique(split_thresholds[split_features == column]) for column in self.columns]
+        
+        # Per split column, how to compute its value from one input record
+        # without building arrays: (feature, fill, mean, scale) for scaled
+        # numeric columns, (feature, category codes, unknown code) for
+        # ordinal-encoded ones, plus its thresholds as a list for bisect
+        n_numeric = len(compiled.numeric_keep)
+        self._sources = []
+        for column, thresholds in zip(self.columns, self.thresholds):
+            index = int(compiled.selected_indices[column])
+            if index < n_numeric:
+                feature = int(compiled.numeric_keep[index])
+                source = ('numeric', compiled.numeric_features[feature], float(compiled.numeric_fill[feature]),
+                          float(compiled.scaler_mean[index]), float(compiled.scaler_scale[index]))
+            else:
+                index -= n_numeric
+                source = ('categorical', compiled.categorical_features[index],
+                          compiled._category_codes[index], compiled.unknown_value)
+            self._sources.append((source, thresholds.tolist()))
+    
+    def intervals(self, X: np.ndarray) -> np.ndarray:
+        """
+        Interval index of every split column of X
+        
+        A row goes left at a node when x <= threshold, so its decisions on a
+        column are fixed by how many of that column's thresholds lie strictly
+        below x: searchsorted(side='left'). NaN sorts after every threshold,
+        matching `NaN <= t` being false.
+        """
+        return np.column_stack([
+            np.searchsorted(thresholds, X[:, column], side='left')
+            for column, thresholds in zip(self.columns, self.thresholds)
+        ])
+    
+    def keys(self, records: List[dict]) -> List[tuple]:
+        """Cache keys for input records (transformed exactly as for scoring)"""
+        return list(map(tuple, self.intervals(self.compiled.transform(records)).tolist()))
+    
+    def key(self, data: dict) -> tuple:
+        """
+        Cache key for one record, equal to keys([data])[0]
+        
+        Computes only the split columns, with Python floats, which is several
+        times faster than transforming a one-row matrix. Each value goes
+        through the same float64 arithmetic and float32 rounding as
+        CompiledModel.transform.
+        """
+        key = []
+        for source, thresholds in self._sources:
+            if source[0] == 'numeric':
+                _, feature, fill, mean, scale = source
+                value = _to_float(data[feature])
+                if value != value:
+                    value = fill
+                value = float(np.float32((value - mean) / scale))
+            else:
+                _, feature, codes, unknown = source
+                value = float(np.float32(codes.get(str(data[feature]), unknown)))
+            key.append(len(thresholds) if value != value else bisect.bisect_left(thresholds, value))
+        return tuple(key)
+    
+    def stats(self) -> dict:
+        """Split columns and the number of intervals of each"""
+        return {
+            'split_columns': len(self.columns),
+            'intervals': [len(thresholds) + 1 for thresholds in self.thresholds]
+        }
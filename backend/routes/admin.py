@@ -0,0 +1,43 @@
+"""
+Admin API Routes
+Lists and serves the request profiles saved by the profiling middleware.
+Only mounted when PROFILING=true and PROFILE_TOKEN is set.
+"""
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+from utils.profiler import authorized, get_profile_store
+from typing import Optional
+
+router = APIRouter()
+
+
+def _check_token(x_profile: Optional[str]):
+    """Profiles are only readable by requests carrying PROFILE_TOKEN"""
+    if not authorized(x_profile):
+        raise HTTPException(status_code=403, detail="X-Profile header must carry the profiling token")
+
+
+@router.get("/profiles")
+async def list_profiles(x_profile: Optional[str] = Header(None)):
+    """List stored request profiles, newest first"""
+    _check_token(x_profile)
+    store = get_profile_store()
+    profiles = await run_in_threadpool(store.list)
+    return {
+        "status": "success",
+        "max_profiles": store.max_files,
+        "count": len(profiles),
+        "profiles": profiles
+    }
+
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str, x_profile: Optional[str] = Header(None)):
+    """Download a profile in collapsed-stack format (flamegraph.pl, speedscope, inferno)"""
+    _check_token(x_profile)
+    path = get_profile_store().path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return FileResponse(path, media_type="text/plain", filename=path.name)
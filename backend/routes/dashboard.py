@@ -3,14 +3,42 @@ Dashboard API Routes
 Handles prediction history, statistics, and reports
 """
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
-from models.database import get_database
-from utils.pdf_generator import generate_prediction_report
-from typing import List
+import json
+import os
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+from fastapi.responses import Response, StreamingResponse
+from models.database import build_history_filters, get_database
+from models.prediction_writer import get_prediction_writer
+from utils.exporter import EXPORT_FORMATS, export_predictions
+from utils.report_renderer import (
+    get_report_cache,
+    render_combined_report,
+    render_report,
+    report_filename,
+    require_pypdf,
+    stream_reports_zip,
+)
+from typing import Dict, Iterator, List, Optional
 
 router = APIRouter()
 
+# Largest page /history returns as plain JSON
+HISTORY_MAX_PAGE = 1000
+
+# Bulk report limits: IDs per request and renders in flight per request
+BULK_REPORT_MAX_IDS = int(os.getenv("BULK_REPORT_MAX_IDS", 1000))
+BULK_REPORT_WINDOW = int(os.getenv("BULK_REPORT_WINDOW", 8))
+# format=pdf builds the combined file in memory, so it takes fewer IDs
+BULK_REPORT_MAX_PDF_IDS = int(os.getenv("BULK_REPORT_MAX_PDF_IDS", 200))
+
+
+class BulkReportRequest(BaseModel):
+    """Request model for the bulk report endpoint"""
+    ids: List[int] = Field(..., min_length=1, description="Prediction IDs, in the order the reports should appear")
+    format: str = Field("zip", pattern="^(zip|pdf)$", description="zip of per-prediction PDFs, or one combined pdf")
+
 
 @router.get("/stats")
 async def get_statistics():
@@ -26,21 +54,113 @@ async def get_statistics():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/write-queue")
+async def get_write_queue_stats():
+    """Get background prediction writer queue depth, drops and flush latency"""
+    return {
+        "status": "success",
+        "write_queue": get_prediction_writer().stats()
+    }
+
+
+def history_filters(
+    prediction: Optional[str] = None,
+    enterprise_size: Optional[str] = None,
+    min_age: Optional[float] = None,
+    max_age: Optional[float] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+) -> Dict:
+    """History filters shared by /history and /export"""
+    return build_history_filters(prediction, enterprise_size, min_age, max_age, start_date, end_date)
+
+
+@router.get("/report-cache")
+async def get_report_cache_stats():
+    """Get PDF report cache size and hit/miss counters"""
+    return {
+        "status": "success",
+        "report_cache": get_report_cache().stats()
+    }
+
+
 @router.get("/history")
-async def get_prediction_history(limit: int = 50):
-    """Get prediction history with optional limit"""
+async def get_prediction_history(
+    limit: int = Query(50, ge=1, le=HISTORY_MAX_PAGE),
+    cursor: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    filters: Dict = Depends(history_filters)
+):
+    """
+    Get prediction history, newest first
+    
+    Filter by prediction class, enterprise size, age range and date range
+    (inclusive). Page with the `next_cursor` returned by the previous call.
+    With format=ndjson, every matching row from the cursor on is streamed
+    one JSON object per line and `limit` is ignored.
+    """
     try:
         db = get_database()
-        predictions = db.get_all_predictions(limit=limit)
+        if cursor:
+            db.decode_cursor(cursor)
+        
+        if format == "ndjson":
+            return StreamingResponse(
+                _ndjson_lines(db.iter_predictions(filters, cursor=cursor)),
+                media_type="application/x-ndjson"
+            )
+        
+        predictions, next_cursor = db.get_predictions_page(filters, limit=limit, cursor=cursor)
         return {
             "status": "success",
             "count": len(predictions),
-            "predictions": predictions
+            "predictions": predictions,
+            "next_cursor": next_cursor
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _ndjson_lines(rows: Iterator[Dict], lines_per_chunk: int = 500) -> Iterator[bytes]:
+    """Serialize rows as NDJSON, yielding a few hundred lines per chunk"""
+    chunk = []
+    for row in rows:
+        chunk.append(json.dumps(row))
+        if len(chunk) >= lines_per_chunk:
+            yield ("\n".join(chunk) + "\n").encode()
+            chunk = []
+    if chunk:
+        yield ("\n".join(chunk) + "\n").encode()
+
+
+@router.get("/export")
+async def export_prediction_history(
+    format: str = Query("csv", pattern="^(csv|parquet|arrow)$"),
+    filters: Dict = Depends(history_filters)
+):
+    """
+    Download prediction history as CSV, Parquet or Arrow IPC stream
+    
+    Model features are flattened into columns. Takes the same filters as
+    /history; the file is streamed in chunks straight from the database.
+    """
+    try:
+        chunks = export_predictions(get_database(), format, filters)
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    
+    media_type, extension = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename=sme_predictions.{extension}"
+        }
+    )
+
+
 @router.get("/prediction/{prediction_id}")
 async def get_prediction_detail(prediction_id: int):
     """Get details of a specific prediction"""
@@ -71,15 +191,15 @@ async def download_prediction_report(prediction_id: int):
         if not prediction:
             raise HTTPException(status_code=404, detail="Prediction not found")
         
-        # Generate PDF
-        pdf_buffer = generate_prediction_report(prediction)
+        # Served from the report cache, else rendered in the report pool
+        pdf = await render_report(prediction)
         
         # Return as downloadable file
-        return StreamingResponse(
-            pdf_buffer,
+        return Response(
+            pdf,
             media_type="application/pdf",
             headers={
-                "Content-Disposition": f"attachment; filename=sme_prediction_report_{prediction_id}.pdf"
+                "Content-Disposition": f"attachment; filename={report_filename(prediction_id)}"
             }
         )
     except HTTPException:
@@ -88,6 +208,60 @@ async def download_prediction_report(prediction_id: int):
         raise HTTPException(status_code=500, detail=f"Error generating report: {str(e)}")
 
 
+@router.post("/reports")
+async def download_bulk_reports(request: BulkReportRequest):
+    """
+    Download reports for many predictions at once
+    
+    All rows are fetched in one query and rendered in parallel on the
+    report pool (cached reports are reused). format=zip streams each PDF
+    into the archive as soon as it is ready; format=pdf returns one
+    combined PDF in request order, built in memory, so it is limited to
+    BULK_REPORT_MAX_PDF_IDS reports. IDs that don't exist are skipped and
+    listed in the X-Missing-Prediction-Ids header.
+    """
+    max_ids = BULK_REPORT_MAX_IDS if request.format == "zip" else BULK_REPORT_MAX_PDF_IDS
+    if len(request.ids) > max_ids:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many reports for format={request.format}: {len(request.ids)} (max {max_ids})"
+        )
+    
+    try:
+        db = get_database()
+        predictions = db.get_predictions_by_ids(request.ids)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    if not predictions:
+        raise HTTPException(status_code=404, detail="None of the predictions were found")
+    
+    found = {prediction['id'] for prediction in predictions}
+    missing = [str(i) for i in dict.fromkeys(request.ids) if i not in found]
+    headers = {"X-Missing-Prediction-Ids": ",".join(missing)} if missing else {}
+    
+    if request.format == "zip":
+        headers["Content-Disposition"] = "attachment; filename=sme_prediction_reports.zip"
+        return StreamingResponse(
+            stream_reports_zip(predictions, BULK_REPORT_WINDOW),
+            media_type="application/zip",
+            headers=headers
+        )
+    
+    try:
+        require_pypdf()
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    
+    try:
+        pdf = await render_combined_report(predictions, BULK_REPORT_WINDOW)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error generating reports: {str(e)}")
+    
+    headers["Content-Disposition"] = "attachment; filename=sme_prediction_reports.pdf"
+    return Response(pdf, media_type="application/pdf", headers=headers)
+
+
 @router.delete("/prediction/{prediction_id}")
 async def delete_prediction(prediction_id: int):
     """Delete a prediction from history"""
@@ -98,6 +272,7 @@ async def delete_prediction(prediction_id: int):
         if not deleted:
             raise HTTPException(status_code=404, detail="Prediction not found")
         
+        get_report_cache().invalidate(prediction_id)
         return {
             "status": "success",
             "message": f"Prediction {prediction_id} deleted successfully"
@@ -114,6 +289,7 @@ async def clear_all_history():
     try:
         db = get_database()
         db.clear_all_predictions()
+        get_report_cache().clear()
         return {
             "status": "success",
             "message": "All prediction history cleared"
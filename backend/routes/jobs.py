@@ -0,0 +1,129 @@
+"""
+Upload Job API Routes
+Handles spreadsheet uploads scored in the background, with progress polling
+and result download
+"""
+
+import os
+import uuid
+from pathlib import Path
+
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+from models.database import get_database
+from models.model_loader import get_model
+from routes.predict import PredictionRequest
+from utils.upload_jobs import (
+    UPLOAD_FORMATS,
+    UPLOAD_JOBS_DIR,
+    require_openpyxl,
+    result_path,
+    submit_upload_job,
+    upload_path,
+)
+
+router = APIRouter()
+
+# Largest accepted upload
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", 100 * 1024 * 1024))
+
+
+def _validate_row(record: dict) -> dict:
+    """Validate one uploaded row exactly like a /predict request body"""
+    return PredictionRequest.model_validate(record).to_input_data()
+
+
+def _save_upload(upload: UploadFile, destination: Path) -> int:
+    """Copy the upload to disk in 1 MB blocks, enforcing UPLOAD_MAX_BYTES"""
+    written = 0
+    with open(destination, 'wb') as out:
+        while True:
+            block = upload.file.read(1024 * 1024)
+            if not block:
+                break
+            written += len(block)
+            if written > UPLOAD_MAX_BYTES:
+                raise ValueError(f"File too large (max {UPLOAD_MAX_BYTES} bytes)")
+            out.write(block)
+    return written
+
+
+@router.post("/predict/upload", status_code=202)
+async def upload_predictions_file(
+    file: UploadFile = File(..., description="CSV or Excel (.xlsx) file with one enterprise per row"),
+    persist: bool = Form(True, description="Save the scored rows to prediction history")
+):
+    """
+    Score a spreadsheet of enterprises in the background
+    
+    The file needs one column per required feature (see /api/features).
+    Returns a job ID; poll /api/jobs/{job_id} for progress and download the
+    scored CSV from /api/jobs/{job_id}/result once it has completed.
+    """
+    suffix = Path(file.filename or '').suffix.lower()
+    fmt = UPLOAD_FORMATS.get(suffix)
+    if fmt is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type '{suffix}' (expected one of {sorted(UPLOAD_FORMATS)})"
+        )
+    if fmt == 'excel':
+        try:
+            require_openpyxl()
+        except RuntimeError as e:
+            raise HTTPException(status_code=501, detail=str(e))
+    
+    job_id = uuid.uuid4().hex
+    path = upload_path(job_id, suffix)
+    UPLOAD_JOBS_DIR.mkdir(parents=True, exist_ok=True)
+    try:
+        await run_in_threadpool(_save_upload, file, path)
+    except ValueError as e:
+        path.unlink(missing_ok=True)
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    try:
+        db = get_database()
+        db.create_upload_job(job_id, file.filename, persist)
+        submit_upload_job(db, get_model(), job_id, path, fmt, persist, _validate_row)
+    except Exception as e:
+        path.unlink(missing_ok=True)
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return {
+        "status": "accepted",
+        "job_id": job_id,
+        "status_url": f"/api/jobs/{job_id}",
+        "result_url": f"/api/jobs/{job_id}/result"
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """Get status, progress and row counts of an upload job"""
+    job = get_database().get_upload_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return {
+        "status": "success",
+        "job": job
+    }
+
+
+@router.get("/jobs/{job_id}/result")
+async def download_job_result(job_id: str):
+    """Download the scored CSV of a completed upload job"""
+    job = get_database().get_upload_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job['status'] != 'completed':
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    
+    path = result_path(job_id)
+    if not path.exists():
+        raise HTTPException(status_code=410, detail="Job result no longer available")
+    
+    stem = Path(job['filename'] or 'upload').stem
+    return FileResponse(path, media_type="text/csv", filename=f"{stem}_scored.csv")
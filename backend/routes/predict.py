@@ -2,14 +2,32 @@
 Prediction API Routes
 """
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
-from typing import Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from typing import Any, Dict, List, Optional, Union
 from models.model_loader import get_model
 from models.database import get_database
+from models.prediction_writer import get_prediction_writer
+from utils.inference_executor import (
+    InferenceOverloadedError,
+    get_inference_executor,
+    predict_many,
+    predict_one,
+    predict_sweep,
+)
+from utils.metrics import observe_stage, validation_started
+from utils.micro_batcher import MICRO_BATCHING_ENABLED, get_micro_batcher
+from utils.what_if import SWEEP_MAX_FEATURES, SWEEP_MAX_POINTS, sweep_values
+import os
+import time
 
 router = APIRouter()
 
+# Batch scoring limits
+BATCH_MAX_RECORDS = int(os.getenv("BATCH_MAX_RECORDS", 200000))
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", 5000))
+
 
 class PredictionRequest(BaseModel):
     """Request model for prediction endpoint"""
@@ -44,6 +62,10 @@ class PredictionRequest(BaseModel):
                 "Small/Medium/Large": "Medium"
             }
         }
+    
+    def to_input_data(self) -> Dict[str, Any]:
+        """Convert request to dict with original feature names"""
+        return self.model_dump(by_alias=True)
 
 
 class PredictionResponse(BaseModel):
@@ -53,8 +75,63 @@ class PredictionResponse(BaseModel):
     message: str = "Prediction successful"
 
 
+class BatchPredictionRequest(BaseModel):
+    """Request model for batch prediction endpoint"""
+    records: List[Dict[str, Any]] = Field(..., description="Enterprise records, each shaped like a PredictionRequest")
+    persist: bool = Field(True, description="Save the scored records to prediction history")
+
+
+class BatchPredictionResult(BaseModel):
+    """Prediction for a single record of a batch"""
+    index: int
+    prediction: str
+    confidence_scores: Dict[str, float]
+
+
+class BatchPredictionError(BaseModel):
+    """Validation error for a single record of a batch"""
+    index: int
+    errors: List[Dict[str, Any]]
+
+
+class BatchPredictionResponse(BaseModel):
+    """Response model for batch prediction endpoint"""
+    total: int
+    succeeded: int
+    failed: int
+    saved: int
+    results: List[BatchPredictionResult]
+    errors: List[BatchPredictionError]
+
+
+class SweepFeature(BaseModel):
+    """One feature of a what-if sweep and the values to try"""
+    feature: str = Field(..., description="Original feature name, as listed by /api/features")
+    values: Optional[List[Union[int, float, str]]] = Field(
+        None, max_length=SWEEP_MAX_POINTS, description="Explicit values (overrides min/max/step)"
+    )
+    min: Optional[float] = Field(None, description="Lowest value (default: the feature's valid range)")
+    max: Optional[float] = Field(None, description="Highest value (default: the feature's valid range)")
+    step: Optional[float] = Field(None, gt=0, description="Distance between values")
+
+
+class WhatIfRequest(BaseModel):
+    """Request model for the what-if sweep endpoint"""
+    base: PredictionRequest
+    sweep: List[SweepFeature] = Field(..., min_length=1, max_length=SWEEP_MAX_FEATURES)
+
+
+class WhatIfResponse(BaseModel):
+    """Probability grid of a what-if sweep, one nesting level per swept feature"""
+    axes: List[Dict[str, Any]]
+    class_labels: List[str]
+    probabilities: Dict[str, List[Any]]
+    predictions: List[Any]
+    points: int
+
+
 @router.post("/predict", response_model=PredictionResponse)
-async def predict_growth_category(request: PredictionRequest):
+async def predict_growth_category(request: PredictionRequest, started: float = Depends(validation_started)):
     """
     Predict SME growth category based on input features
     
@@ -62,58 +139,194 @@ async def predict_growth_category(request: PredictionRequest):
         - prediction: Predicted growth category (High/Medium/Low)
         - confidence_scores: Confidence scores for each category
     """
+    observe_stage('request_validation', 'single', time.perf_counter() - started)
     try:
-        # Get model instance
-        model = get_model()
-        
         # Convert request to dict with original feature names
-        input_data = {
-            "Location": request.Location,
-            "About Enterprises, Owners Motivation": request.About_Enterprises_Owners_Motivation,
-            "Enabler 2:Operational Process , Legacy & new machine to balance": request.Enabler_2_Operational_Process,
-            "Enabler 1: Effortable Digital technologies": request.Enabler_1_Effortable_Digital_technologies,
-            "Outcome : Growth and Effeciency": request.Outcome_Growth_and_Effeciency,
-            "Enabler 2 :Certification &Standarization": request.Enabler_2_Certification_Standarization,
-            "Challanges3: Financial assistant & Incentive ,transparency in institutional support ,": request.Challanges3_Financial_assistant,
-            "Enabler 3: Administrative and Regulatory Hurdles & Eco system Integration challenges": request.Enabler_3_Administrative_Regulatory,
-            "Enabler 4: Engaging local hire": request.Enabler_4_Engaging_local_hire,
-            "Challenges 2: Skill Gap ,Retaining resources and workforce Management": request.Challenges_2_Skill_Gap,
-            "Enterprise_Age": request.Enterprise_Age,
-            "Small/Medium/Large": request.Small_Medium_Large
-        }
+        input_data = request.to_input_data()
         
-        # Make prediction
-        result = model.predict(input_data)
+        # Make prediction in the inference pool, off the event loop,
+        # coalesced with concurrent requests when micro-batching is on
+        if MICRO_BATCHING_ENABLED:
+            result = await get_micro_batcher().submit(input_data)
+        else:
+            result = await get_inference_executor().run(predict_one, input_data)
         
-        # Save prediction to database (async, don't wait)
+        # Queue prediction for the background writer (don't wait)
         try:
-            from threading import Thread
-            def save_async():
-                try:
-                    db = get_database()
-                    db.save_prediction(
-                        prediction=result['prediction'],
-                        confidence_scores=result['confidence_scores'],
-                        input_data=input_data
-                    )
-                except Exception as e:
-                    print(f"Warning: Failed to save prediction: {e}")
-            
-            Thread(target=save_async, daemon=True).start()
+            if not get_prediction_writer().submit(
+                prediction=result['prediction'],
+                confidence_scores=result['confidence_scores'],
+                input_data=input_data
+            ):
+                print("Warning: Prediction write queue full, prediction not saved")
         except Exception as db_error:
-            print(f"Warning: Failed to start save thread: {db_error}")
+            print(f"Warning: Failed to queue prediction for saving: {db_error}")
         
         return PredictionResponse(
             prediction=result['prediction'],
             confidence_scores=result['confidence_scores']
         )
-        
+    
+    except InferenceOverloadedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
 
+def _validate_batch(records: List[Dict[str, Any]]) -> tuple:
+    """Validate each record independently: (valid indices, valid inputs, errors)"""
+    indices = []
+    inputs = []
+    errors = []
+    for index, record in enumerate(records):
+        try:
+            inputs.append(PredictionRequest.model_validate(record).to_input_data())
+            indices.append(index)
+        except ValidationError as e:
+            errors.append(BatchPredictionError(
+                index=index,
+                errors=e.errors(include_url=False, include_context=False)
+            ))
+    return indices, inputs, errors
+
+
+def _save_batch(scored: List[dict], inputs: List[dict]) -> int:
+    """Save scored records to prediction history in one transaction"""
+    return get_database().save_predictions_bulk([
+        (result['prediction'], result['confidence_scores'], input_data)
+        for result, input_data in zip(scored, inputs)
+    ])
+
+
+def _batch_response(total: int, indices: List[int], scored: List[dict],
+                    errors: List[BatchPredictionError], saved: int) -> BatchPredictionResponse:
+    return BatchPredictionResponse(
+        total=total,
+        succeeded=len(scored),
+        failed=len(errors),
+        saved=saved,
+        results=[
+            BatchPredictionResult(
+                index=index,
+                prediction=result['prediction'],
+                confidence_scores=result['confidence_scores']
+            )
+            for index, result in zip(indices, scored)
+        ],
+        errors=errors
+    )
+
+
+@router.post("/predict/batch", response_model=BatchPredictionResponse)
+async def predict_growth_category_batch(request: BatchPredictionRequest, started: float = Depends(validation_started)):
+    """
+    Predict SME growth categories for many enterprises in one call
+    
+    Each record is validated on its own; invalid records are reported in
+    `errors` by index without failing the rest of the batch. Valid records
+    are scored in vectorized chunks and optionally saved in bulk.
+    
+    Returns:
+        - results: Prediction and confidence scores per valid record
+        - errors: Validation errors per invalid record
+    """
+    if len(request.records) > BATCH_MAX_RECORDS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(request.records)} records (max {BATCH_MAX_RECORDS})"
+        )
+    
+    try:
+        # Validation, saving and building the response are linear in the
+        # batch size, so all of it runs off the event loop
+        indices, inputs, errors = await run_in_threadpool(_validate_batch, request.records)
+        observe_stage('request_validation', 'batch', time.perf_counter() - started)
+        
+        # Score all valid records in the inference pool
+        scored = await get_inference_executor().run(predict_many, inputs, BATCH_CHUNK_SIZE)
+        
+        # Save predictions to database in a single transaction
+        saved = 0
+        if request.persist and scored:
+            try:
+                saved = await run_in_threadpool(_save_batch, scored, inputs)
+            except Exception as db_error:
+                print(f"Warning: Failed to save batch predictions: {db_error}")
+        
+        return await run_in_threadpool(
+            _batch_response, len(request.records), indices, scored, errors, saved
+        )
+    
+    except InferenceOverloadedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch prediction error: {str(e)}")
+
+
+# Validators for lists of one PredictionRequest field, by original feature name
+_SWEEP_VALUE_ADAPTERS = {
+    field.alias or name: TypeAdapter(List[field.annotation])
+    for name, field in PredictionRequest.model_fields.items()
+}
+
+
+@router.post("/predict/what-if", response_model=WhatIfResponse)
+async def predict_what_if(request: WhatIfRequest, started: float = Depends(validation_started)):
+    """
+    Sweep one or two features of a profile over a range of values
+    
+    Every combination of the swept values is applied to `base` and the
+    whole grid is scored in one vectorized inference call. Swept values
+    default to the feature's valid range (1-5 for Likert scores) and are
+    validated like the fields of /api/predict. Sweeps are not saved to
+    prediction history.
+    
+    Returns:
+        - probabilities: Grid of confidence scores per category
+        - predictions: Grid of predicted categories
+    """
+    base = request.base.to_input_data()
+    try:
+        swept = []
+        points = 1
+        for axis in request.sweep:
+            if axis.feature not in base:
+                raise ValueError(f"Unknown feature: {axis.feature}")
+            values = sweep_values(axis.feature, axis.values, axis.min, axis.max, axis.step)
+            swept.append((axis.feature, values))
+            points *= len(values)
+        # Reject oversized grids before any value is validated
+        if points > SWEEP_MAX_POINTS:
+            raise ValueError(f"Sweep too large: {points} points (max {SWEEP_MAX_POINTS})")
+        
+        axes = []
+        for feature, values in swept:
+            # Validate and coerce the values with the field's own type, as /api/predict would
+            try:
+                values = _SWEEP_VALUE_ADAPTERS[feature].validate_python(values)
+            except ValidationError as e:
+                raise ValueError(f"Invalid value for {feature}: {e.errors(include_url=False)[0]['msg']}")
+            axes.append({'feature': feature, 'values': values})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    observe_stage('request_validation', 'sweep', time.perf_counter() - started)
+    
+    try:
+        result = await get_inference_executor().run(predict_sweep, base, axes)
+        return WhatIfResponse(**result)
+    
+    except InferenceOverloadedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"What-if sweep error: {str(e)}")
+
+
 @router.get("/model-info")
 async def get_model_info():
     """Get model metadata and feature information"""
@@ -140,3 +353,26 @@ async def get_required_features():
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """Get prediction cache hit/miss/eviction counters"""
+    try:
+        model = get_model()
+        return {
+            "status": "success",
+            "cache": model.get_cache_stats()
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/inference-stats")
+async def get_inference_stats():
+    """Get inference pool queue depth, wait time and micro-batching metrics"""
+    return {
+        "status": "success",
+        "inference": get_inference_executor().stats(),
+        "micro_batching": get_micro_batcher().stats()
+    }
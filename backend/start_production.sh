@@ -9,10 +9,9 @@ if [ -f .env ]; then
     export $(cat .env | grep -v '^#' | xargs)
 fi
 
-# Start uvicorn with production settings
-uvicorn main:app \
-    --host ${API_HOST:-0.0.0.0} \
-    --port ${API_PORT:-8000} \
-    --workers 4 \
-    --log-level info \
-    --no-access-log
+# Start with production settings. Always under gunicorn, so its child_exit
+# hook drops the Prometheus gauges of workers that exit (see gunicorn.conf.py).
+# By default the model is loaded once in the master and the forked workers
+# share its memory; with PRELOAD_MODEL=false every worker loads its own copy.
+API_PORT=${API_PORT:-8000} WEB_CONCURRENCY=${WEB_CONCURRENCY:-4} PRELOAD_MODEL=${PRELOAD_MODEL:-true} \
+    gunicorn main:app -c gunicorn.conf.py
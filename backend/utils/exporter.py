@@ -0,0 +1,156 @@
+"""
+Prediction History Exporter
+Streams the predictions table as CSV, Parquet or Arrow IPC with the model
+features flattened into columns. Rows are read from a SQLite cursor in chunks,
+so memory stays bounded however large the history is. Parquet and Arrow need
+pyarrow, which is imported only when one of those formats is requested.
+"""
+
+import csv
+import io
+from typing import Dict, Iterator, List
+
+from models.database import EXPORT_COLUMNS, FEATURE_COLUMNS, PredictionDatabase
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrows'),
+}
+
+# Rows fetched from SQLite (and written as one CSV chunk / Parquet row group)
+EXPORT_CHUNK_SIZE = 50000
+
+
+def export_predictions(
+    db: PredictionDatabase,
+    fmt: str,
+    filters: Dict = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Stream filtered prediction history in the given format
+    
+    Args:
+        db: Prediction database to read from
+        fmt: One of EXPORT_FORMATS
+        filters: History filters (see PredictionDatabase.get_predictions_page)
+        chunk_size: Rows read and encoded per chunk
+    
+    Returns:
+        Iterator of encoded byte chunks, newest rows first
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    
+    batches = db.iter_prediction_batches(
+        filters or {},
+        columns=', '.join(EXPORT_COLUMNS),
+        batch_size=chunk_size
+    )
+    if fmt == 'csv':
+        return _csv_chunks(batches)
+    
+    require_pyarrow(fmt)
+    return _arrow_chunks(batches, fmt)
+
+
+def _csv_chunks(batches: Iterator[List]) -> Iterator[bytes]:
+    """Encode row batches as CSV, header first"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(EXPORT_COLUMNS)
+    
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    
+    # Header only, for an empty export
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def _arrow_schema(pa):
+    """Typed schema for EXPORT_COLUMNS"""
+    feature_types = {'REAL': pa.float64(), 'INTEGER': pa.int64()}
+    fields = [
+        pa.field('id', pa.int64()),
+        pa.field('timestamp', pa.timestamp('s')),
+        pa.field('prediction', pa.string()),
+        pa.field('confidence_high', pa.float64()),
+        pa.field('confidence_medium', pa.float64()),
+        pa.field('confidence_low', pa.float64()),
+        pa.field('enterprise_size', pa.string()),
+        pa.field('enterprise_age', pa.int64()),
+    ] + [
+        pa.field(column, feature_types[sql_type])
+        for column, sql_type in FEATURE_COLUMNS.values()
+    ]
+    return pa.schema(fields)
+
+
+class ChunkSink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last drain"""
+    
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def require_pyarrow(fmt: str):
+    """Import pyarrow, raising RuntimeError if the format can't be written"""
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        raise RuntimeError(f"{fmt} export requires pyarrow (pip install pyarrow)")
+
+
+def _arrow_chunks(batches: Iterator[List], fmt: str) -> Iterator[bytes]:
+    """Encode row batches as Parquet row groups or Arrow IPC stream batches"""
+    pa = require_pyarrow(fmt)
+    import pyarrow.compute as pc
+    
+    schema = _arrow_schema(pa)
+    sink = ChunkSink()
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(sink, schema, compression='snappy')
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+    
+    try:
+        for rows in batches:
+            columns = list(zip(*rows))
+            arrays = []
+            for field, values in zip(schema, columns):
+                if field.name == 'timestamp':
+                    arrays.append(pc.strptime(pa.array(values, pa.string()), '%Y-%m-%d %H:%M:%S', 's'))
+                else:
+                    arrays.append(pa.array(values, field.type))
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    
+    yield sink.drain()
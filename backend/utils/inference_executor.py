@@ -0,0 +1,165 @@
+"""
+Inference Executor
+Runs CPU-bound model inference on a thread or process pool so it never blocks
+the asyncio event loop, with a bounded backlog and queue/wait metrics
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List
+
+from utils.profiler import run_in_pool
+
+
+class InferenceOverloadedError(Exception):
+    """Raised when the inference backlog is full; callers should answer 503"""
+    pass
+
+
+def _init_worker():
+    """Load the model in a pool process before it takes work"""
+    from models.model_loader import get_model
+    get_model()
+
+
+def _timed_call(fn, args, submitted_at: float):
+    """Run fn in the pool and report how long it waited and ran"""
+    started_at = time.monotonic()
+    result = fn(*args)
+    return result, started_at - submitted_at, time.monotonic() - started_at
+
+
+def predict_one(data: dict) -> dict:
+    """Score a single record with the global model (pool entry point)"""
+    from models.model_loader import get_model
+    return get_model().predict(data)
+
+
+def predict_many(records: List[dict], chunk_size: int, use_cache: bool = False) -> List[dict]:
+    """Score many records with the global model (pool entry point)"""
+    from models.model_loader import get_model
+    return get_model().predict_batch(records, chunk_size=chunk_size, use_cache=use_cache)
+
+
+def predict_sweep(base: dict, axes: List[dict]) -> dict:
+    """Score a what-if grid around one record with the global model (pool entry point)"""
+    from models.model_loader import get_model
+    from utils.what_if import run_sweep
+    return run_sweep(get_model(), base, axes)
+
+
+class InferenceExecutor:
+    """Bounded pool for inference calls made from async route handlers"""
+    
+    def __init__(self, kind: str = 'thread', max_workers: int = 4, max_queue: int = 64):
+        if kind not in ('thread', 'process'):
+            raise ValueError(f"Unknown executor kind: {kind}")
+        
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        if kind == 'process':
+            self._executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='inference')
+        
+        # Metrics
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+    
+    @property
+    def capacity(self) -> int:
+        """Maximum number of calls running or waiting at once"""
+        return self.max_workers + self.max_queue
+    
+    async def run(self, fn, *args):
+        """
+        Run fn(*args) in the pool and await its result
+        
+        Raises:
+            InferenceOverloadedError: if running + queued calls already fill
+                the pool and its backlog
+        """
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                raise InferenceOverloadedError(
+                    f"Inference backlog full ({self.in_flight} requests in flight)"
+                )
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        
+        try:
+            result, wait_seconds, run_seconds = await run_in_pool(
+                self._executor, _timed_call, fn, args, time.monotonic()
+            )
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        
+        with self._lock:
+            self.completed += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+            self.total_run_seconds += run_seconds
+        
+        return result
+    
+    def stats(self) -> Dict:
+        """Return queue depth and wait/run time metrics"""
+        with self._lock:
+            return {
+                'kind': self.kind,
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'in_flight': self.in_flight,
+                'queue_depth': max(0, self.in_flight - self.max_workers),
+                'max_in_flight': self.max_in_flight,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'avg_wait_ms': (self.total_wait_seconds / self.completed * 1000) if self.completed else 0.0,
+                'max_wait_ms': self.max_wait_seconds * 1000,
+                'avg_run_ms': (self.total_run_seconds / self.completed * 1000) if self.completed else 0.0
+            }
+    
+    def shutdown(self):
+        """Wait for running calls and stop the pool"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Global executor instance
+_executor_instance = None
+
+
+def get_inference_executor() -> InferenceExecutor:
+    """Get or create the global inference executor"""
+    global _executor_instance
+    if _executor_instance is None:
+        _executor_instance = InferenceExecutor(
+            kind=os.getenv('INFERENCE_EXECUTOR', 'thread'),
+            max_workers=int(os.getenv('INFERENCE_WORKERS', min(4, os.cpu_count() or 1))),
+            max_queue=int(os.getenv('INFERENCE_MAX_QUEUE', 64))
+        )
+    return _executor_instance
+
+
+def shutdown_inference_executor():
+    """Stop the global executor if it was started"""
+    global _executor_instance
+    if _executor_instance is not None:
+        _executor_instance.shutdown()
+        _executor_instance = None
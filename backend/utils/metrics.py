@@ -0,0 +1,235 @@
+"""
+Prometheus Metrics
+Request counts and latency histograms per route, timings of the prediction
+stages and database calls, and gauges for model load time, cache sizes and
+background queue depths, served at /metrics.
+
+With several worker processes (gunicorn or uvicorn --workers), set
+PROMETHEUS_MULTIPROC_DIR to an empty directory before the app is imported:
+every process then writes its metrics to its own files there and /metrics,
+whichever worker answers it, reports the sum over all of them (gauges per
+process or summed, see below). gunicorn.conf.py and start_production.sh set
+this up. Set METRICS_ENABLED=false to turn the internal timers into no-ops.
+"""
+
+import functools
+import os
+import threading
+import time
+from typing import Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+MULTIPROCESS = bool(os.getenv('PROMETHEUS_MULTIPROC_DIR'))
+
+# Seconds between refreshes of the gauges (each worker samples its own)
+METRICS_SAMPLE_INTERVAL = float(os.getenv('METRICS_SAMPLE_INTERVAL', 5))
+
+# Internal stages take from microseconds (compiled model, cache hits) to
+# seconds (large batches, report rendering)
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+REQUESTS = Counter(
+    'sme_http_requests_total', 'HTTP requests by route and status code',
+    ['method', 'route', 'status']
+)
+REQUEST_LATENCY = Histogram(
+    'sme_http_request_duration_seconds', 'HTTP request latency by route (until the response is sent)',
+    ['method', 'route'], buckets=LATENCY_BUCKETS
+)
+PREDICTION_STAGE_LATENCY = Histogram(
+    'sme_prediction_stage_duration_seconds',
+    'Time spent in each stage of a prediction (mode: single, batch or sweep call)',
+    ['stage', 'mode'], buckets=LATENCY_BUCKETS
+)
+DB_LATENCY = Histogram(
+    'sme_db_operation_duration_seconds', 'PredictionDatabase call latency',
+    ['operation'], buckets=LATENCY_BUCKETS
+)
+MODEL_LOAD_SECONDS = Gauge(
+    'sme_model_load_seconds', 'Time the last model (re)load took',
+    ['format'], multiprocess_mode='livemostrecent'
+)
+CACHE_ENTRIES = Gauge(
+    'sme_cache_entries', 'Entries in an in-memory cache, per process',
+    ['cache'], multiprocess_mode='liveall'
+)
+QUEUE_DEPTH = Gauge(
+    'sme_queue_depth', 'Items waiting in a background queue, summed over processes',
+    ['queue'], multiprocess_mode='livesum'
+)
+
+
+# Labelled histograms by (stage, mode); .labels() takes a lock on every call
+_stage_histograms = {}
+
+
+def observe_stage(stage: str, mode: str, seconds: float):
+    """Record the duration of one prediction stage"""
+    if METRICS_ENABLED:
+        histogram = _stage_histograms.get((stage, mode))
+        if histogram is None:
+            histogram = _stage_histograms[(stage, mode)] = PREDICTION_STAGE_LATENCY.labels(stage, mode)
+        histogram.observe(seconds)
+
+
+def timed_db(operation: str):
+    """Decorator recording the latency of a PredictionDatabase method"""
+    def decorator(fn):
+        if not METRICS_ENABLED:
+            return fn
+        histogram = DB_LATENCY.labels(operation)
+        
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+async def validation_started() -> float:
+    """
+    Dependency marking the start of request validation
+    
+    FastAPI resolves dependencies before it validates the request body, so
+    an endpoint taking `started: float = Depends(validation_started)` can
+    record the validation time as `time.perf_counter() - started`.
+    """
+    return time.perf_counter()
+
+
+class MetricsMiddleware:
+    """ASGI middleware counting requests and timing them per route template"""
+    
+    def __init__(self, app):
+        self.app = app
+        self._route_paths = None
+    
+    def _route(self, scope) -> str:
+        """Route template (e.g. /api/dashboard/report/{prediction_id}), so labels stay bounded"""
+        if self._route_paths is None:
+            self._route_paths = {
+                route.endpoint: route.path
+                for route in scope['app'].routes
+                if getattr(route, 'endpoint', None) is not None
+            }
+        return self._route_paths.get(scope.get('endpoint'), 'unmatched')
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        
+        status = 500
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+        
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = self._route(scope)
+            REQUEST_LATENCY.labels(scope['method'], route).observe(time.perf_counter() - start)
+            REQUESTS.labels(scope['method'], route, str(status)).inc()
+
+
+def sample_gauges():
+    """Refresh cache size and queue depth gauges from this process's components"""
+    # Read the module-level instances directly: sampling must not create them
+    from models import model_loader, prediction_writer
+    from utils import inference_executor, micro_batcher, report_renderer
+    
+    model = model_loader._model_instance
+    if model is not None:
+        CACHE_ENTRIES.labels('prediction').set(model.cache.stats()['size'])
+    if report_renderer._cache_instance is not None:
+        CACHE_ENTRIES.labels('report').set(report_renderer._cache_instance.stats()['memory_entries'])
+    if prediction_writer._writer_instance is not None:
+        QUEUE_DEPTH.labels('prediction_writer').set(prediction_writer._writer_instance.stats()['queue_depth'])
+    if inference_executor._executor_instance is not None:
+        QUEUE_DEPTH.labels('inference').set(inference_executor._executor_instance.stats()['queue_depth'])
+    if micro_batcher._batcher_instance is not None:
+        QUEUE_DEPTH.labels('micro_batch').set(micro_batcher._batcher_instance.stats()['pending'])
+
+
+def render_metrics() -> bytes:
+    """Metrics in the Prometheus text format, aggregated over all processes in multiprocess mode"""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+class GaugeSampler:
+    """Background thread refreshing the gauges every METRICS_SAMPLE_INTERVAL seconds"""
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='metrics-sampler', daemon=True)
+    
+    def start(self):
+        self._thread.start()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                sample_gauges()
+            except Exception as e:
+                print(f"Warning: Failed to sample metrics gauges: {e}")
+    
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=self.interval + 1)
+
+
+_sampler_instance: Optional[GaugeSampler] = None
+
+
+def start_metrics_sampler():
+    """Start this process's gauge sampler"""
+    global _sampler_instance
+    if _sampler_instance is None and METRICS_ENABLED and METRICS_SAMPLE_INTERVAL > 0:
+        _sampler_instance = GaugeSampler(METRICS_SAMPLE_INTERVAL)
+        _sampler_instance.start()
+
+
+def stop_metrics_sampler():
+    """Stop the gauge sampler if it was started"""
+    global _sampler_instance
+    if _sampler_instance is not None:
+        _sampler_instance.stop()
+        _sampler_instance = None
+
+
+def mark_process_dead():
+    """
+    Drop this process's live gauges from the multiprocess directory
+    
+    gunicorn.conf.py does this for every worker that exits; calling it on
+    shutdown also covers servers without that hook (uvicorn --workers).
+    """
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,117 @@
+"""
+Micro-Batcher
+Coalesces concurrent single-row prediction requests into one vectorized
+predict_proba call. Requests wait at most `max_wait_ms` for company; a batch
+is dispatched as soon as it reaches `max_batch_size` rows.
+"""
+
+import asyncio
+import os
+from typing import Dict, List, Tuple
+
+from utils.inference_executor import InferenceExecutor, get_inference_executor, predict_many
+
+# Coalesce /api/predict calls (off by default)
+MICRO_BATCHING_ENABLED = os.getenv('MICRO_BATCHING', 'false').lower() in ('1', 'true', 'yes')
+
+
+class MicroBatcher:
+    """Collects pending requests on the event loop and scores them together"""
+    
+    def __init__(self, executor: InferenceExecutor, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._pending: List[Tuple[dict, asyncio.Future]] = []
+        self._timer = None
+        self._tasks = set()
+        
+        # Metrics
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        self.flushes_by_size = 0
+        self.flushes_by_timeout = 0
+    
+    async def submit(self, data: dict) -> dict:
+        """Queue one record and wait for its prediction"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((data, future))
+        
+        if len(self._pending) >= self.max_batch_size:
+            self._flush(by_size=True)
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._flush)
+        
+        return await future
+    
+    def _flush(self, by_size: bool = False):
+        """Dispatch all pending requests as one batch"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        if by_size:
+            self.flushes_by_size += 1
+        else:
+            self.flushes_by_timeout += 1
+        
+        # Keep a reference so the task isn't garbage collected mid-flight
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _run_batch(self, batch: List[Tuple[dict, asyncio.Future]]):
+        """Score a batch in the inference pool and resolve each caller's future"""
+        records = [data for data, _ in batch]
+        try:
+            results = await self.executor.run(predict_many, records, len(records), True)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            # The caller may have gone away (client disconnect) in the meantime
+            if not future.done():
+                future.set_result(result)
+    
+    def stats(self) -> Dict:
+        """Return batch size and flush metrics"""
+        return {
+            'enabled': MICRO_BATCHING_ENABLED,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait_ms,
+            'pending': len(self._pending),
+            'batches': self.batches,
+            'items': self.items,
+            'avg_batch_size': (self.items / self.batches) if self.batches else 0.0,
+            'largest_batch': self.largest_batch,
+            'flushes_by_size': self.flushes_by_size,
+            'flushes_by_timeout': self.flushes_by_timeout
+        }
+
+
+# Global batcher instance
+_batcher_instance = None
+
+
+def get_micro_batcher() -> MicroBatcher:
+    """Get or create the global micro-batcher"""
+    global _batcher_instance
+    if _batcher_instance is None:
+        _batcher_instance = MicroBatcher(
+            get_inference_executor(),
+            max_batch_size=int(os.getenv('MICRO_BATCH_MAX_SIZE', 32)),
+            max_wait_ms=float(os.getenv('MICRO_BATCH_MAX_WAIT_MS', 5))
+        )
+    return _batcher_instance
@@ -1,39 +1,33 @@
 """
 PDF Report Generator for SME Growth Predictions
 Uses ReportLab for PDF generation
+
+ReportLab and matplotlib are imported on first use rather than at module
+import, so workers that never render a report don't pay their startup cost.
 """
 
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from datetime import datetime
+from functools import lru_cache
 from io import BytesIO
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
+from types import SimpleNamespace
 
+# Bump whenever the report layout changes, so cached PDFs are re-rendered
+REPORT_TEMPLATE_VERSION = 2
 
-def generate_prediction_report(prediction_data: dict) -> BytesIO:
-    """
-    Generate a PDF report for a prediction
-    
-    Args:
-        prediction_data: Dictionary containing prediction details
-        
-    Returns:
-        BytesIO: PDF file in memory
-    """
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
+CONFIDENCE_CATEGORIES = ['High', 'Medium', 'Low']
+CHART_COLORS = {'High': '#10b981', 'Medium': '#f59e0b', 'Low': '#ef4444'}
+
+
+@lru_cache(maxsize=None)
+def get_report_styles() -> SimpleNamespace:
+    """Build the report styles on first use; they are immutable, so once per process"""
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import TableStyle
     
-    # Container for PDF elements
-    elements = []
     styles = getSampleStyleSheet()
     
-    # Custom styles
     title_style = ParagraphStyle(
         'CustomTitle',
         parent=styles['Heading1'],
@@ -52,8 +46,138 @@ def generate_prediction_report(prediction_data: dict) -> BytesIO:
         spaceBefore=20
     )
     
+    footer_style = ParagraphStyle(
+        'Footer',
+        parent=styles['Normal'],
+        fontSize=8,
+        textColor=colors.grey,
+        alignment=TA_CENTER
+    )
+    
+    prediction_colors = {
+        'High': colors.HexColor('#10b981'),
+        'Medium': colors.HexColor('#f59e0b'),
+        'Low': colors.HexColor('#ef4444')
+    }
+    
+    metadata_table_style = TableStyle([
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#374151')),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ])
+    
+    # One result table style per prediction color
+    result_table_styles = {
+        prediction: TableStyle([
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (1, 0), (1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 12),
+            ('TEXTCOLOR', (1, 0), (1, 0), pred_color),
+            ('FONTSIZE', (1, 0), (1, 0), 16),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
+        ])
+        for prediction, pred_color in list(prediction_colors.items()) + [(None, colors.grey)]
+    }
+    
+    confidence_table_style = TableStyle([
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e5e7eb')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ])
+    
+    profile_table_style = TableStyle([
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ])
+    
+    metrics_table_style = TableStyle([
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e5e7eb')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'CENTER'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+    ])
+    
+    return SimpleNamespace(
+        styles=styles,
+        title=title_style,
+        heading=heading_style,
+        footer=footer_style,
+        metadata_table=metadata_table_style,
+        result_tables=result_table_styles,
+        confidence_table=confidence_table_style,
+        profile_table=profile_table_style,
+        metrics_table=metrics_table_style
+    )
+
+
+METRIC_FIELDS = [
+    ('About Enterprises, Owners Motivation', 'Owner Motivation'),
+    ('Enabler 1: Effortable Digital technologies', 'Digital Technologies'),
+    ('Outcome : Growth and Effeciency', 'Growth & Efficiency'),
+    ('Enabler 2 :Certification &Standarization', 'Certification'),
+    ('Challenges 2: Skill Gap ,Retaining resources and workforce Management', 'Skill Gap Challenges'),
+]
+
+INTERPRETATIONS = {
+    'High': "Your SME shows strong indicators for high growth potential. Focus on scaling operations, "
+            "maintaining momentum, and seeking expansion opportunities. Consider investment in technology "
+            "and workforce development to sustain growth trajectory.",
+    'Medium': "Your SME demonstrates moderate growth potential with room for improvement. Consider addressing "
+              "key operational challenges, improving digital adoption, and strengthening workforce capabilities. "
+              "Focus on efficiency improvements and strategic planning to move toward high growth.",
+    'Low': "Your SME may face significant growth challenges. Priority should be given to improving operational "
+           "efficiency, addressing financial constraints, and building foundational capabilities. Consider "
+           "seeking support programs, mentorship, and targeted interventions to overcome barriers."
+}
+
+FOOTER_TEXT = "This report is generated by SME Growth Predictor AI System | For informational purposes only"
+
+
+def render_prediction_report(prediction_data: dict) -> bytes:
+    """Render a prediction report to PDF bytes (picklable, for process pools)"""
+    return generate_prediction_report(prediction_data).getvalue()
+
+
+def generate_prediction_report(prediction_data: dict, chart: str = 'native') -> BytesIO:
+    """
+    Generate a PDF report for a prediction
+    
+    Args:
+        prediction_data: Dictionary containing prediction details
+        chart: Confidence chart renderer: 'native' (ReportLab graphics),
+            'matplotlib' (embedded PNG) or None for no chart
+    
+    Returns:
+        BytesIO: PDF file in memory
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer, Image
+    
+    report_styles = get_report_styles()
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
+    
+    # Container for PDF elements
+    elements = []
+    
     # Title
-    title = Paragraph("SME Growth Prediction Report", title_style)
+    title = Paragraph("SME Growth Prediction Report", report_styles.title)
     elements.append(title)
     elements.append(Spacer(1, 0.2*inch))
     
@@ -66,75 +190,48 @@ def generate_prediction_report(prediction_data: dict) -> BytesIO:
     ]
     
     metadata_table = Table(metadata_data, colWidths=[2*inch, 4*inch])
-    metadata_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#374151')),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-    ]))
+    metadata_table.setStyle(report_styles.metadata_table)
     elements.append(metadata_table)
     elements.append(Spacer(1, 0.3*inch))
     
     # Prediction Result Section
-    elements.append(Paragraph("Prediction Result", heading_style))
+    elements.append(Paragraph("Prediction Result", report_styles.heading))
     
     prediction = prediction_data.get('prediction', 'Unknown')
     confidence_scores = prediction_data.get('confidence_scores', {})
     
-    # Color based on prediction
-    pred_color = {
-        'High': colors.HexColor('#10b981'),
-        'Medium': colors.HexColor('#f59e0b'),
-        'Low': colors.HexColor('#ef4444')
-    }.get(prediction, colors.grey)
-    
     result_data = [
         ['Predicted Growth Category:', prediction],
         ['Confidence Level:', f"{confidence_scores.get(prediction, 0)*100:.2f}%"]
     ]
     
     result_table = Table(result_data, colWidths=[2.5*inch, 3.5*inch])
-    result_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 12),
-        ('TEXTCOLOR', (1, 0), (1, 0), pred_color),
-        ('FONTSIZE', (1, 0), (1, 0), 16),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 10),
-    ]))
+    # Color based on prediction
+    result_table.setStyle(report_styles.result_tables.get(prediction, report_styles.result_tables[None]))
     elements.append(result_table)
     elements.append(Spacer(1, 0.2*inch))
     
     # Confidence Breakdown
-    elements.append(Paragraph("Confidence Breakdown", heading_style))
+    elements.append(Paragraph("Confidence Breakdown", report_styles.heading))
+    
+    if chart == 'native':
+        elements.append(confidence_chart_drawing(confidence_scores))
+    elif chart == 'matplotlib':
+        chart_scores = {category: confidence_scores.get(category, 0) for category in CONFIDENCE_CATEGORIES}
+        elements.append(Image(generate_chart_image(chart_scores), width=6*inch, height=4*inch))
     
-    confidence_data = [['Category', 'Confidence', 'Percentage']]
-    for category in ['High', 'Medium', 'Low']:
+    confidence_data = [['Category', 'Percentage']]
+    for category in CONFIDENCE_CATEGORIES:
         score = confidence_scores.get(category, 0)
-        confidence_data.append([
-            category,
-            '█' * int(score * 20),  # Visual bar
-            f"{score*100:.2f}%"
-        ])
+        confidence_data.append([category, f"{score*100:.2f}%"])
     
-    confidence_table = Table(confidence_data, colWidths=[1.5*inch, 3*inch, 1.5*inch])
-    confidence_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e5e7eb')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
+    confidence_table = Table(confidence_data, colWidths=[3*inch, 3*inch])
+    confidence_table.setStyle(report_styles.confidence_table)
     elements.append(confidence_table)
     elements.append(Spacer(1, 0.3*inch))
     
     # Input Data Summary
-    elements.append(Paragraph("Enterprise Profile", heading_style))
+    elements.append(Paragraph("Enterprise Profile", report_styles.heading))
     
     input_data = prediction_data.get('input_data', {})
     
@@ -145,76 +242,34 @@ def generate_prediction_report(prediction_data: dict) -> BytesIO:
     ]
     
     profile_table = Table(profile_data, colWidths=[2.5*inch, 3.5*inch])
-    profile_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-    ]))
+    profile_table.setStyle(report_styles.profile_table)
     elements.append(profile_table)
     elements.append(Spacer(1, 0.2*inch))
     
     # Key Metrics
-    elements.append(Paragraph("Key Business Metrics", heading_style))
+    elements.append(Paragraph("Key Business Metrics", report_styles.heading))
     
     metrics_data = [['Metric', 'Score']]
-    metric_fields = [
-        ('About Enterprises, Owners Motivation', 'Owner Motivation'),
-        ('Enabler 1: Effortable Digital technologies', 'Digital Technologies'),
-        ('Outcome : Growth and Effeciency', 'Growth & Efficiency'),
-        ('Enabler 2 :Certification &Standarization', 'Certification'),
-        ('Challenges 2: Skill Gap ,Retaining resources and workforce Management', 'Skill Gap Challenges'),
-    ]
-    
-    for field, label in metric_fields:
+    for field, label in METRIC_FIELDS:
         value = input_data.get(field, 'N/A')
         metrics_data.append([label, str(value)])
     
     metrics_table = Table(metrics_data, colWidths=[4*inch, 2*inch])
-    metrics_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e5e7eb')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 0), (1, -1), 'CENTER'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-    ]))
+    metrics_table.setStyle(report_styles.metrics_table)
     elements.append(metrics_table)
     elements.append(Spacer(1, 0.3*inch))
     
     # Interpretation
-    elements.append(Paragraph("Interpretation & Recommendations", heading_style))
-    
-    interpretation = {
-        'High': "Your SME shows strong indicators for high growth potential. Focus on scaling operations, "
-                "maintaining momentum, and seeking expansion opportunities. Consider investment in technology "
-                "and workforce development to sustain growth trajectory.",
-        'Medium': "Your SME demonstrates moderate growth potential with room for improvement. Consider addressing "
-                  "key operational challenges, improving digital adoption, and strengthening workforce capabilities. "
-                  "Focus on efficiency improvements and strategic planning to move toward high growth.",
-        'Low': "Your SME may face significant growth challenges. Priority should be given to improving operational "
-               "efficiency, addressing financial constraints, and building foundational capabilities. Consider "
-               "seeking support programs, mentorship, and targeted interventions to overcome barriers."
-    }.get(prediction, "Unable to provide interpretation.")
-    
-    interp_para = Paragraph(interpretation, styles['Normal'])
+    elements.append(Paragraph("Interpretation & Recommendations", report_styles.heading))
+    
+    interpretation = INTERPRETATIONS.get(prediction, "Unable to provide interpretation.")
+    interp_para = Paragraph(interpretation, report_styles.styles['Normal'])
     elements.append(interp_para)
     elements.append(Spacer(1, 0.3*inch))
     
     # Footer
     elements.append(Spacer(1, 0.5*inch))
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        textColor=colors.grey,
-        alignment=TA_CENTER
-    )
-    footer_text = "This report is generated by SME Growth Predictor AI System | For informational purposes only"
-    footer = Paragraph(footer_text, footer_style)
+    footer = Paragraph(FOOTER_TEXT, report_styles.footer)
     elements.append(footer)
     
     # Build PDF
@@ -224,14 +279,70 @@ def generate_prediction_report(prediction_data: dict) -> BytesIO:
     return buffer
 
 
+def confidence_chart_drawing(confidence_scores: dict, width: float = 432, height: float = 200):
+    """
+    Confidence bar chart drawn with ReportLab graphics
+    
+    Vector shapes in the PDF itself: no figure, rasterization or PNG
+    encoding per report, unlike generate_chart_image.
+    
+    Args:
+        confidence_scores: Confidence per category (0-1)
+        width, height: Drawing size in points
+    
+    Returns:
+        Drawing: Flowable to add to the report
+    """
+    from reportlab.graphics.charts.barcharts import VerticalBarChart
+    from reportlab.graphics.shapes import Drawing, String
+    from reportlab.lib import colors
+    
+    drawing = Drawing(width, height)
+    drawing.add(String(
+        width / 2, height - 14, 'Prediction Confidence Breakdown',
+        fontName='Helvetica-Bold', fontSize=11, textAnchor='middle'
+    ))
+    
+    chart = VerticalBarChart()
+    chart.x = 50
+    chart.y = 25
+    chart.width = width - 70
+    chart.height = height - 55
+    chart.data = [[confidence_scores.get(category, 0) * 100 for category in CONFIDENCE_CATEGORIES]]
+    chart.categoryAxis.categoryNames = CONFIDENCE_CATEGORIES
+    chart.categoryAxis.labels.fontSize = 9
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.valueMax = 100
+    chart.valueAxis.valueStep = 20
+    chart.valueAxis.labels.fontSize = 8
+    chart.valueAxis.labelTextFormat = '%d%%'
+    chart.barWidth = 10
+    chart.groupSpacing = 20
+    chart.bars.strokeColor = None
+    for i, category in enumerate(CONFIDENCE_CATEGORIES):
+        chart.bars[(0, i)].fillColor = colors.HexColor(CHART_COLORS[category])
+    chart.barLabelFormat = '%.1f%%'
+    chart.barLabels.nudge = 7
+    chart.barLabels.fontSize = 8
+    drawing.add(chart)
+    
+    drawing.add(String(
+        12, chart.y + chart.height / 2, 'Confidence (%)', fontSize=8, textAnchor='middle', angle=90
+    ))
+    return drawing
+
+
 def generate_chart_image(confidence_scores: dict) -> BytesIO:
     """Generate a chart image for confidence scores"""
+    import matplotlib
+    matplotlib.use('Agg')  # Use non-interactive backend
+    import matplotlib.pyplot as plt
+    
     fig, ax = plt.subplots(figsize=(6, 4))
     
     categories = list(confidence_scores.keys())
     values = [confidence_scores[cat] * 100 for cat in categories]
-    colors_map = {'High': '#10b981', 'Medium': '#f59e0b', 'Low': '#ef4444'}
-    bar_colors = [colors_map.get(cat, '#6b7280') for cat in categories]
+    bar_colors = [CHART_COLORS.get(cat, '#6b7280') for cat in categories]
     
     ax.bar(categories, values, color=bar_colors)
     ax.set_ylabel('Confidence (%)')
@@ -0,0 +1,295 @@
+"""
+Request Profiler
+Opt-in sampling profiler for individual requests. While a selected request
+is in flight, a background thread samples the Python stacks of every busy
+thread in the process (the event loop, the DB threads and thread-based
+inference/report pools) and the result is saved in collapsed-stack format
+("frame;frame;frame count" per line), ready for flamegraph.pl, speedscope or
+inferno. Profiles go to a bounded on-disk ring buffer listed by
+/api/admin/profiles.
+
+Process pools (REPORT_EXECUTOR=process, INFERENCE_EXECUTOR=process) run in
+other processes the sampler cannot see. Work the profiled request submits
+through run_in_pool runs under a sampler in the pool process instead, and
+its stacks are merged into the profile under a "process-<pid>" root.
+
+The middleware and admin routes are only mounted when PROFILING=true and
+PROFILE_TOKEN is set; otherwise requests pay nothing. A request is profiled
+when its X-Profile header equals PROFILE_TOKEN or it is picked at random
+with probability PROFILE_SAMPLE_RATE. One request is profiled at a time per
+process; concurrent requests are not, but their work on this process's
+threads can show up in the profile since all threads are sampled.
+"""
+
+import asyncio
+import contextvars
+import hmac
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+PROFILING_ENABLED = os.getenv('PROFILING', 'false').lower() in ('1', 'true', 'yes')
+PROFILE_SAMPLE_RATE = float(os.getenv('PROFILE_SAMPLE_RATE', 0))
+PROFILE_TOKEN = os.getenv('PROFILE_TOKEN', '')
+PROFILE_DIR = Path(os.getenv('PROFILE_DIR', Path(__file__).parent.parent / 'profiles'))
+PROFILE_MAX_FILES = int(os.getenv('PROFILE_MAX_FILES', 50))
+PROFILE_INTERVAL_MS = float(os.getenv('PROFILE_INTERVAL_MS', 5))
+
+PROFILE_HEADER = 'x-profile'
+PROFILE_ID_HEADER = 'x-profile-id'
+
+# Requests to these paths are never profiled
+EXCLUDED_PREFIXES = ('/api/admin/profiles', '/metrics')
+
+# Leaf frames of threads that are blocked waiting for work, not running
+IDLE_FRAMES = {
+    ('threading.py', 'wait'),
+    ('threading.py', '_wait_for_tstate_lock'),
+    ('selectors.py', 'select'),
+    ('queue.py', 'get'),
+    ('thread.py', '_worker'),
+}
+
+BACKEND_DIR = str(Path(__file__).resolve().parent.parent)
+
+
+def _frame_label(code) -> str:
+    """function (path:line) with the path shortened to the package or backend module"""
+    filename = code.co_filename
+    if filename.startswith(BACKEND_DIR):
+        filename = filename[len(BACKEND_DIR) + 1:]
+    elif 'site-packages' in filename:
+        filename = filename.split('site-packages', 1)[1].lstrip('/\\')
+    else:
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(';', ',')
+
+
+class StackSampler:
+    """
+    Samples the stacks of all busy threads every `interval` seconds
+    
+    Stacks are rooted at the thread name, prefixed with `root` if given.
+    """
+    
+    def __init__(self, interval: float, root: str = ''):
+        self.interval = interval
+        self.root = root
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+    
+    def start(self):
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+    
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                    continue
+                
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f'thread-{ident}'))
+                if self.root:
+                    stack.append(self.root)
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+    
+    def merge(self, stacks: Counter):
+        """Add stacks sampled elsewhere (e.g. in a pool process)"""
+        self.stacks.update(stacks)
+    
+    def collapsed(self) -> str:
+        """Profile in collapsed-stack format, heaviest stacks first"""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """Ring buffer of saved profiles: at most `max_files`, oldest dropped first"""
+    
+    def __init__(self, directory: Path, max_files: int):
+        self.directory = Path(directory)
+        self.max_files = max_files
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+    
+    def save(self, profile_id: str, collapsed: str, metadata: Dict):
+        """Write a profile (.collapsed) and its metadata (.json), then trim the buffer"""
+        for suffix, data in (('.collapsed', collapsed), ('.json', json.dumps(metadata, indent=2))):
+            path = self.directory / f"{profile_id}{suffix}"
+            tmp_path = path.with_name(f"{path.name}.tmp")
+            tmp_path.write_text(data)
+            os.replace(tmp_path, path)
+        
+        with self._lock:
+            # Profile IDs start with the time in ms, so name order is age order
+            for path in sorted(self.directory.glob('*.json'))[:-self.max_files or None]:
+                path.unlink(missing_ok=True)
+                path.with_suffix('.collapsed').unlink(missing_ok=True)
+    
+    def list(self) -> List[Dict]:
+        """Metadata of every stored profile, newest first"""
+        profiles = []
+        for path in sorted(self.directory.glob('*.json'), reverse=True):
+            try:
+                profiles.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return profiles
+    
+    def path(self, profile_id: str) -> Optional[Path]:
+        """Collapsed-stack file of a profile, or None if it isn't (or no longer) stored"""
+        path = self.directory / f"{Path(profile_id).name}.collapsed"
+        return path if path.exists() else None
+
+
+# Sampler of the request being profiled, seen by the code it awaits
+_active_sampler = contextvars.ContextVar('profile_sampler', default=None)
+
+
+def _sampled_call(fn, args, interval: float):
+    """
+    Run fn(*args) in a pool process under its own sampler
+    
+    Returns (result, error, stacks) so the stacks get back to the request
+    even when fn raises.
+    """
+    sampler = StackSampler(interval, root=f'process-{os.getpid()}')
+    sampler.start()
+    try:
+        result, error = fn(*args), None
+    except Exception as e:
+        result, error = None, e
+    finally:
+        sampler.stop()
+    return result, error, sampler.stacks
+
+
+async def run_in_pool(executor: Executor, fn, *args):
+    """
+    Run fn(*args) on `executor` and await its result, like loop.run_in_executor
+    
+    When the current request is being profiled and `executor` is a process
+    pool, the call is sampled in the pool process and its stacks are merged
+    into the request's profile.
+    """
+    loop = asyncio.get_running_loop()
+    sampler = _active_sampler.get()
+    if sampler is None or not isinstance(executor, ProcessPoolExecutor):
+        return await loop.run_in_executor(executor, fn, *args)
+    
+    result, error, stacks = await loop.run_in_executor(executor, _sampled_call, fn, args, sampler.interval)
+    sampler.merge(stacks)
+    if error is not None:
+        raise error
+    return result
+
+
+_store_instance = None
+
+
+def get_profile_store() -> ProfileStore:
+    """Get or create this process's profile store"""
+    global _store_instance
+    if _store_instance is None:
+        _store_instance = ProfileStore(PROFILE_DIR, PROFILE_MAX_FILES)
+    return _store_instance
+
+
+def authorized(header_value: Optional[str]) -> bool:
+    """Whether an X-Profile header value may trigger profiles or read them"""
+    if header_value is None or not PROFILE_TOKEN:
+        return False
+    return hmac.compare_digest(header_value.encode(), PROFILE_TOKEN.encode())
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requests selected by header or sampling rate"""
+    
+    def __init__(self, app):
+        self.app = app
+        self._busy = threading.Lock()
+    
+    def _selected(self, scope) -> Optional[str]:
+        """Why this request should be profiled ('header' or 'sampled'), or None"""
+        if scope['type'] != 'http' or scope['path'].startswith(EXCLUDED_PREFIXES):
+            return None
+        header = dict(scope['headers']).get(PROFILE_HEADER.encode())
+        if header is not None and authorized(header.decode('latin-1')):
+            return 'header'
+        if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+            return 'sampled'
+        return None
+    
+    async def __call__(self, scope, receive, send):
+        trigger = self._selected(scope)
+        if trigger is None or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+        
+        profile_id = f"{int(time.time() * 1000)}_{os.getpid()}_{uuid.uuid4().hex[:8]}"
+        status = 500
+        
+        async def send_with_profile_id(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                message['headers'] = list(message.get('headers', [])) + [
+                    (PROFILE_ID_HEADER.encode(), profile_id.encode())
+                ]
+            await send(message)
+        
+        sampler = StackSampler(PROFILE_INTERVAL_MS / 1000)
+        start = time.perf_counter()
+        sampler.start()
+        token = _active_sampler.set(sampler)
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            _active_sampler.reset(token)
+            duration = time.perf_counter() - start
+            try:
+                # Joining waits for the sampler's current sample; keep it off the loop
+                await run_in_threadpool(sampler.stop)
+            finally:
+                self._busy.release()
+            metadata = {
+                'id': profile_id,
+                'method': scope['method'],
+                'path': scope['path'],
+                'query': scope.get('query_string', b'').decode('latin-1'),
+                'status': status,
+                'duration_ms': round(duration * 1000, 3),
+                'trigger': trigger,
+                'samples': sampler.samples,
+                'interval_ms': PROFILE_INTERVAL_MS,
+                'pid': os.getpid(),
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+            }
+            try:
+                await run_in_threadpool(get_profile_store().save, profile_id, sampler.collapsed(), metadata)
+            except Exception as e:
+                print(f"Warning: Failed to save profile {profile_id}: {e}")
@@ -0,0 +1,121 @@
+"""
+Report Cache
+Two-level cache for rendered PDF reports: a bounded in-memory LRU in front of
+a directory of PDF files shared by all workers. Entries are keyed on the
+prediction ID and the report template version, so a layout change never
+serves stale PDFs.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class ReportCache:
+    """Thread-safe memory + disk cache of rendered PDF reports"""
+    
+    def __init__(self, cache_dir: Optional[Path], template_version: int, max_entries: int = 256):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.template_version = template_version
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Counters
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def _path(self, prediction_id: int) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"report_{int(prediction_id)}_v{self.template_version}.pdf"
+    
+    def get(self, prediction_id: int) -> Optional[bytes]:
+        """Return the cached PDF from memory, else disk, else None"""
+        with self._lock:
+            pdf = self._entries.get(prediction_id)
+            if pdf is not None:
+                self._entries.move_to_end(prediction_id)
+                self.memory_hits += 1
+                return pdf
+        
+        path = self._path(prediction_id)
+        try:
+            pdf = path.read_bytes() if path is not None else None
+        except FileNotFoundError:
+            pdf = None
+        
+        with self._lock:
+            if pdf is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        self._remember(prediction_id, pdf)
+        return pdf
+    
+    def put(self, prediction_id: int, pdf: bytes):
+        """Store a rendered PDF in memory and on disk"""
+        self._remember(prediction_id, pdf)
+        
+        path = self._path(prediction_id)
+        if path is not None:
+            # Write then rename, so other workers never read a partial file
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(pdf)
+            os.replace(tmp_path, path)
+    
+    def _remember(self, prediction_id: int, pdf: bytes):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[prediction_id] = pdf
+            self._entries.move_to_end(prediction_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def invalidate(self, prediction_id: int):
+        """Drop the cached report of one prediction (all template versions)"""
+        with self._lock:
+            self._entries.pop(prediction_id, None)
+            self.invalidations += 1
+        
+        if self.cache_dir is not None:
+            for path in self.cache_dir.glob(f"report_{int(prediction_id)}_v*.pdf"):
+                path.unlink(missing_ok=True)
+    
+    def clear(self):
+        """Drop every cached report"""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+        
+        if self.cache_dir is not None:
+            for path in self.cache_dir.glob("report_*.pdf"):
+                path.unlink(missing_ok=True)
+    
+    def stats(self) -> Dict:
+        """Return cache size and hit/miss counters"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'template_version': self.template_version,
+                'cache_dir': str(self.cache_dir) if self.cache_dir else None,
+                'memory_entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'memory_bytes': sum(len(pdf) for pdf in self._entries.values()),
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': ((self.memory_hits + self.disk_hits) / lookups) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
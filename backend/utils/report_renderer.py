@@ -0,0 +1,162 @@
+"""
+Report Renderer
+Serves PDF reports from the report cache and renders misses on a process
+pool, so ReportLab layout (CPU-bound, holds the GIL) never blocks the event
+loop or the request threads.
+"""
+
+import asyncio
+import os
+import zipfile
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import AsyncIterator, List, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from utils.exporter import ChunkSink
+from utils.pdf_generator import REPORT_TEMPLATE_VERSION, get_report_styles, render_prediction_report
+from utils.profiler import run_in_pool
+from utils.report_cache import ReportCache
+
+
+def _init_worker():
+    """Import ReportLab and build the report styles in a pool process before it takes work"""
+    get_report_styles()
+
+
+# Global pool and cache instances
+_executor_instance = None
+_cache_instance = None
+
+
+def get_report_executor() -> Executor:
+    """Get or create the report rendering pool"""
+    global _executor_instance
+    if _executor_instance is None:
+        workers = int(os.getenv('REPORT_WORKERS', 2))
+        if os.getenv('REPORT_EXECUTOR', 'process') == 'thread':
+            _executor_instance = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='report')
+        else:
+            _executor_instance = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+    return _executor_instance
+
+
+def get_report_cache() -> ReportCache:
+    """Get or create the global report cache"""
+    global _cache_instance
+    if _cache_instance is None:
+        cache_dir = os.getenv('REPORT_CACHE_DIR', str(Path(__file__).parent.parent / 'report_cache'))
+        _cache_instance = ReportCache(
+            cache_dir or None,
+            template_version=REPORT_TEMPLATE_VERSION,
+            max_entries=int(os.getenv('REPORT_CACHE_SIZE', 256))
+        )
+    return _cache_instance
+
+
+async def render_report(prediction: dict) -> bytes:
+    """Return the PDF report for a prediction, rendering it on a cache miss"""
+    cache = get_report_cache()
+    pdf = await run_in_threadpool(cache.get, prediction['id'])
+    if pdf is not None:
+        return pdf
+    
+    pdf = await run_in_pool(get_report_executor(), render_prediction_report, prediction)
+    await run_in_threadpool(cache.put, prediction['id'], pdf)
+    return pdf
+
+
+def report_filename(prediction_id: int) -> str:
+    return f"sme_prediction_report_{prediction_id}.pdf"
+
+
+async def iter_rendered_reports(predictions: List[dict], window: int) -> AsyncIterator[Tuple[dict, bytes]]:
+    """
+    Render many reports in parallel, yielding (prediction, pdf) as each completes
+    
+    At most `window` renders are in flight, so memory holds a bounded number
+    of PDFs however many are requested. Unfinished renders are cancelled if
+    the consumer stops early (e.g. the client disconnects).
+    """
+    remaining = iter(predictions)
+    pending = {}
+    
+    def start_next():
+        prediction = next(remaining, None)
+        if prediction is not None:
+            pending[asyncio.ensure_future(render_report(prediction))] = prediction
+    
+    for _ in range(window):
+        start_next()
+    
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                prediction = pending.pop(task)
+                start_next()
+                yield prediction, task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def stream_reports_zip(predictions: List[dict], window: int) -> AsyncIterator[bytes]:
+    """Stream a ZIP of per-prediction PDFs, adding each one as soon as it is rendered"""
+    sink = ChunkSink()
+    # PDFs are already compressed; storing them keeps the ZIP step cheap
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED) as archive:
+        async for prediction, pdf in iter_rendered_reports(predictions, window):
+            archive.writestr(report_filename(prediction['id']), pdf)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def require_pypdf():
+    """Import pypdf, raising RuntimeError if reports can't be combined"""
+    try:
+        import pypdf
+        return pypdf
+    except ImportError:
+        raise RuntimeError("Combined PDF reports require pypdf (pip install pypdf)")
+
+
+async def render_combined_report(predictions: List[dict], window: int) -> bytes:
+    """
+    Render reports in parallel and concatenate them, in request order, into one PDF
+    
+    A PDF's cross-reference table comes after its pages, so the combined file
+    is built in memory and returned whole: it costs about the size of all
+    its reports, and callers must bound len(predictions). Each report is
+    appended (and its rendered bytes dropped) as soon as it and every report
+    before it are ready, so combining overlaps rendering.
+    """
+    pypdf = require_pypdf()
+    writer = pypdf.PdfWriter()
+    
+    def append(pdf: bytes):
+        writer.append(pypdf.PdfReader(BytesIO(pdf)))
+    
+    # Renders complete out of order; hold the early ones until their turn
+    order = [prediction['id'] for prediction in predictions]
+    rendered = {}
+    appended = 0
+    async for prediction, pdf in iter_rendered_reports(predictions, window):
+        rendered[prediction['id']] = pdf
+        while appended < len(order) and order[appended] in rendered:
+            await run_in_threadpool(append, rendered.pop(order[appended]))
+            appended += 1
+    
+    buffer = BytesIO()
+    await run_in_threadpool(writer.write, buffer)
+    return buffer.getvalue()
+
+
+def shutdown_report_executor():
+    """Stop the report pool if it was started"""
+    global _executor_instance
+    if _executor_instance is not None:
+        _executor_instance.shutdown(wait=True, cancel_futures=True)
+        _executor_instance = None
@@ -0,0 +1,79 @@
+"""
+Synthetic input generator for SME Growth Predictions
+Draws realistic enterprise profiles from the model's training statistics
+"""
+
+import numpy as np
+from typing import List
+
+# Features sent as floats by the API; all other numeric features are integers
+FLOAT_FEATURES = {'Location', 'Outcome : Growth and Effeciency'}
+
+# Enterprise sizes accepted by the frontend plus the codes seen at training time
+SIZE_VALUES = ['Small', 'Medium', 'Large', '0', '1', '2', 'small']
+
+
+def get_feature_ranges(model) -> dict:
+    """
+    Return a (low, high) range per numeric feature
+    
+    Ranges are mean +/- 3 standard deviations of the fitted StandardScaler,
+    clipped at zero. Features the imputer dropped at training time (all values
+    missing, e.g. Location) get a small default range.
+    """
+    if model.pipeline is not None:
+        numeric = model.pipeline.named_steps['preprocessor'].named_transformers_['num']
+        statistics = numeric.named_steps['imputer'].statistics_
+        scaler_mean = numeric.named_steps['scaler'].mean_
+        scaler_scale = numeric.named_steps['scaler'].scale_
+    else:
+        # Compiled artifact: the same fitted parameters as plain arrays
+        statistics = model.compiled.numeric_fill
+        scaler_mean = model.compiled.scaler_mean
+        scaler_scale = model.compiled.scaler_scale
+    
+    ranges = {}
+    scaled_index = 0
+    for feat, statistic in zip(model.numeric_features, statistics):
+        if np.isnan(statistic):
+            ranges[feat] = (0.0, 3.0)
+            continue
+        mean = scaler_mean[scaled_index]
+        scale = scaler_scale[scaled_index]
+        ranges[feat] = (max(0.0, mean - 3 * scale), mean + 3 * scale)
+        scaled_index += 1
+    
+    return ranges
+
+
+def generate_inputs(model, n: int, seed: int = 42) -> List[dict]:
+    """
+    Generate `n` random input records covering the model's input space
+    
+    Args:
+        model: Loaded SMEGrowthPredictor
+        n: Number of records
+        seed: Random seed, so the same records are produced on every run
+    
+    Returns:
+        List of input dictionaries keyed by original feature names
+    """
+    rng = np.random.default_rng(seed)
+    ranges = get_feature_ranges(model)
+    
+    columns = {}
+    for feat, (low, high) in ranges.items():
+        values = rng.uniform(low, high, size=n)
+        if feat in FLOAT_FEATURES:
+            columns[feat] = [round(float(v), 1) for v in values]
+        else:
+            columns[feat] = [int(round(v)) for v in values]
+    
+    for feat in model.categorical_features:
+        columns[feat] = [str(v) for v in rng.choice(SIZE_VALUES, size=n)]
+    
+    features = model.numeric_features + model.categorical_features
+    return [
+        {feat: columns[feat][i] for feat in features}
+        for i in range(n)
+    ]
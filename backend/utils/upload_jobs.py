@@ -0,0 +1,337 @@
+"""
+Upload Scoring Jobs
+Scores uploaded CSV/Excel files of enterprises in the background. The file is
+read in chunks, each chunk is validated row by row and scored with one
+vectorized predict_proba call, valid rows are saved in bulk, and the scored
+rows are appended to a CSV result file. Job status lives in the database so
+any worker can answer progress polls. Excel files need openpyxl, which is
+imported only when one is uploaded.
+
+No job is left queued or running forever: on shutdown, queued jobs are
+cancelled and running ones stop after their current chunk, and both are
+marked failed. Files older than UPLOAD_JOB_TTL are deleted, and jobs a killed
+worker left queued or running for that long are marked failed.
+"""
+
+import csv
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Iterator, List, Tuple
+
+from models.database import PredictionDatabase
+
+# Uploaded files and scored results
+UPLOAD_JOBS_DIR = Path(os.getenv('UPLOAD_JOBS_DIR', Path(__file__).parent.parent / 'upload_jobs'))
+
+# Rows read, validated and scored per chunk
+UPLOAD_CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', 5000))
+
+# file extension -> reader
+UPLOAD_FORMATS = {'.csv': 'csv', '.xlsx': 'excel', '.xlsm': 'excel'}
+
+# Seconds uploaded files and results are kept (results then answer 410 Gone)
+UPLOAD_JOB_TTL = float(os.getenv('UPLOAD_JOB_TTL', 86400))
+
+# At most one expiry sweep per this many seconds
+EXPIRY_INTERVAL = 3600
+
+SHUTDOWN_ERROR = "The server shut down before the job finished; upload the file again"
+STALE_ERROR = "The job never finished (its worker stopped); upload the file again"
+
+# Columns appended to each uploaded row in the result file
+RESULT_COLUMNS = ['prediction', 'confidence_high', 'confidence_medium', 'confidence_low', 'error']
+
+
+def upload_path(job_id: str, suffix: str) -> Path:
+    """Where the uploaded file for a job is kept until it has been scored"""
+    return UPLOAD_JOBS_DIR / f"{job_id}.upload{suffix}"
+
+
+def result_path(job_id: str) -> Path:
+    """Where the scored CSV for a job is written"""
+    return UPLOAD_JOBS_DIR / f"{job_id}.result.csv"
+
+
+def require_openpyxl():
+    """Import openpyxl, raising RuntimeError if Excel files can't be read"""
+    try:
+        import openpyxl
+        return openpyxl
+    except ImportError:
+        raise RuntimeError("Excel uploads require openpyxl (pip install openpyxl)")
+
+
+def read_chunks(path: Path, fmt: str, chunk_size: int) -> Tuple[List[str], Iterator[Tuple[List[dict], float]]]:
+    """
+    Open an uploaded file for chunked reading
+    
+    Returns:
+        (header, chunks) where chunks yields (records, progress) with
+        progress the fraction of the file read so far
+    """
+    if fmt == 'excel':
+        return _read_excel_chunks(path, chunk_size)
+    return _read_csv_chunks(path, chunk_size)
+
+
+def _read_csv_chunks(path: Path, chunk_size: int):
+    """CSV values are read as strings and left to request validation"""
+    import pandas as pd
+    
+    total_bytes = max(path.stat().st_size, 1)
+    handle = open(path, 'rb')
+    reader = pd.read_csv(
+        handle, chunksize=chunk_size, dtype=str, keep_default_na=False, encoding='utf-8-sig'
+    )
+    
+    try:
+        first = next(reader)
+    except (StopIteration, pd.errors.EmptyDataError):
+        handle.close()
+        return [], iter(())
+    
+    def chunks():
+        try:
+            for df in itertools.chain([first], reader):
+                progress = min(handle.tell() / total_bytes, 1.0)
+                yield df.to_dict('records'), progress
+        finally:
+            handle.close()
+    
+    return list(first.columns), chunks()
+
+
+def _read_excel_chunks(path: Path, chunk_size: int):
+    """Rows of the first worksheet, streamed with openpyxl's read-only mode"""
+    openpyxl = require_openpyxl()
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    sheet = workbook.worksheets[0]
+    rows = sheet.iter_rows(values_only=True)
+    
+    header_row = next(rows, None)
+    if header_row is None:
+        workbook.close()
+        return [], iter(())
+    header = ['' if cell is None else str(cell).strip() for cell in header_row]
+    total_rows = max((sheet.max_row or 0) - 1, 1)
+    
+    def chunks():
+        read = 0
+        try:
+            while True:
+                block = list(itertools.islice(rows, chunk_size))
+                if not block:
+                    break
+                read += len(block)
+                records = [dict(zip(header, values)) for values in block if any(v is not None for v in values)]
+                yield records, min(read / total_rows, 1.0)
+        finally:
+            workbook.close()
+    
+    return header, chunks()
+
+
+def run_upload_job(
+    db: PredictionDatabase,
+    model,
+    job_id: str,
+    path: Path,
+    fmt: str,
+    persist: bool,
+    validate: Callable[[dict], dict],
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+):
+    """
+    Score an uploaded file, recording progress on the job row
+    
+    Args:
+        db: Database holding the job and prediction history
+        model: SMEGrowthPredictor used for scoring
+        job_id: Upload job ID
+        path: Uploaded file
+        fmt: 'csv' or 'excel'
+        persist: Save scored rows to prediction history
+        validate: Turns one raw row into model input, raising on invalid rows
+        chunk_size: Rows per validation/scoring/saving round
+    """
+    db.update_upload_job(job_id, status='running', started_at=_now())
+    counts = {'processed_rows': 0, 'succeeded_rows': 0, 'failed_rows': 0, 'saved_rows': 0}
+    
+    try:
+        header, chunks = read_chunks(path, fmt, chunk_size)
+        required = model.get_required_features()['all']
+        missing = [feature for feature in required if feature not in header]
+        if missing:
+            raise ValueError(f"Missing required columns: {missing}")
+        
+        with open(result_path(job_id), 'w', newline='', encoding='utf-8') as out:
+            writer = csv.writer(out)
+            writer.writerow(header + RESULT_COLUMNS)
+            
+            for records, progress in chunks:
+                if _stopping.is_set():
+                    raise RuntimeError(SHUTDOWN_ERROR)
+                _score_chunk(db, model, records, header, persist, validate, writer, counts, chunk_size)
+                db.update_upload_job(job_id, progress=progress, **counts)
+        
+        db.update_upload_job(job_id, status='completed', progress=1.0, finished_at=_now(), **counts)
+    except Exception as e:
+        print(f"Warning: Upload job {job_id} failed: {e}")
+        result_path(job_id).unlink(missing_ok=True)
+        db.update_upload_job(job_id, status='failed', error=str(e), finished_at=_now(), **counts)
+    finally:
+        path.unlink(missing_ok=True)
+
+
+def _score_chunk(db, model, records, header, persist, validate, writer, counts, chunk_size):
+    """Validate, score, save and write out one chunk of uploaded rows"""
+    inputs = []
+    outcomes = []
+    for record in records:
+        try:
+            inputs.append(validate(record))
+            outcomes.append(None)
+        except Exception as e:
+            outcomes.append(_first_error(e))
+    
+    scored = iter(model.predict_batch(inputs, chunk_size=chunk_size) if inputs else [])
+    
+    rows_to_save = []
+    for record, error in zip(records, outcomes):
+        values = [record.get(column) for column in header]
+        if error is not None:
+            writer.writerow(values + ['', '', '', '', error])
+            continue
+        
+        result = next(scored)
+        scores = result['confidence_scores']
+        writer.writerow(values + [
+            result['prediction'], scores.get('High'), scores.get('Medium'), scores.get('Low'), ''
+        ])
+        rows_to_save.append(result)
+    
+    if persist and rows_to_save:
+        counts['saved_rows'] += db.save_predictions_bulk([
+            (result['prediction'], result['confidence_scores'], input_data)
+            for result, input_data in zip(rows_to_save, inputs)
+        ])
+    
+    counts['processed_rows'] += len(records)
+    counts['succeeded_rows'] += len(inputs)
+    counts['failed_rows'] += len(records) - len(inputs)
+
+
+def _first_error(error: Exception) -> str:
+    """One-line description of why a row was rejected"""
+    errors = getattr(error, 'errors', None)
+    if callable(errors):
+        first = errors()[0]
+        location = '.'.join(str(part) for part in first.get('loc', ()))
+        return f"{location}: {first.get('msg')}"
+    return str(error)
+
+
+def _now() -> str:
+    return datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def expire_upload_jobs(db: PredictionDatabase, ttl: float = UPLOAD_JOB_TTL):
+    """
+    Delete job files older than `ttl` seconds and fail jobs left unfinished as long
+    
+    Files of jobs submitted by this process are kept until they finish.
+    """
+    cutoff = time.time() - ttl
+    with _jobs_lock:
+        active = set(_jobs)
+    
+    removed = 0
+    for path in UPLOAD_JOBS_DIR.glob('*'):
+        if path.name.split('.', 1)[0] in active:
+            continue
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+    
+    created_before = (datetime.utcnow() - timedelta(seconds=ttl)).strftime('%Y-%m-%d %H:%M:%S')
+    failed = db.fail_stale_upload_jobs(created_before, STALE_ERROR, _now())
+    if removed or failed:
+        print(f"✓ Expired {removed} upload job files and failed {failed} stale upload jobs")
+
+
+# Global job executor (jobs run one at a time by default, off the request threads)
+_executor_instance = None
+
+# job_id -> (future, db, upload path) for jobs submitted by this process
+_jobs = {}
+_jobs_lock = threading.Lock()
+_stopping = threading.Event()
+_last_expiry = None
+
+
+def get_upload_job_executor() -> ThreadPoolExecutor:
+    """Get or create the upload job executor"""
+    global _executor_instance
+    if _executor_instance is None:
+        _stopping.clear()
+        _executor_instance = ThreadPoolExecutor(
+            max_workers=int(os.getenv('UPLOAD_JOB_WORKERS', 1)),
+            thread_name_prefix='upload-job'
+        )
+    return _executor_instance
+
+
+def submit_upload_job(db: PredictionDatabase, model, job_id: str, path: Path, fmt: str, persist: bool,
+                      validate: Callable[[dict], dict]):
+    """Queue a job on the upload job executor (see run_upload_job), after an expiry sweep if one is due"""
+    global _last_expiry
+    executor = get_upload_job_executor()
+    if _last_expiry is None or time.monotonic() - _last_expiry > EXPIRY_INTERVAL:
+        _last_expiry = time.monotonic()
+        executor.submit(expire_upload_jobs, db)
+    
+    with _jobs_lock:
+        future = executor.submit(run_upload_job, db, model, job_id, path, fmt, persist, validate)
+        _jobs[job_id] = (future, db, path)
+    future.add_done_callback(lambda f: _job_done(job_id, f))
+
+
+def _job_done(job_id: str, future):
+    """Stop tracking a finished job; cancelled ones stay for shutdown to mark failed"""
+    if not future.cancelled():
+        with _jobs_lock:
+            _jobs.pop(job_id, None)
+
+
+def shutdown_upload_job_executor():
+    """
+    Stop the upload job executor
+    
+    Queued jobs are cancelled and running ones stop after their current
+    chunk; both are marked failed and their files removed.
+    """
+    global _executor_instance
+    if _executor_instance is None:
+        return
+    
+    _stopping.set()
+    _executor_instance.shutdown(wait=True, cancel_futures=True)
+    _executor_instance = None
+    
+    with _jobs_lock:
+        cancelled = [(job_id, db, path) for job_id, (future, db, path) in _jobs.items() if future.cancelled()]
+        _jobs.clear()
+    for job_id, db, path in cancelled:
+        path.unlink(missing_ok=True)
+        try:
+            db.update_upload_job(job_id, status='failed', error=SHUTDOWN_ERROR, finished_at=_now())
+        except Exception as e:
+            print(f"Warning: Could not mark upload job {job_id} failed: {e}")
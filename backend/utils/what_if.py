@@ -0,0 +1,137 @@
+"""
+What-if sweeps
+Scores a base enterprise profile with one or two features varied over a grid
+of values. The grid rows are built up front and scored in a single
+predict_proba call, so a 2-D sweep costs one inference batch instead of one
+/api/predict round trip per cell.
+"""
+
+import itertools
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from utils.synthetic_inputs import FLOAT_FEATURES
+
+# Largest number of grid cells (rows scored) per sweep
+SWEEP_MAX_POINTS = int(os.getenv('SWEEP_MAX_POINTS', 10000))
+SWEEP_MAX_FEATURES = 2
+
+LIKERT_RANGE = (1, 5, 1)
+
+# Default (min, max, step) per feature, matching the ranges of the prediction
+# form. Features without one (Location) need explicit values or bounds.
+DEFAULT_RANGES = {
+    'About Enterprises, Owners Motivation': LIKERT_RANGE,
+    'Enabler 2:Operational Process , Legacy & new machine to balance': LIKERT_RANGE,
+    'Enabler 1: Effortable Digital technologies': LIKERT_RANGE,
+    'Enabler 2 :Certification &Standarization': LIKERT_RANGE,
+    'Challanges3: Financial assistant & Incentive ,transparency in institutional support ,': LIKERT_RANGE,
+    'Enabler 3: Administrative and Regulatory Hurdles & Eco system Integration challenges': LIKERT_RANGE,
+    'Enabler 4: Engaging local hire': LIKERT_RANGE,
+    'Challenges 2: Skill Gap ,Retaining resources and workforce Management': LIKERT_RANGE,
+    'Outcome : Growth and Effeciency': (0, 100, 5),
+    'Enterprise_Age': (0, 50, 1),
+}
+
+# Values swept for categorical features by default
+DEFAULT_CATEGORIES = {
+    'Small/Medium/Large': ['Small', 'Medium', 'Large'],
+}
+
+
+def sweep_values(
+    feature: str,
+    values: Optional[List] = None,
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    step: Optional[float] = None
+) -> list:
+    """
+    Values to sweep a feature over
+    
+    Explicit `values` win; otherwise min/max/step, each defaulting to the
+    feature's entry in DEFAULT_RANGES. Integer features get integer values.
+    
+    Raises:
+        ValueError: If no range is known or the range is empty or invalid
+    """
+    if values is not None:
+        if not values:
+            raise ValueError(f"No values given for {feature}")
+        return list(values)
+    
+    if feature in DEFAULT_CATEGORIES:
+        if min_value is not None or max_value is not None or step is not None:
+            raise ValueError(f"{feature} is categorical; give explicit values instead of a range")
+        return list(DEFAULT_CATEGORIES[feature])
+    
+    default = DEFAULT_RANGES.get(feature, (None, None, None))
+    low = default[0] if min_value is None else min_value
+    high = default[1] if max_value is None else max_value
+    step = default[2] if step is None else step
+    if low is None or high is None:
+        raise ValueError(f"No default range for {feature}; give values or min and max")
+    if step is None:
+        step = 1
+    if step <= 0 or high < low:
+        raise ValueError(f"Invalid range for {feature}: min {low}, max {high}, step {step}")
+    
+    count = int(np.floor((high - low) / step + 1e-9)) + 1
+    if count > SWEEP_MAX_POINTS:
+        raise ValueError(f"Too many values for {feature}: {count} (max {SWEEP_MAX_POINTS})")
+    points = low + step * np.arange(count)
+    if feature in FLOAT_FEATURES:
+        return [round(float(v), 6) for v in points]
+    return sorted({int(round(v)) for v in points})
+
+
+def run_sweep(model, base: dict, axes: List[Dict]) -> dict:
+    """
+    Score `base` over the grid of the swept features
+    
+    Args:
+        model: Loaded SMEGrowthPredictor
+        base: Complete input record (original feature names)
+        axes: One or two {'feature': name, 'values': [...]} entries
+    
+    Returns:
+        Dictionary with the axes, the class labels, the probability grid per
+        class and the predicted label per cell; grids are nested lists with
+        one level per axis, in axis order
+    """
+    if not 1 <= len(axes) <= SWEEP_MAX_FEATURES:
+        raise ValueError(f"Sweep 1 to {SWEEP_MAX_FEATURES} features, got {len(axes)}")
+    
+    all_features = model.numeric_features + model.categorical_features
+    names = [axis['feature'] for axis in axes]
+    unknown = [name for name in names if name not in all_features]
+    if unknown:
+        raise ValueError(f"Unknown features: {unknown}")
+    if len(set(names)) != len(names):
+        raise ValueError("Each feature can only be swept once")
+    
+    shape = tuple(len(axis['values']) for axis in axes)
+    if int(np.prod(shape)) > SWEEP_MAX_POINTS:
+        raise ValueError(f"Sweep too large: {int(np.prod(shape))} points (max {SWEEP_MAX_POINTS})")
+    
+    # Row-major grid: the last axis varies fastest
+    records = [
+        {**base, **dict(zip(names, cell))}
+        for cell in itertools.product(*(axis['values'] for axis in axes))
+    ]
+    probabilities = model.predict_proba_records(records)
+    
+    class_labels = [str(label) for label in model.class_labels]
+    predictions = model.class_labels[model.classes.take(probabilities.argmax(axis=1))]
+    return {
+        'axes': [{'feature': name, 'values': axis['values']} for name, axis in zip(names, axes)],
+        'class_labels': class_labels,
+        'probabilities': {
+            label: probabilities[:, i].reshape(shape).tolist()
+            for i, label in enumerate(class_labels)
+        },
+        'predictions': predictions.astype(str).reshape(shape).tolist(),
+        'points': len(records)
+    }
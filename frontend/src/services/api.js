@@ -18,6 +18,16 @@ export const predictGrowth = async (data) => {
   }
 };
 
+export const predictWhatIf = async (base, sweep) => {
+  try {
+    // sweep: [{ feature, values?, min?, max?, step? }], one or two features
+    const response = await api.post('/api/predict/what-if', { base, sweep });
+    return response.data;
+  } catch (error) {
+    throw error.response?.data || error.message;
+  }
+};
+
 export const getModelInfo = async () => {
   try {
     const response = await api.get('/api/model-info');
@@ -54,9 +64,12 @@ export const getStatistics = async () => {
   }
 };
 
-export const getPredictionHistory = async (limit = 50) => {
+export const getPredictionHistory = async (limit = 50, filters = {}) => {
   try {
-    const response = await api.get(`/api/dashboard/history?limit=${limit}`);
+    // filters: cursor, prediction, enterprise_size, min_age, max_age, start_date, end_date
+    const response = await api.get('/api/dashboard/history', {
+      params: { limit, ...filters }
+    });
     return response.data;
   } catch (error) {
     throw error.response?.data || error.message;